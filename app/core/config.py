@@ -22,6 +22,13 @@ class Settings(BaseModel):
     # SoundCloud API
     SOUNDCLOUD_CLIENT_ID: str = os.getenv("SOUNDCLOUD_CLIENT_ID", "your-soundcloud-client-id-here")
     SOUNDCLOUD_CLIENT_SECRET: str = os.getenv("SOUNDCLOUD_CLIENT_SECRET", "your-soundcloud-client-secret-here")
+    # Token d'accès partagé par les workers et conservé entre redémarrages: file, sqlite (base du cache
+    # HTTP, HTTP_CACHE_PATH) ou memory (propre au processus)
+    SOUNDCLOUD_TOKEN_STORE: str = os.getenv("SOUNDCLOUD_TOKEN_STORE", "file")
+    SOUNDCLOUD_TOKEN_STORE_PATH: str = os.getenv("SOUNDCLOUD_TOKEN_STORE_PATH", ".cache/soundcloud_token.json")
+    # Mode d'authentification retenu par famille d'endpoints (header ou paramètre d'URL): quand le header
+    # a été refusé, il est retenté toutes les N secondes (0 = à chaque appel)
+    SOUNDCLOUD_AUTH_MODE_REPROBE_INTERVAL: float = float(os.getenv("SOUNDCLOUD_AUTH_MODE_REPROBE_INTERVAL", "600"))
 
     # Serveur
     HOST: str = os.getenv("HOST", "0.0.0.0")
@@ -30,10 +37,113 @@ class Settings(BaseModel):
     # Retry configuration
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     RETRY_BACKOFF_FACTOR: float = float(os.getenv("RETRY_BACKOFF_FACTOR", "0.5"))
+    RETRY_MAX_WAIT: float = float(os.getenv("RETRY_MAX_WAIT", "10"))
+    # Délai total d'une requête, retries et attentes compris (en secondes)
+    RETRY_DEADLINE: float = float(os.getenv("RETRY_DEADLINE", "60"))
 
     # Timeouts (en secondes)
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
 
+    # Pool de connexions HTTP (un client partagé par hôte amont)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+    HTTP_POOL_TIMEOUT: float = float(os.getenv("HTTP_POOL_TIMEOUT", "10"))
+
+    # Limitation de débit par plateforme (jetons par seconde et taille de rafale)
+    RATE_LIMIT_DEFAULT_RATE: float = float(os.getenv("RATE_LIMIT_DEFAULT_RATE", "10"))
+    RATE_LIMIT_DEFAULT_BURST: int = int(os.getenv("RATE_LIMIT_DEFAULT_BURST", "20"))
+    RATE_LIMIT_SOUNDCLOUD_RATE: float = float(os.getenv("RATE_LIMIT_SOUNDCLOUD_RATE", "10"))
+    RATE_LIMIT_SOUNDCLOUD_BURST: int = int(os.getenv("RATE_LIMIT_SOUNDCLOUD_BURST", "20"))
+    RATE_LIMIT_BEATPORT_RATE: float = float(os.getenv("RATE_LIMIT_BEATPORT_RATE", "5"))
+    RATE_LIMIT_BEATPORT_BURST: int = int(os.getenv("RATE_LIMIT_BEATPORT_BURST", "10"))
+    RATE_LIMIT_BANDCAMP_RATE: float = float(os.getenv("RATE_LIMIT_BANDCAMP_RATE", "5"))
+    RATE_LIMIT_BANDCAMP_BURST: int = int(os.getenv("RATE_LIMIT_BANDCAMP_BURST", "10"))
+    # Pause appliquée sur un 429 sans header Retry-After (en secondes)
+    RATE_LIMIT_DEFAULT_PAUSE: float = float(os.getenv("RATE_LIMIT_DEFAULT_PAUSE", "1"))
+
+    # Concurrence adaptative (AIMD) par plateforme
+    ADAPTIVE_CONCURRENCY_ENABLED: bool = os.getenv("ADAPTIVE_CONCURRENCY_ENABLED", "True").lower() == "true"
+    ADAPTIVE_CONCURRENCY_INITIAL: int = int(os.getenv("ADAPTIVE_CONCURRENCY_INITIAL", "8"))
+    ADAPTIVE_CONCURRENCY_MIN: int = int(os.getenv("ADAPTIVE_CONCURRENCY_MIN", "1"))
+    ADAPTIVE_CONCURRENCY_MAX: int = int(os.getenv("ADAPTIVE_CONCURRENCY_MAX", "20"))
+    ADAPTIVE_CONCURRENCY_BACKOFF: float = float(os.getenv("ADAPTIVE_CONCURRENCY_BACKOFF", "0.5"))
+    # Au-delà de cette latence (en secondes), un succès n'augmente pas la limite
+    ADAPTIVE_CONCURRENCY_LATENCY_THRESHOLD: float = float(os.getenv("ADAPTIVE_CONCURRENCY_LATENCY_THRESHOLD", "2"))
+
+    # Appels d'enrichissement en éventail (réseaux sociaux de chaque profil d'une recherche):
+    # appels simultanés, délai par appel et délai global (en secondes, 0 = sans délai)
+    FAN_OUT_CONCURRENCY: int = int(os.getenv("FAN_OUT_CONCURRENCY", "8"))
+    FAN_OUT_ITEM_TIMEOUT: float = float(os.getenv("FAN_OUT_ITEM_TIMEOUT", "5"))
+    FAN_OUT_DEADLINE: float = float(os.getenv("FAN_OUT_DEADLINE", "10"))
+    # Nombre maximal d'identifiants par appel des outils SoundCloud par lot
+    SOUNDCLOUD_BATCH_MAX_IDS: int = int(os.getenv("SOUNDCLOUD_BATCH_MAX_IDS", "200"))
+    # Délai global d'un lot (en secondes, 0 = sans délai global, seul FAN_OUT_ITEM_TIMEOUT s'applique):
+    # un lot complet est borné par la limite de débit SoundCloud (2 appels par profil, 200 profils
+    # à 10 req/s: ~40 s), bien au-delà de FAN_OUT_DEADLINE
+    SOUNDCLOUD_BATCH_DEADLINE: float = float(os.getenv("SOUNDCLOUD_BATCH_DEADLINE", "0"))
+
+    # Fusion des requêtes GET identiques en vol (single-flight)
+    REQUEST_COALESCING_ENABLED: bool = os.getenv("REQUEST_COALESCING_ENABLED", "True").lower() == "true"
+
+    # Cache HTTP du transport (RFC 9111): mémoire LRU, plus un fichier SQLite avec le backend "sqlite"
+    HTTP_CACHE_ENABLED: bool = os.getenv("HTTP_CACHE_ENABLED", "True").lower() == "true"
+    HTTP_CACHE_BACKEND: str = os.getenv("HTTP_CACHE_BACKEND", "memory")
+    HTTP_CACHE_PATH: str = os.getenv("HTTP_CACHE_PATH", ".cache/http_cache.sqlite")
+    HTTP_CACHE_MEMORY_MAX_BYTES: int = int(os.getenv("HTTP_CACHE_MEMORY_MAX_BYTES", str(32 * 1024 * 1024)))
+    HTTP_CACHE_DISK_MAX_BYTES: int = int(os.getenv("HTTP_CACHE_DISK_MAX_BYTES", str(256 * 1024 * 1024)))
+    # TTL forcé par plateforme (en secondes), prioritaire sur les directives amont; négatif = directives amont
+    HTTP_CACHE_TTL_SOUNDCLOUD: float = float(os.getenv("HTTP_CACHE_TTL_SOUNDCLOUD", "-1"))
+    HTTP_CACHE_TTL_BEATPORT: float = float(os.getenv("HTTP_CACHE_TTL_BEATPORT", "300"))
+    HTTP_CACHE_TTL_BANDCAMP: float = float(os.getenv("HTTP_CACHE_TTL_BANDCAMP", "-1"))
+
+    # Cache des résultats finaux des outils MCP / routes REST (TTL en secondes, par outil)
+    RESULT_CACHE_ENABLED: bool = os.getenv("RESULT_CACHE_ENABLED", "True").lower() == "true"
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+    RESULT_CACHE_DEFAULT_TTL: float = float(os.getenv("RESULT_CACHE_DEFAULT_TTL", "300"))
+    RESULT_CACHE_TTL_SOUNDCLOUD_SEARCH_PROFILES: float = float(os.getenv("RESULT_CACHE_TTL_SOUNDCLOUD_SEARCH_PROFILES", "600"))
+    RESULT_CACHE_TTL_SOUNDCLOUD_GET_PROFILE: float = float(os.getenv("RESULT_CACHE_TTL_SOUNDCLOUD_GET_PROFILE", "3600"))
+    RESULT_CACHE_TTL_BEATPORT_SEARCH: float = float(os.getenv("RESULT_CACHE_TTL_BEATPORT_SEARCH", "600"))
+    RESULT_CACHE_TTL_BEATPORT_GET_LABEL_RELEASES: float = float(os.getenv("RESULT_CACHE_TTL_BEATPORT_GET_LABEL_RELEASES", "1800"))
+    RESULT_CACHE_TTL_BANDCAMP_SEARCH: float = float(os.getenv("RESULT_CACHE_TTL_BANDCAMP_SEARCH", "600"))
+    # Payload de recherche Beatport d'une requête, partagé par toutes ses pages et tous ses filtres
+    RESULT_CACHE_TTL_BEATPORT_SEARCH_PAYLOAD: float = float(os.getenv("RESULT_CACHE_TTL_BEATPORT_SEARCH_PAYLOAD", "600"))
+    # Stale-while-revalidate: après expiration, résultat servi pendant cette durée (en secondes)
+    # et rafraîchi en arrière-plan; 0 = l'appelant attend toujours un résultat frais
+    RESULT_CACHE_DEFAULT_MAX_STALE: float = float(os.getenv("RESULT_CACHE_DEFAULT_MAX_STALE", "3600"))
+    RESULT_CACHE_MAX_STALE_SOUNDCLOUD_SEARCH_PROFILES: float = float(os.getenv("RESULT_CACHE_MAX_STALE_SOUNDCLOUD_SEARCH_PROFILES", "3600"))
+    RESULT_CACHE_MAX_STALE_SOUNDCLOUD_GET_PROFILE: float = float(os.getenv("RESULT_CACHE_MAX_STALE_SOUNDCLOUD_GET_PROFILE", "86400"))
+    RESULT_CACHE_MAX_STALE_BEATPORT_SEARCH: float = float(os.getenv("RESULT_CACHE_MAX_STALE_BEATPORT_SEARCH", "3600"))
+    RESULT_CACHE_MAX_STALE_BEATPORT_GET_LABEL_RELEASES: float = float(os.getenv("RESULT_CACHE_MAX_STALE_BEATPORT_GET_LABEL_RELEASES", "21600"))
+    RESULT_CACHE_MAX_STALE_BANDCAMP_SEARCH: float = float(os.getenv("RESULT_CACHE_MAX_STALE_BANDCAMP_SEARCH", "3600"))
+    # 0: le rafraîchissement en arrière-plan de beatport_search doit relire l'amont, pas un payload expiré
+    RESULT_CACHE_MAX_STALE_BEATPORT_SEARCH_PAYLOAD: float = float(os.getenv("RESULT_CACHE_MAX_STALE_BEATPORT_SEARCH_PAYLOAD", "0"))
+    # Délai (en secondes) avant un nouveau rafraîchissement en arrière-plan après un échec
+    RESULT_CACHE_REFRESH_BACKOFF: float = float(os.getenv("RESULT_CACHE_REFRESH_BACKOFF", "30"))
+    # Cache négatif (ressource introuvable, page sans données, recherche sans résultat): TTL court
+    # et taille propre, séparés du cache des résultats (TTL 0 = désactivé)
+    RESULT_CACHE_NEGATIVE_TTL: float = float(os.getenv("RESULT_CACHE_NEGATIVE_TTL", "60"))
+    RESULT_CACHE_NEGATIVE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_NEGATIVE_MAX_ENTRIES", "500"))
+
+    # Beatport: données Next.js via /_next/data/<buildId>/...json plutôt que la page HTML complète
+    BEATPORT_NEXT_DATA_ENABLED: bool = os.getenv("BEATPORT_NEXT_DATA_ENABLED", "True").lower() == "true"
+    # Pages HTML Beatport lues en streaming jusqu'à la fin du __NEXT_DATA__, connexion fermée ensuite
+    BEATPORT_STREAM_ENABLED: bool = os.getenv("BEATPORT_STREAM_ENABLED", "True").lower() == "true"
+    # Décodage incrémental (ijson) du dehydratedState Beatport: seule la query utile est matérialisée
+    BEATPORT_LAZY_DECODE_ENABLED: bool = os.getenv("BEATPORT_LAZY_DECODE_ENABLED", "True").lower() == "true"
+    # Parseur HTML des pages Bandcamp: "lxml" (rapide, si installé) ou "beautifulsoup"
+    BANDCAMP_HTML_BACKEND: str = os.getenv("BANDCAMP_HTML_BACKEND", "lxml")
+    # Taille maximale d'un corps lu en streaming (en octets)
+    HTTP_STREAM_MAX_BYTES: int = int(os.getenv("HTTP_STREAM_MAX_BYTES", str(8 * 1024 * 1024)))
+
+    # Parsing des grosses pages dans un pool de processus (0 = toujours dans la boucle d'événements);
+    # en dessous du seuil (en octets), le parsing reste dans la boucle
+    PARSE_EXECUTOR_WORKERS: int = int(os.getenv("PARSE_EXECUTOR_WORKERS", "2"))
+    PARSE_EXECUTOR_INLINE_MAX_BYTES: int = int(os.getenv("PARSE_EXECUTOR_INLINE_MAX_BYTES", str(256 * 1024)))
+
+    # Réponses des outils MCP en JSON indenté (débogage); compactes par défaut
+    MCP_PRETTY_JSON: bool = os.getenv("MCP_PRETTY_JSON", "False").lower() == "true"
+
     # User-Agent pour les requêtes
     USER_AGENT: str = os.getenv(
         "USER_AGENT",
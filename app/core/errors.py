@@ -33,6 +33,7 @@ class TemporaryScraperException(ScraperException):
             details: Optional[Dict[str, Any]] = None
     ):
         details = details or {}
+        self.retry_after = retry_after
         if retry_after:
             details["retry_after"] = retry_after
         super().__init__(
@@ -148,3 +149,10 @@ class ParsingException(PermanentScraperException):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             details=details
         )
+
+
+class MissingPageDataException(ParsingException):
+    """
+    Exception pour une page reçue sans les données attendues
+    (ex: script __NEXT_DATA__ absent)
+    """
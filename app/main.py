@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI, Request
@@ -9,6 +10,8 @@ from app.core.config import settings
 from app.core.errors import ScraperException
 from app.models import ErrorResponse
 from app.routers import soundcloud_router, beatport_router, bandcamp_router
+from app.services import http_client, metrics, parse_executor, result_cache
+from app.services.soundcloud import soundcloud_auth
 
 # TODO: [MCP Migration - Phase 4] Ce fichier sera supprimé après migration complète vers MCP
 # Actuellement maintenu pour compatibilité REST API pendant la phase de transition
@@ -20,6 +23,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Cycle de vie de l'application: ouverture et fermeture des clients HTTP partagés,
+    arrêt des rafraîchissements (cache de résultats, token SoundCloud) et des processus de parsing
+    """
+    await http_client.start()
+    yield
+    await result_cache.close()
+    await soundcloud_auth.close()
+    await parse_executor.close()
+    await http_client.close()
+
+
 # Création de l'application FastAPI
 app = FastAPI(
     title=settings.APP_NAME,
@@ -27,6 +45,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configuration CORS
@@ -84,6 +103,15 @@ async def status():
     }
 
 
+# Route des métriques
+@app.get("/metrics", tags=["status"])
+async def get_metrics():
+    """
+    Métriques internes: clients HTTP, limiteur de débit, caches...
+    """
+    return metrics.snapshot()
+
+
 # Point d'entrée pour exécuter l'application directement
 if __name__ == "__main__":
     uvicorn.run(
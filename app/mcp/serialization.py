@@ -0,0 +1,19 @@
+from typing import Any, Dict, Optional, Union
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app.core.config import settings
+
+# Résultat d'un outil MCP: modèle Pydantic, ou payload d'erreur {"error", "tool", <arguments>}
+ToolResult = Union[BaseModel, Dict[str, Any]]
+
+
+def serialize_tool_result(result: ToolResult, pretty: Optional[bool] = None) -> bytes:
+    """
+    Sérialise un résultat d'outil en JSON UTF-8 en une seule passe (pydantic-core, sans dict
+    intermédiaire). Compact par défaut; indenté si pretty (par défaut: MCP_PRETTY_JSON)
+    """
+    if pretty is None:
+        pretty = settings.MCP_PRETTY_JSON
+    return to_json(result, indent=2 if pretty else None)
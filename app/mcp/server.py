@@ -1,22 +1,27 @@
-import json
 import logging
 import os
+from contextlib import asynccontextmanager
 from typing import Any
 
 from mcp.server import Server
 from mcp.server.sse import SseServerTransport
 from mcp.types import TextContent
 from starlette.applications import Starlette
-from starlette.responses import Response
+from starlette.responses import JSONResponse, Response
 from starlette.routing import Mount, Route
 
+from app.mcp.serialization import serialize_tool_result
 from app.mcp.tools import (
     soundcloud_search_profiles_tool,
     soundcloud_get_profile_tool,
+    soundcloud_get_profiles_tool,
+    soundcloud_get_social_links_tool,
     beatport_search_tool,
     beatport_get_label_releases_tool,
     bandcamp_search_tool,
 )
+from app.services import http_client, metrics, parse_executor, result_cache
+from app.services.soundcloud import soundcloud_auth
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +34,8 @@ def create_mcp_server() -> Server:
         return [
             soundcloud_search_profiles_tool,
             soundcloud_get_profile_tool,
+            soundcloud_get_profiles_tool,
+            soundcloud_get_social_links_tool,
             beatport_search_tool,
             beatport_get_label_releases_tool,
             bandcamp_search_tool,
@@ -39,27 +46,37 @@ def create_mcp_server() -> Server:
         if name == "soundcloud_search_profiles":
             from app.mcp.tools.soundcloud_tools import execute_soundcloud_search
             result = await execute_soundcloud_search(**arguments)
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+            return [TextContent(type="text", text=serialize_tool_result(result).decode())]
 
         elif name == "soundcloud_get_profile":
             from app.mcp.tools.soundcloud_tools import execute_soundcloud_get_profile
             result = await execute_soundcloud_get_profile(**arguments)
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+            return [TextContent(type="text", text=serialize_tool_result(result).decode())]
+
+        elif name == "soundcloud_get_profiles":
+            from app.mcp.tools.soundcloud_tools import execute_soundcloud_get_profiles
+            result = await execute_soundcloud_get_profiles(**arguments)
+            return [TextContent(type="text", text=serialize_tool_result(result).decode())]
+
+        elif name == "soundcloud_get_social_links":
+            from app.mcp.tools.soundcloud_tools import execute_soundcloud_get_social_links
+            result = await execute_soundcloud_get_social_links(**arguments)
+            return [TextContent(type="text", text=serialize_tool_result(result).decode())]
 
         elif name == "beatport_search":
             from app.mcp.tools.beatport_tools import execute_beatport_search
             result = await execute_beatport_search(**arguments)
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+            return [TextContent(type="text", text=serialize_tool_result(result).decode())]
 
         elif name == "beatport_get_label_releases":
             from app.mcp.tools.beatport_tools import execute_beatport_get_label_releases
             result = await execute_beatport_get_label_releases(**arguments)
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+            return [TextContent(type="text", text=serialize_tool_result(result).decode())]
 
         elif name == "bandcamp_search":
             from app.mcp.tools.bandcamp_tools import execute_bandcamp_search
             result = await execute_bandcamp_search(**arguments)
-            return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+            return [TextContent(type="text", text=serialize_tool_result(result).decode())]
 
         else:
             raise ValueError(f"Unknown tool: {name}")
@@ -85,9 +102,26 @@ async def handle_sse(request):
     return Response()
 
 
+async def handle_metrics(request):
+    return JSONResponse(metrics.snapshot())
+
+
 routes = [
     Route("/sse", endpoint=handle_sse, methods=["GET"]),
+    Route("/metrics", endpoint=handle_metrics, methods=["GET"]),
     Mount("/messages/", app=sse_transport.handle_post_message),
 ]
 
-app = Starlette(routes=routes)
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    # Clients HTTP partagés ouverts pour toute la durée de vie du serveur MCP
+    await http_client.start()
+    yield
+    await result_cache.close()
+    await soundcloud_auth.close()
+    await parse_executor.close()
+    await http_client.close()
+
+
+app = Starlette(routes=routes, lifespan=lifespan)
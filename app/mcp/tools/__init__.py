@@ -1,6 +1,8 @@
 from app.mcp.tools.soundcloud_tools import (
     soundcloud_search_profiles_tool,
     soundcloud_get_profile_tool,
+    soundcloud_get_profiles_tool,
+    soundcloud_get_social_links_tool,
 )
 from app.mcp.tools.beatport_tools import (
     beatport_search_tool,
@@ -13,6 +15,8 @@ from app.mcp.tools.bandcamp_tools import (
 __all__ = [
     "soundcloud_search_profiles_tool",
     "soundcloud_get_profile_tool",
+    "soundcloud_get_profiles_tool",
+    "soundcloud_get_social_links_tool",
     "beatport_search_tool",
     "beatport_get_label_releases_tool",
     "bandcamp_search_tool",
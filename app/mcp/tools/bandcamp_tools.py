@@ -1,11 +1,11 @@
-import json
 import logging
-from typing import Any
 
 from mcp.types import Tool
 
+from app.mcp.serialization import ToolResult
 from app.models.bandcamp_models import BandcampEntityType
 from app.scrapers.bandcamp import BandcampSearchScraper
+from app.services import result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +30,11 @@ bandcamp_search_tool = Tool(
                 "description": "Search type: 'bands' for artists/labels or 'tracks' for music tracks (default: 'bands')",
                 "enum": ["bands", "tracks"],
                 "default": "bands"
+            },
+            "bypass_cache": {
+                "type": "boolean",
+                "description": "Ignore cached results and fetch fresh data (default: false)",
+                "default": False
             }
         },
         "required": ["query"]
@@ -40,21 +45,27 @@ bandcamp_search_tool = Tool(
 async def execute_bandcamp_search(
     query: str,
     page: int = 1,
-    entity_type: str = "bands"
-) -> dict[str, Any]:
+    entity_type: str = "bands",
+    bypass_cache: bool = False
+) -> ToolResult:
     try:
         entity_type_enum = BandcampEntityType.BANDS
         if entity_type == "tracks":
             entity_type_enum = BandcampEntityType.TRACKS
 
         scraper = BandcampSearchScraper()
-        result = await scraper.scrape(
-            query=query,
-            page=page,
-            entity_type=entity_type_enum
+        result = await result_cache.get_or_compute(
+            "bandcamp_search",
+            {"query": query, "page": page, "entity_type": entity_type_enum},
+            lambda: scraper.scrape(
+                query=query,
+                page=page,
+                entity_type=entity_type_enum
+            ),
+            bypass=bypass_cache,
         )
 
-        return json.loads(result.model_dump_json())
+        return result
 
     except Exception as e:
         logger.error(f"Error executing bandcamp_search: {e}")
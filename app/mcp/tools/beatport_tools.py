@@ -1,13 +1,14 @@
-import json
 import logging
 from datetime import date
-from typing import Any, Optional
+from typing import Optional
 
 from mcp.types import Tool
 
+from app.mcp.serialization import ToolResult
 from app.models import LimitEnum
 from app.models.beatport_models import BeatportEntityType, BeatportReleaseEntityType
 from app.scrapers.beatport import BeatportSearchScraper, BeatportReleasesScraper
+from app.services import result_cache
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +39,11 @@ beatport_search_tool = Tool(
                 "description": "Filter results by entity type: 'artist', 'label', 'track', 'release', or null for all types (default: null)",
                 "enum": ["artist", "label", "track", "release"],
                 "default": None
+            },
+            "bypass_cache": {
+                "type": "boolean",
+                "description": "Ignore cached results and fetch fresh data (default: false)",
+                "default": False
             }
         },
         "required": ["query"]
@@ -74,6 +80,11 @@ beatport_get_label_releases_tool = Tool(
                 "type": "string",
                 "description": "Filter releases from this date (format: YYYY-MM-DD). Example: '2024-01-15'",
                 "default": None
+            },
+            "bypass_cache": {
+                "type": "boolean",
+                "description": "Ignore cached results and fetch fresh data (default: false)",
+                "default": False
             }
         },
         "required": ["entity_slug", "entity_id"]
@@ -85,8 +96,9 @@ async def execute_beatport_search(
     query: str,
     page: int = 1,
     limit: int = 10,
-    entity_type: Optional[str] = None
-) -> dict[str, Any]:
+    entity_type: Optional[str] = None,
+    bypass_cache: bool = False
+) -> ToolResult:
     try:
         limit_enum = LimitEnum.TEN
         if limit == 25:
@@ -99,14 +111,19 @@ async def execute_beatport_search(
             entity_type_filter = BeatportEntityType(entity_type)
 
         scraper = BeatportSearchScraper()
-        result = await scraper.scrape(
-            query=query,
-            page=page,
-            limit=limit_enum,
-            entity_type_filter=entity_type_filter
+        result = await result_cache.get_or_compute(
+            "beatport_search",
+            {"query": query, "page": page, "limit": limit_enum, "entity_type": entity_type_filter},
+            lambda: scraper.scrape(
+                query=query,
+                page=page,
+                limit=limit_enum,
+                entity_type_filter=entity_type_filter
+            ),
+            bypass=bypass_cache,
         )
 
-        return json.loads(result.model_dump_json())
+        return result
 
     except Exception as e:
         logger.error(f"Error executing beatport_search: {e}")
@@ -122,8 +139,9 @@ async def execute_beatport_get_label_releases(
     entity_id: str,
     page: int = 1,
     limit: int = 25,
-    start_date: Optional[str] = None
-) -> dict[str, Any]:
+    start_date: Optional[str] = None,
+    bypass_cache: bool = False
+) -> ToolResult:
     try:
         limit_enum = LimitEnum.TEN
         if limit == 25:
@@ -139,16 +157,22 @@ async def execute_beatport_get_label_releases(
                 logger.warning(f"Invalid date format: {start_date}, ignoring")
 
         scraper = BeatportReleasesScraper()
-        result = await scraper.scrape(
-            entity_type=BeatportEntityType.LABEL,
-            entity_slug=entity_slug,
-            entity_id=entity_id,
-            page=page,
-            limit=limit_enum,
-            start_date=start_date_obj
+        result = await result_cache.get_or_compute(
+            "beatport_get_label_releases",
+            {"entity_type": BeatportEntityType.LABEL, "entity_slug": entity_slug, "entity_id": entity_id,
+             "page": page, "limit": limit_enum, "start_date": start_date_obj},
+            lambda: scraper.scrape(
+                entity_type=BeatportEntityType.LABEL,
+                entity_slug=entity_slug,
+                entity_id=entity_id,
+                page=page,
+                limit=limit_enum,
+                start_date=start_date_obj
+            ),
+            bypass=bypass_cache,
         )
 
-        return json.loads(result.model_dump_json())
+        return result
 
     except Exception as e:
         logger.error(f"Error executing beatport_get_label_releases: {e}")
@@ -1,18 +1,19 @@
-import json
 import logging
-from typing import Any
+from typing import List, Optional
 
 from mcp.types import Tool, TextContent
 
+from app.mcp.serialization import ToolResult
 from app.models import LimitEnum
-from app.scrapers.soundcloud import SoundcloudSearchProfileScraper, SoundcloudProfileScraper
+from app.scrapers.soundcloud import SoundcloudBatchScraper, SoundcloudSearchProfileScraper, SoundcloudProfileScraper
+from app.services import result_cache
 
 logger = logging.getLogger(__name__)
 
 
 soundcloud_search_profiles_tool = Tool(
     name="soundcloud_search_profiles",
-    description="Search for artist or label profiles on SoundCloud by name or keyword. Returns a list of profiles with id, name, url, avatar_url, bio, location, followers_count, and social_links (Facebook, Instagram, Bandcamp, etc.).",
+    description="Search for artist or label profiles on SoundCloud by name or keyword. Returns a list of profiles with id, name, url, avatar_url, bio, location, and followers_count. Social links (Facebook, Instagram, Bandcamp, etc.) cost one extra request per profile: they are only fetched with include_social_links (optionally for the first social_links_top_k profiles), otherwise social_links is null. Use soundcloud_get_social_links afterwards for a chosen subset of profiles.",
     inputSchema={
         "type": "object",
         "properties": {
@@ -30,6 +31,21 @@ soundcloud_search_profiles_tool = Tool(
                 "description": "Number of results per page: 10, 25, or 50 (default: 10)",
                 "enum": [10, 25, 50],
                 "default": 10
+            },
+            "include_social_links": {
+                "type": "boolean",
+                "description": "Fetch social links for the returned profiles (one extra request per profile, default: false)",
+                "default": False
+            },
+            "social_links_top_k": {
+                "type": "integer",
+                "description": "With include_social_links, only fetch social links for the first K profiles (default: all)",
+                "minimum": 1
+            },
+            "bypass_cache": {
+                "type": "boolean",
+                "description": "Ignore cached results and fetch fresh data (default: false)",
+                "default": False
             }
         },
         "required": ["query"]
@@ -46,6 +62,11 @@ soundcloud_get_profile_tool = Tool(
             "user_id": {
                 "type": "integer",
                 "description": "SoundCloud user ID to retrieve profile information"
+            },
+            "bypass_cache": {
+                "type": "boolean",
+                "description": "Ignore cached results and fetch fresh data (default: false)",
+                "default": False
             }
         },
         "required": ["user_id"]
@@ -53,7 +74,60 @@ soundcloud_get_profile_tool = Tool(
 )
 
 
-async def execute_soundcloud_search(query: str, page: int = 1, limit: int = 10) -> dict[str, Any]:
+soundcloud_get_profiles_tool = Tool(
+    name="soundcloud_get_profiles",
+    description="Get detailed profile information for a list of SoundCloud user IDs in one call, instead of one soundcloud_get_profile call per ID. Duplicate IDs are fetched once and cached profiles are reused. Returns one entry per ID with user_id and either profile (same fields as soundcloud_get_profile) or error; a failing ID does not fail the batch.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "user_ids": {
+                "type": "array",
+                "items": {"type": "integer"},
+                "minItems": 1,
+                "description": "SoundCloud user IDs to retrieve profile information for"
+            },
+            "bypass_cache": {
+                "type": "boolean",
+                "description": "Ignore cached results and fetch fresh data (default: false)",
+                "default": False
+            }
+        },
+        "required": ["user_ids"]
+    }
+)
+
+
+soundcloud_get_social_links_tool = Tool(
+    name="soundcloud_get_social_links",
+    description="Get social links (Facebook, Instagram, Bandcamp, etc.) for a list of SoundCloud user IDs, typically a subset of profiles returned by soundcloud_search_profiles. Duplicate IDs are fetched once. Returns one entry per ID with user_id and either social_links or error; a failing ID does not fail the batch.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "user_ids": {
+                "type": "array",
+                "items": {"type": "integer"},
+                "minItems": 1,
+                "description": "SoundCloud user IDs to retrieve social links for"
+            },
+            "bypass_cache": {
+                "type": "boolean",
+                "description": "Ignore cached results and fetch fresh data (default: false)",
+                "default": False
+            }
+        },
+        "required": ["user_ids"]
+    }
+)
+
+
+async def execute_soundcloud_search(
+    query: str,
+    page: int = 1,
+    limit: int = 10,
+    include_social_links: bool = False,
+    social_links_top_k: Optional[int] = None,
+    bypass_cache: bool = False
+) -> ToolResult:
     try:
         limit_enum = LimitEnum.TEN
         if limit == 25:
@@ -61,10 +135,21 @@ async def execute_soundcloud_search(query: str, page: int = 1, limit: int = 10)
         elif limit == 50:
             limit_enum = LimitEnum.FIFTY
 
+        # Sans enrichissement, le nombre de profils enrichis n'a pas de sens (même clé de cache)
+        if not include_social_links:
+            social_links_top_k = None
+
         scraper = SoundcloudSearchProfileScraper()
-        result = await scraper.scrape(name=query, page=page, limit=limit_enum)
+        result = await result_cache.get_or_compute(
+            "soundcloud_search_profiles",
+            {"name": query, "page": page, "limit": limit_enum, "include_social_links": include_social_links,
+             "social_links_top_k": social_links_top_k},
+            lambda: scraper.scrape(name=query, page=page, limit=limit_enum, include_social_links=include_social_links,
+                                   social_links_top_k=social_links_top_k),
+            bypass=bypass_cache,
+        )
 
-        return json.loads(result.model_dump_json())
+        return result
 
     except Exception as e:
         logger.error(f"Error executing soundcloud_search_profiles: {e}")
@@ -75,12 +160,17 @@ async def execute_soundcloud_search(query: str, page: int = 1, limit: int = 10)
         }
 
 
-async def execute_soundcloud_get_profile(user_id: int) -> dict[str, Any]:
+async def execute_soundcloud_get_profile(user_id: int, bypass_cache: bool = False) -> ToolResult:
     try:
         scraper = SoundcloudProfileScraper()
-        result = await scraper.scrape(user_id=user_id)
+        result = await result_cache.get_or_compute(
+            "soundcloud_get_profile",
+            {"user_id": user_id},
+            lambda: scraper.scrape(user_id=user_id),
+            bypass=bypass_cache,
+        )
 
-        return json.loads(result.model_dump_json())
+        return result
 
     except Exception as e:
         logger.error(f"Error executing soundcloud_get_profile: {e}")
@@ -89,3 +179,31 @@ async def execute_soundcloud_get_profile(user_id: int) -> dict[str, Any]:
             "tool": "soundcloud_get_profile",
             "user_id": user_id
         }
+
+
+async def execute_soundcloud_get_profiles(user_ids: List[int], bypass_cache: bool = False) -> ToolResult:
+    try:
+        # Chaque identifiant passe par le cache de soundcloud_get_profile: pas de cache au niveau du lot
+        return await SoundcloudBatchScraper().scrape_profiles(user_ids, bypass_cache=bypass_cache)
+
+    except Exception as e:
+        logger.error(f"Error executing soundcloud_get_profiles: {e}")
+        return {
+            "error": str(e),
+            "tool": "soundcloud_get_profiles",
+            "user_ids": user_ids
+        }
+
+
+async def execute_soundcloud_get_social_links(user_ids: List[int], bypass_cache: bool = False) -> ToolResult:
+    try:
+        # Chaque identifiant passe par le cache des résultats: pas de cache au niveau du lot
+        return await SoundcloudBatchScraper().scrape_social_links(user_ids, bypass_cache=bypass_cache)
+
+    except Exception as e:
+        logger.error(f"Error executing soundcloud_get_social_links: {e}")
+        return {
+            "error": str(e),
+            "tool": "soundcloud_get_social_links",
+            "user_ids": user_ids
+        }
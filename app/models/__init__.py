@@ -6,4 +6,6 @@ from .schemas import ErrorResponse, SuccessResponse
 from .pagination_models import LimitEnum, Pagination
 from .bandcamp_models import BandcampBandProfile, BandcampSearchResult, BandcampEntityType
 from .beatport_models import BeatportProfile, BeatportSearchResult
-from .soundcloud_models import SoundcloudProfile, SoundcloudSearchResult
+from .soundcloud_models import (SoundcloudProfile, SoundcloudProfileItem, SoundcloudProfilesBatchResult,
+                                SoundcloudSearchResult, SoundcloudSocialLinksBatchResult,
+                                SoundcloudSocialLinksItem, SoundcloudUserIdsRequest)
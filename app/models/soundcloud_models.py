@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from pydantic import Field
+from pydantic import BaseModel, Field
 
 from app.models import ArtistProfile, Track, Pagination
 from app.models.social_link import SocialLink
@@ -17,4 +17,30 @@ class SoundcloudProfile(ArtistProfile):
 
 class SoundcloudSearchResult(Pagination):
     profiles: List[SoundcloudProfile] = Field(default_factory=list)
-    tracks: List[Track] = Field(default_factory=list)
\ No newline at end of file
+    tracks: List[Track] = Field(default_factory=list)
+
+
+class SoundcloudUserIdsRequest(BaseModel):
+    user_ids: List[int] = Field(min_length=1)
+
+
+class SoundcloudSocialLinksItem(BaseModel):
+    # Réseaux sociaux d'un identifiant du lot, ou l'erreur rencontrée pour lui seul
+    user_id: int
+    social_links: Optional[List[SocialLink]] = None
+    error: Optional[str] = None
+
+
+class SoundcloudSocialLinksBatchResult(BaseModel):
+    results: List[SoundcloudSocialLinksItem] = Field(default_factory=list)
+
+
+class SoundcloudProfileItem(BaseModel):
+    # Profil d'un identifiant du lot, ou l'erreur rencontrée pour lui seul
+    user_id: int
+    profile: Optional[SoundcloudProfile] = None
+    error: Optional[str] = None
+
+
+class SoundcloudProfilesBatchResult(BaseModel):
+    results: List[SoundcloudProfileItem] = Field(default_factory=list)
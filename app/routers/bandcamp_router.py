@@ -5,6 +5,7 @@ from app.core.errors import (ParsingException, ResourceNotFoundException,
 from app.core.security import get_api_key
 from app.models import (ErrorResponse, BandcampSearchResult, BandcampEntityType)
 from app.scrapers import BandcampSearchScraper
+from app.services import result_cache
 
 # TODO: [MCP Migration - Phase 3] Ce router sera supprimé après implémentation des MCP tools Bandcamp
 # À remplacer par app/mcp/tools/bandcamp_tools.py
@@ -33,10 +34,16 @@ async def search(
         query: str,
         page: int = 1,
         entity_type: BandcampEntityType = Query(BandcampEntityType.BANDS, description="Type d'entité à rechercher (b=artistes et labels, t=pistes)"),
+        bypass_cache: bool = Query(False, description="Ignorer le cache de résultats et récupérer des données fraîches"),
 ):
     try:
         scraper = BandcampSearchScraper()
-        search_results = await scraper.scrape(query, page, entity_type)
+        search_results = await result_cache.get_or_compute(
+            "bandcamp_search",
+            {"query": query, "page": page, "entity_type": entity_type},
+            lambda: scraper.scrape(query, page, entity_type),
+            bypass=bypass_cache,
+        )
         return search_results
     except ResourceNotFoundException as e:
         raise HTTPException(
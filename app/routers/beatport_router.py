@@ -10,6 +10,7 @@ from app.models import (BeatportSearchResult, ErrorResponse,
                         LimitEnum, Release)
 from app.models.beatport_models import BeatportEntityType, BeatportReleaseEntityType, BeatportReleasesResult
 from app.scrapers import BeatportReleasesScraper, BeatportSearchScraper
+from app.services import result_cache
 
 # TODO: [MCP Migration - Phase 2] Ce router sera supprimé après implémentation des MCP tools Beatport
 # À remplacer par app/mcp/tools/beatport_tools.py
@@ -38,11 +39,17 @@ async def search(
         query: str,
         page: int = 1,
         limit: LimitEnum = LimitEnum.TEN,
-        entity_type: BeatportEntityType = None
+        entity_type: BeatportEntityType = None,
+        bypass_cache: bool = Query(False, description="Ignorer le cache de résultats et récupérer des données fraîches")
 ):
     try:
         scraper = BeatportSearchScraper()
-        search_results = await scraper.scrape(query, page, limit, entity_type)
+        search_results = await result_cache.get_or_compute(
+            "beatport_search",
+            {"query": query, "page": page, "limit": limit, "entity_type": entity_type},
+            lambda: scraper.scrape(query, page, limit, entity_type),
+            bypass=bypass_cache,
+        )
         return search_results
     except ResourceNotFoundException as e:
         raise HTTPException(
@@ -79,18 +86,26 @@ async def get_entity_releases(
         page: int = 1,
         limit: LimitEnum = LimitEnum.TWENTY_FIVE,
         start_date: Optional[date] = Query(None, description="Date de début au format YYYY-MM-DD"),
-        end_date: Optional[date] = Query(None, description="Date de fin au format YYYY-MM-DD")
+        end_date: Optional[date] = Query(None, description="Date de fin au format YYYY-MM-DD"),
+        bypass_cache: bool = Query(False, description="Ignorer le cache de résultats et récupérer des données fraîches")
 ):
     try:
         scraper = BeatportReleasesScraper()
-        result = await scraper.scrape(
-            entity_type=BeatportEntityType(entity_type),
-            entity_slug=entity_slug,
-            entity_id=entity_id,
-            page=page,
-            limit=limit,
-            start_date=start_date,
-            end_date=end_date
+        result = await result_cache.get_or_compute(
+            "beatport_get_label_releases" if entity_type == BeatportReleaseEntityType.LABEL
+            else "beatport_get_artist_releases",
+            {"entity_type": entity_type, "entity_slug": entity_slug, "entity_id": entity_id,
+             "page": page, "limit": limit, "start_date": start_date, "end_date": end_date},
+            lambda: scraper.scrape(
+                entity_type=BeatportEntityType(entity_type),
+                entity_slug=entity_slug,
+                entity_id=entity_id,
+                page=page,
+                limit=limit,
+                start_date=start_date,
+                end_date=end_date
+            ),
+            bypass=bypass_cache,
         )
         return result
     except ResourceNotFoundException as e:
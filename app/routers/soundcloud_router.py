@@ -1,17 +1,20 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from app.core.errors import (ParsingException, ResourceNotFoundException,
                              ScraperException)
 from app.core.security import get_api_key
-from app.models import (ErrorResponse, SoundcloudProfile, SoundcloudSearchResult,
+from app.models import (ErrorResponse, SoundcloudProfile, SoundcloudProfilesBatchResult, SoundcloudSearchResult,
+                        SoundcloudSocialLinksBatchResult, SoundcloudUserIdsRequest,
                         LimitEnum, SocialLink)
 from app.scrapers import (
+    SoundcloudBatchScraper,
     SoundcloudProfileScraper,
     SoundcloudSearchProfileScraper,
     SoundcloudWebprofilesScraper
 )
+from app.services import result_cache
 
 # TODO: [MCP Migration - Phase 4] Ce router sera supprimé après migration complète vers MCP
 # Fonctionnalités remplacées par app/mcp/tools/soundcloud_tools.py
@@ -34,16 +37,30 @@ router = APIRouter(
     "/search-profile/{name}",
     response_model=SoundcloudSearchResult,
     summary="Rechercher des profils Soundcloud",
-    description="Recherche des profils Soundcloud à partir du nom avec options de pagination",
+    description="Recherche des profils Soundcloud à partir du nom avec options de pagination. Les réseaux "
+                "sociaux (un appel amont par profil) ne sont récupérés qu'avec include_social_links",
 )
 async def search_profiles(
     name: str,
     page: int = 1,
-    limit: LimitEnum = LimitEnum.TEN
+    limit: LimitEnum = LimitEnum.TEN,
+    include_social_links: bool = Query(False, description="Récupérer les réseaux sociaux des profils"),
+    social_links_top_k: Optional[int] = Query(
+        None, ge=1, description="Avec include_social_links, seuls les K premiers profils sont enrichis"
+    ),
+    bypass_cache: bool = Query(False, description="Ignorer le cache de résultats et récupérer des données fraîches")
 ):
     try:
+        if not include_social_links:
+            social_links_top_k = None
         scraper = SoundcloudSearchProfileScraper()
-        search_results = await scraper.scrape(name, page, limit)
+        search_results = await result_cache.get_or_compute(
+            "soundcloud_search_profiles",
+            {"name": name, "page": page, "limit": limit, "include_social_links": include_social_links,
+             "social_links_top_k": social_links_top_k},
+            lambda: scraper.scrape(name, page, limit, include_social_links, social_links_top_k),
+            bypass=bypass_cache,
+        )
         return search_results
     except ResourceNotFoundException as e:
         raise HTTPException(
@@ -73,10 +90,18 @@ async def search_profiles(
     summary="Récupérer un profil Soundcloud par ID",
     description="Récupère les informations d'un profil Soundcloud à partir de son ID numérique",
 )
-async def get_profile(user_id: int):
+async def get_profile(
+    user_id: int,
+    bypass_cache: bool = Query(False, description="Ignorer le cache de résultats et récupérer des données fraîches")
+):
     try:
         scraper = SoundcloudProfileScraper()
-        profile = await scraper.scrape(user_id)
+        profile = await result_cache.get_or_compute(
+            "soundcloud_get_profile",
+            {"user_id": user_id},
+            lambda: scraper.scrape(user_id),
+            bypass=bypass_cache,
+        )
         return profile
     except ResourceNotFoundException as e:
         raise HTTPException(
@@ -100,16 +125,49 @@ async def get_profile(user_id: int):
         )
 
 
+@router.post(
+    "/profiles",
+    response_model=SoundcloudProfilesBatchResult,
+    summary="Récupérer plusieurs profils Soundcloud par ID",
+    description="Récupère les profils d'une liste d'IDs (dédoublonnés, profils en cache réutilisés); "
+                "une erreur ne concerne que son ID",
+)
+async def get_profiles_batch(
+    request: SoundcloudUserIdsRequest,
+    bypass_cache: bool = Query(False, description="Ignorer le cache de résultats et récupérer des données fraîches")
+):
+    try:
+        return await SoundcloudBatchScraper().scrape_profiles(request.user_ids, bypass_cache=bypass_cache)
+    except ScraperException as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur inattendue: {str(e)}",
+        )
+
+
 @router.get(
     "/profile/{user_id}/webprofiles",
     response_model=List[SocialLink],
     summary="Récupérer les réseaux sociaux d'un profil Soundcloud",
     description="Récupère les liens vers les réseaux sociaux d'un profil Soundcloud à partir de son ID numérique",
 )
-async def get_profile_webprofiles(user_id: int):
+async def get_profile_webprofiles(
+    user_id: int,
+    bypass_cache: bool = Query(False, description="Ignorer le cache de résultats et récupérer des données fraîches")
+):
     try:
         scraper = SoundcloudWebprofilesScraper()
-        social_links = await scraper.scrape(user_id)
+        social_links = await result_cache.get_or_compute(
+            "soundcloud_get_webprofiles",
+            {"user_id": user_id},
+            lambda: scraper.scrape(user_id),
+            bypass=bypass_cache,
+        )
         return social_links
     except ResourceNotFoundException as e:
         raise HTTPException(
@@ -131,3 +189,27 @@ async def get_profile_webprofiles(user_id: int):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur inattendue: {str(e)}",
         )
+
+
+@router.post(
+    "/webprofiles",
+    response_model=SoundcloudSocialLinksBatchResult,
+    summary="Récupérer les réseaux sociaux de plusieurs profils Soundcloud",
+    description="Récupère les réseaux sociaux d'une liste d'IDs (dédoublonnés); une erreur ne concerne que son ID",
+)
+async def get_webprofiles_batch(
+    request: SoundcloudUserIdsRequest,
+    bypass_cache: bool = Query(False, description="Ignorer le cache de résultats et récupérer des données fraîches")
+):
+    try:
+        return await SoundcloudBatchScraper().scrape_social_links(request.user_ids, bypass_cache=bypass_cache)
+    except ScraperException as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.message,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur inattendue: {str(e)}",
+        )
@@ -1,7 +1,8 @@
 from app.scrapers.soundcloud import (
     SoundcloudProfileScraper,
     SoundcloudSearchProfileScraper,
-    SoundcloudWebprofilesScraper
+    SoundcloudWebprofilesScraper,
+    SoundcloudBatchScraper
 )
 
 from app.scrapers.beatport import (
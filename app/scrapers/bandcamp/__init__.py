@@ -1,2 +1,3 @@
 from .bandcamp_search_scraper import BandcampSearchScraper
-from .bandcamp_mapping_utils import BandcampMappingUtils
\ No newline at end of file
+from .bandcamp_mapping_utils import BandcampMappingUtils
+from .bandcamp_lxml_parser import BandcampLxmlParser
\ No newline at end of file
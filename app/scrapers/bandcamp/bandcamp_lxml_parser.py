@@ -0,0 +1,91 @@
+import logging
+from typing import List, Optional
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+from app.models import BandcampBandProfile
+from app.scrapers.bandcamp.bandcamp_mapping_utils import BandcampMappingUtils
+
+logger = logging.getLogger(__name__)
+
+
+def _has_class(name: str) -> str:
+    # Équivalent XPath de class_=name côté BeautifulSoup (une des classes de l'attribut)
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+if LXML_AVAILABLE:
+    # Expressions compilées une fois: seuls les li.searchresult sont parcourus, sans arbre Python complet
+    SEARCH_RESULTS_XPATH = etree.XPath(f"//li[{_has_class('searchresult')}]")
+    HEADING_XPATH = etree.XPath(f"(.//div[{_has_class('heading')}])[1]")
+    ART_XPATH = etree.XPath(f"(.//div[{_has_class('art')}])[1]")
+    SUBHEAD_XPATH = etree.XPath(f"(.//div[{_has_class('subhead')}])[1]")
+    GENRE_XPATH = etree.XPath(f"(.//div[{_has_class('genre')}])[1]")
+    LINK_XPATH = etree.XPath("(.//a)[1]")
+    IMG_XPATH = etree.XPath("(.//img)[1]")
+    TEXT_XPATH = etree.XPath(".//text()")
+
+
+class BandcampLxmlParser:
+    """
+    Parseur lxml des résultats de recherche Bandcamp. Produit les mêmes profils que
+    BandcampMappingUtils.extract_profile sur un arbre BeautifulSoup, en plusieurs fois moins de temps
+    """
+
+    @staticmethod
+    def parse_search_results(html: str) -> List[BandcampBandProfile]:
+        """Parse les résultats de recherche depuis le HTML"""
+        try:
+            root = lxml_html.fromstring(html)
+        except etree.ParserError:
+            # Document vide
+            return []
+
+        profiles = []
+        for result in SEARCH_RESULTS_XPATH(root):
+            profile = BandcampLxmlParser.extract_profile(result)
+            if profile:
+                profiles.append(profile)
+        return profiles
+
+    @staticmethod
+    def extract_profile(result_element: "lxml_html.HtmlElement") -> Optional[BandcampBandProfile]:
+        """Extrait un profil Bandcamp depuis un élément li.searchresult"""
+        try:
+            heading = BandcampLxmlParser._first(HEADING_XPATH, result_element)
+            link_element = BandcampLxmlParser._first(LINK_XPATH, heading) if heading is not None else None
+            if link_element is None:
+                return None
+
+            art = BandcampLxmlParser._first(ART_XPATH, result_element)
+            avatar_img = BandcampLxmlParser._first(IMG_XPATH, art) if art is not None else None
+            subhead = BandcampLxmlParser._first(SUBHEAD_XPATH, result_element)
+            genre = BandcampLxmlParser._first(GENRE_XPATH, result_element)
+
+            return BandcampMappingUtils.build_profile(
+                name=BandcampLxmlParser._text(link_element),
+                href=link_element.get('href'),
+                avatar_url=avatar_img.get('src') if avatar_img is not None else None,
+                location=BandcampMappingUtils.clean_location(BandcampLxmlParser._text(subhead)) if subhead is not None else None,
+                genre=BandcampMappingUtils.clean_genre(BandcampLxmlParser._text(genre)) if genre is not None else None
+            )
+
+        except Exception as e:
+            logger.error(f"Erreur lors de l'extraction d'un profil Bandcamp: {str(e)}")
+            return None
+
+    @staticmethod
+    def _first(xpath: "etree.XPath", element: "lxml_html.HtmlElement") -> Optional["lxml_html.HtmlElement"]:
+        matches = xpath(element)
+        return matches[0] if matches else None
+
+    @staticmethod
+    def _text(element: "lxml_html.HtmlElement") -> str:
+        # Équivalent de get_text(strip=True): morceaux de texte nettoyés et accolés
+        return "".join(text.strip() for text in TEXT_XPATH(element))
@@ -36,34 +36,38 @@ class BandcampMappingUtils:
             if not link_element:
                 return None
 
-            name = link_element.get_text(strip=True)
-            url = link_element.get('href')
-
-            # S'assurer que l'URL est absolue
-            if url and not url.startswith('http'):
-                url = urljoin(BANDCAMP_BASE_URL, url)
-            # Nettoyer l'URL
-            url = BandcampMappingUtils._clean_bandcamp_url(url)
-
-            # Extraire les champs
-            avatar_url = BandcampMappingUtils._extract_avatar_url(result_element)
-            location = BandcampMappingUtils._extract_location(result_element)
-            genre = BandcampMappingUtils._extract_genre(result_element)
-            profile_id = BandcampMappingUtils._generate_id_from_url(url)
-
-            return BandcampBandProfile(
-                id=profile_id,
-                name=name,
-                url=url,
-                avatar_url=avatar_url,
-                location=location,
-                genre=genre
+            return BandcampMappingUtils.build_profile(
+                name=link_element.get_text(strip=True),
+                href=link_element.get('href'),
+                avatar_url=BandcampMappingUtils._extract_avatar_url(result_element),
+                location=BandcampMappingUtils._extract_location(result_element),
+                genre=BandcampMappingUtils._extract_genre(result_element)
             )
 
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction d'un profil Bandcamp: {str(e)}")
             return None
 
+    @staticmethod
+    def build_profile(name: str, href: Optional[str], avatar_url: Optional[str],
+                      location: Optional[str], genre: Optional[str]) -> BandcampBandProfile:
+        """Construit le profil à partir des champs bruts, quel que soit le parseur HTML utilisé"""
+        url = href
+        # S'assurer que l'URL est absolue
+        if url and not url.startswith('http'):
+            url = urljoin(BANDCAMP_BASE_URL, url)
+        # Nettoyer l'URL
+        url = BandcampMappingUtils._clean_bandcamp_url(url)
+
+        return BandcampBandProfile(
+            id=BandcampMappingUtils._generate_id_from_url(url),
+            name=name,
+            url=url,
+            avatar_url=avatar_url,
+            location=location,
+            genre=genre
+        )
+
     @staticmethod
     def _extract_avatar_url(result_element: Tag) -> Optional[str]:
         """Extrait l'URL de l'avatar depuis l'élément de résultat"""
@@ -87,14 +91,7 @@ class BandcampMappingUtils:
             if not location_elem:
                 return None
 
-            full_location = location_elem.get_text(strip=True)
-            if not full_location:
-                return None
-
-            # Extraire seulement le pays (dernière partie après la virgule)
-            if ',' in full_location:
-                return full_location.split(',')[-1].strip()
-            return full_location
+            return BandcampMappingUtils.clean_location(location_elem.get_text(strip=True))
 
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction de la localisation: {str(e)}")
@@ -108,19 +105,30 @@ class BandcampMappingUtils:
             if not genre_elem:
                 return None
 
-            genre_text = genre_elem.get_text(strip=True)
-            if not genre_text:
-                return None
-
-            # Nettoyer le texte du genre (retirer "genre: " si présent)
-            if genre_text.lower().startswith('genre:'):
-                return genre_text[6:].strip()
-            return genre_text
+            return BandcampMappingUtils.clean_genre(genre_elem.get_text(strip=True))
 
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction du genre: {str(e)}")
             return None
 
+    @staticmethod
+    def clean_location(full_location: str) -> Optional[str]:
+        """Garde seulement le pays (dernière partie après la virgule)"""
+        if not full_location:
+            return None
+        if ',' in full_location:
+            return full_location.split(',')[-1].strip()
+        return full_location
+
+    @staticmethod
+    def clean_genre(genre_text: str) -> Optional[str]:
+        """Nettoie le texte du genre (retire "genre: " si présent)"""
+        if not genre_text:
+            return None
+        if genre_text.lower().startswith('genre:'):
+            return genre_text[6:].strip()
+        return genre_text
+
     @staticmethod
     def _clean_bandcamp_url(url: str) -> str:
         """Nettoie l'URL Bandcamp avec regex pour garder seulement le domaine"""
@@ -1,12 +1,16 @@
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from bs4 import BeautifulSoup
 
+from app.core.config import settings
 from app.core.errors import ParsingException, ResourceNotFoundException
 from app.models import BandcampSearchResult, BandcampBandProfile, BandcampEntityType
 from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.bandcamp import bandcamp_lxml_parser
+from app.scrapers.bandcamp.bandcamp_lxml_parser import BandcampLxmlParser
 from app.scrapers.bandcamp.bandcamp_mapping_utils import BandcampMappingUtils
+from app.services import parse_executor
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +36,12 @@ class BandcampSearchScraper(BaseScraper):
             )
 
         try:
-            # Parser le HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            profiles = self._parse_search_results(soup)
+            # Parser le HTML (hors de la boucle d'événements pour les grosses pages): le contenu brut
+            # est transmis, le décodage du charset se fait avec le parsing
+            use_lxml = settings.BANDCAMP_HTML_BACKEND == "lxml" and bandcamp_lxml_parser.LXML_AVAILABLE
+            profiles_data = await parse_executor.run(parse_search_page, response.content, use_lxml,
+                                                     response.charset_encoding)
+            profiles = [BandcampBandProfile.model_validate(profile) for profile in profiles_data]
 
             search_result = BandcampSearchResult(
                 bands=profiles
@@ -51,7 +58,8 @@ class BandcampSearchScraper(BaseScraper):
                 )
             raise
 
-    def _parse_search_results(self, soup: BeautifulSoup) -> List[BandcampBandProfile]:
+    @staticmethod
+    def _parse_search_results(soup: BeautifulSoup) -> List[BandcampBandProfile]:
         """Parse les résultats de recherche depuis le HTML"""
         profiles = []
 
@@ -64,3 +72,16 @@ class BandcampSearchScraper(BaseScraper):
                 profiles.append(profile)
 
         return profiles
+
+
+def parse_search_page(content: bytes, use_lxml: bool, encoding: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Décode (charset de la réponse, UTF-8 par défaut) et parse une page de résultats avec lxml ou
+    BeautifulSoup (exécutable dans un processus de parsing)
+    """
+    html = content.decode(encoding or "utf-8", errors="replace")
+    if use_lxml:
+        profiles = BandcampLxmlParser.parse_search_results(html)
+    else:
+        profiles = BandcampSearchScraper._parse_search_results(BeautifulSoup(html, 'html.parser'))
+    return [profile.model_dump(mode="json") for profile in profiles]
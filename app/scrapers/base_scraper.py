@@ -1,6 +1,6 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 
 import httpx
 from fake_useragent import UserAgent
@@ -8,7 +8,7 @@ from fake_useragent import UserAgent
 from app.core.config import settings
 from app.core.errors import (NetworkException, PermanentScraperException,
                              RateLimitException, TemporaryScraperException)
-from app.services import with_retry
+from app.services import http_client, with_retry
 
 logger = logging.getLogger(__name__)
 
@@ -37,49 +37,65 @@ class BaseScraper(ABC):
             data: Optional[Dict[str, Any]] = None,
             json: Optional[Dict[str, Any]] = None,
             follow_redirects: bool = True,
+            stream_until: Optional[Sequence[bytes]] = None,
     ) -> httpx.Response:
         request_headers = {"User-Agent": self.user_agent}
         if headers:
             request_headers.update(headers)
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout, follow_redirects=follow_redirects) as client:
-                response = await client.request(
+            if stream_until:
+                # Lecture en streaming arrêtée dès que les marqueurs ont été reçus (corps partiel)
+                response = await http_client.request_until(
+                    method=method,
+                    url=url,
+                    markers=stream_until,
+                    max_bytes=settings.HTTP_STREAM_MAX_BYTES,
+                    headers=request_headers,
+                    params=params,
+                    timeout=self.timeout,
+                    follow_redirects=follow_redirects,
+                )
+            else:
+                # Client partagé par hôte: les connexions sont réutilisées entre les requêtes
+                response = await http_client.request(
                     method=method,
                     url=url,
                     headers=request_headers,
                     params=params,
                     data=data,
                     json=json,
+                    timeout=self.timeout,
+                    follow_redirects=follow_redirects,
+                )
+
+            if response.status_code == 429:
+                # Limite de taux atteinte
+                retry_after = response.headers.get("Retry-After")
+                retry_seconds = int(retry_after) if retry_after and retry_after.isdigit() else None
+
+                raise RateLimitException(
+                    message=f"Limite de taux atteinte pour {url}",
+                    retry_after=retry_seconds,
+                    details={"url": url, "status_code": response.status_code}
+                )
+
+            elif response.status_code >= 500:
+                # Erreur serveur (temporaire)
+                raise TemporaryScraperException(
+                    message=f"Erreur serveur pour {url}: {response.status_code}",
+                    details={"url": url, "status_code": response.status_code}
+                )
+
+            elif response.status_code >= 400 and response.status_code != 404:
+                # Erreur client (permanente)
+                raise PermanentScraperException(
+                    message=f"Erreur client pour {url}: {response.status_code}",
+                    status_code=response.status_code,
+                    details={"url": url, "status_code": response.status_code}
                 )
 
-                if response.status_code == 429:
-                    # Limite de taux atteinte
-                    retry_after = response.headers.get("Retry-After")
-                    retry_seconds = int(retry_after) if retry_after and retry_after.isdigit() else None
-
-                    raise RateLimitException(
-                        message=f"Limite de taux atteinte pour {url}",
-                        retry_after=retry_seconds,
-                        details={"url": url, "status_code": response.status_code}
-                    )
-
-                elif response.status_code >= 500:
-                    # Erreur serveur (temporaire)
-                    raise TemporaryScraperException(
-                        message=f"Erreur serveur pour {url}: {response.status_code}",
-                        details={"url": url, "status_code": response.status_code}
-                    )
-
-                elif response.status_code >= 400 and response.status_code != 404:
-                    # Erreur client (permanente)
-                    raise PermanentScraperException(
-                        message=f"Erreur client pour {url}: {response.status_code}",
-                        status_code=response.status_code,
-                        details={"url": url, "status_code": response.status_code}
-                    )
-
-                return response
+            return response
 
         except httpx.TimeoutException:
             raise NetworkException(
@@ -1,3 +1,4 @@
 from .beatport_mapping_utils import BeatportMappingUtils
+from .beatport_base_scraper import BeatportBaseScraper, beatport_build_id
 from .beatport_search_scraper import BeatportSearchScraper
 from .beatport_releases_scraper import BeatportReleasesScraper
\ No newline at end of file
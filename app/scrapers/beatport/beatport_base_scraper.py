@@ -0,0 +1,288 @@
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+from app.core.config import settings
+from app.core.errors import RateLimitException, ScraperException
+from app.scrapers.base_scraper import BaseScraper
+from app.services import metrics, parse_executor
+
+logger = logging.getLogger(__name__)
+
+NEXT_DATA_START = b'<script id="__NEXT_DATA__" type="application/json">'
+NEXT_DATA_END = b"</script>"
+
+# Chemins ijson des queries du dehydratedState: __NEXT_DATA__ d'une page HTML, route JSON Next.js
+HTML_QUERIES_PREFIX = "props.pageProps.dehydratedState.queries.item"
+ROUTE_QUERIES_PREFIX = "pageProps.dehydratedState.queries.item"
+STRING_VALUE_PATTERN = re.compile(rb'\s*:\s*"([^"\\]+)"')
+
+# Reconnaît la query du dehydratedState utile à un scraper
+QueryMatcher = Callable[[Dict[str, Any]], bool]
+
+
+def loads_json(content: Union[bytes, memoryview]) -> Any:
+    """Décode du JSON brut (octets), avec orjson s'il est installé"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(bytes(content) if isinstance(content, memoryview) else content)
+
+
+def next_data_bounds(content: bytes) -> Optional[Tuple[int, int]]:
+    """Début et fin du JSON du script __NEXT_DATA__ dans les octets bruts de la page"""
+    start = content.find(NEXT_DATA_START)
+    if start < 0:
+        # Log de debug, l'exception sera levée par l'appelant
+        logger.error("Script __NEXT_DATA__ non trouvé dans la page HTML")
+        return None
+    start += len(NEXT_DATA_START)
+    end = content.find(NEXT_DATA_END, start)
+    if end < 0:
+        logger.error("Script __NEXT_DATA__ non terminé dans la page HTML")
+        return None
+    return start, end
+
+
+def extract_next_data(content: Union[bytes, str]) -> Dict[str, Any]:
+    """
+    Extrait le JSON du script __NEXT_DATA__ en cherchant les balises dans les octets bruts
+    de la réponse: seul le segment JSON est décodé, sans copie texte de toute la page.
+    Retourne {} si le script est absent ou invalide
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    bounds = next_data_bounds(content)
+    if bounds is None:
+        return {}
+
+    try:
+        next_data = loads_json(memoryview(content)[bounds[0]:bounds[1]])
+    except ValueError as e:
+        # Log de debug, l'exception sera levée par l'appelant
+        logger.error(f"Erreur lors du parsing JSON: {str(e)}")
+        return {}
+    return next_data if isinstance(next_data, dict) else {}
+
+
+def select_dehydrated_query(content: Union[bytes, memoryview], prefix: str,
+                            matcher: QueryMatcher) -> Optional[Dict[str, Any]]:
+    """
+    Décode les queries du dehydratedState une à une (flux d'événements ijson) et s'arrête à la
+    première acceptée par `matcher`: navigation, traductions et autres queries ne sont jamais
+    matérialisées ensemble, et la fin du document n'est pas analysée.
+    None si aucune query ne correspond ou si le document est invalide
+    """
+    try:
+        for query in ijson.items(bytes(content), prefix, use_float=True):
+            if isinstance(query, dict) and matcher(query):
+                return query
+    except ijson.JSONError as e:
+        logger.warning(f"Décodage incrémental du dehydratedState impossible: {e}")
+    return None
+
+
+def _lazy_next_data(query: Dict[str, Any], build_id: Optional[str], locale: Optional[str]) -> Dict[str, Any]:
+    """Document minimal à la forme du __NEXT_DATA__, réduit à la query retenue"""
+    next_data: Dict[str, Any] = {"props": {"pageProps": {"dehydratedState": {"queries": [query]}}}}
+    if build_id:
+        next_data["buildId"] = build_id
+    if locale:
+        next_data["locale"] = locale
+    return next_data
+
+
+def decode_html_page(content: bytes, matcher: Optional[QueryMatcher]) -> Tuple[Dict[str, Any], Optional[bool]]:
+    """
+    Données Next.js d'une page HTML (exécutable dans un processus de parsing). Avec `matcher`, seule
+    la query retenue est décodée; le second élément vaut alors True, ou False en cas de repli sur
+    le décodage complet (None sans matcher)
+    """
+    if not matcher:
+        return extract_next_data(content), None
+    bounds = next_data_bounds(content)
+    if bounds is None:
+        return {}, None
+    query = select_dehydrated_query(memoryview(content)[bounds[0]:bounds[1]], HTML_QUERIES_PREFIX, matcher)
+    if query is None:
+        return extract_next_data(content), False
+    return _lazy_next_data(query, _find_last_string(content, "buildId", *bounds),
+                           _find_last_string(content, "locale", *bounds)), True
+
+
+def decode_data_route(content: bytes,
+                      matcher: Optional[QueryMatcher]) -> Tuple[Optional[Dict[str, Any]], Optional[bool]]:
+    """
+    Données d'une route JSON Next.js à la forme du __NEXT_DATA__, sans buildId; None si la page
+    HTML doit prendre le relais. Second élément comme pour decode_html_page
+    """
+    if matcher:
+        query = select_dehydrated_query(content, ROUTE_QUERIES_PREFIX, matcher)
+        if query is not None:
+            return _lazy_next_data(query, None, None), True
+
+    lazy = False if matcher else None
+    try:
+        payload = loads_json(content)
+    except ValueError:
+        return None, lazy
+    page_props = payload.get("pageProps") if isinstance(payload, dict) else None
+    if not isinstance(page_props, dict) or "__N_REDIRECT" in page_props:
+        return None, lazy
+    return {"props": {"pageProps": page_props}}, lazy
+
+
+def _find_last_string(content: bytes, key: str, start: int, end: int) -> Optional[str]:
+    """Valeur chaîne de la dernière occurrence de la clé entre start et end, sans décoder le JSON"""
+    # buildId et locale sont à la fin du __NEXT_DATA__: la recherche part de la fin
+    quoted_key = f'"{key}"'.encode()
+    position = content.rfind(quoted_key, start, end)
+    if position < 0:
+        return None
+    match = STRING_VALUE_PATTERN.match(content, position + len(quoted_key), end)
+    return match.group(1).decode() if match else None
+
+
+def find_build_id(content: bytes) -> Optional[str]:
+    """buildId du __NEXT_DATA__ d'une page (404 comprise), sans décoder le JSON; None s'il est absent"""
+    start = content.find(NEXT_DATA_START)
+    if start < 0:
+        return None
+    end = content.find(NEXT_DATA_END, start)
+    return _find_last_string(content, "buildId", start, end if end >= 0 else len(content))
+
+
+class BeatportBuildId:
+    """
+    buildId Next.js courant de Beatport, découvert dans le __NEXT_DATA__ d'une page HTML.
+    Il permet d'appeler directement les routes /_next/data/<buildId>/...json. Un 404 sur ces routes
+    signale un redéploiement ou une ressource absente: seule la page HTML de repli, si elle porte
+    un autre buildId, le remplace.
+    """
+
+    def __init__(self):
+        self.build_id: Optional[str] = None
+        self.locale: Optional[str] = None
+        self.stats = {"json_requests": 0, "json_fallbacks": 0, "html_requests": 0, "build_id_changes": 0,
+                      "lazy_decodes": 0, "lazy_fallbacks": 0}
+
+    def remember(self, next_data: Dict[str, Any]) -> None:
+        build_id = next_data.get("buildId")
+        if not isinstance(build_id, str) or not build_id:
+            return
+        if build_id != self.build_id:
+            logger.info(f"buildId Beatport: {build_id}")
+            self.stats["build_id_changes"] += 1
+        self.build_id = build_id
+        self.locale = next_data.get("locale") or None
+
+    def reset(self) -> None:
+        self.build_id = None
+        self.locale = None
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"build_id": self.build_id, "locale": self.locale, **self.stats}
+
+
+class BeatportBaseScraper(BaseScraper):
+    """Base des scrapers Beatport: récupère le __NEXT_DATA__ d'une page, en JSON direct si possible"""
+
+    async def fetch_next_data(self, page_url: str,
+                              matcher: Optional[QueryMatcher] = None) -> Tuple[int, Dict[str, Any]]:
+        """
+        Retourne (statut, données Next.js) de la page. Les données ont la forme du __NEXT_DATA__
+        ({"props": {"pageProps": ...}}) quel que soit le mode, et sont vides si introuvables.
+        Avec `matcher`, seule la query du dehydratedState qu'il accepte est décodée quand c'est possible
+        """
+        if not (matcher and IJSON_AVAILABLE and settings.BEATPORT_LAZY_DECODE_ENABLED):
+            matcher = None
+
+        if settings.BEATPORT_NEXT_DATA_ENABLED and beatport_build_id.build_id:
+            next_data = await self._fetch_data_route(page_url, beatport_build_id.build_id, beatport_build_id.locale,
+                                                     matcher)
+            if next_data is not None:
+                return 200, next_data
+            beatport_build_id.stats["json_fallbacks"] += 1
+
+        beatport_build_id.stats["html_requests"] += 1
+        if settings.BEATPORT_STREAM_ENABLED:
+            # La page n'est lue que jusqu'à la fin du script __NEXT_DATA__
+            response = await self.fetch(page_url, stream_until=(NEXT_DATA_START, NEXT_DATA_END))
+        else:
+            response = await self.fetch(page_url)
+        if response.status_code == 404:
+            # Ressource absente: le buildId n'est remplacé que si la page 404 en porte un autre
+            build_id = find_build_id(response.content)
+            if build_id:
+                beatport_build_id.remember({"buildId": build_id, "locale": beatport_build_id.locale})
+            return response.status_code, {}
+
+        # Décodage hors de la boucle d'événements pour les grosses pages
+        next_data, lazy = await parse_executor.run(decode_html_page, response.content, matcher)
+        self._count_lazy_decode(lazy)
+        beatport_build_id.remember(next_data)
+        return response.status_code, next_data
+
+    async def _fetch_data_route(self, page_url: str, build_id: str, locale: Optional[str],
+                                matcher: Optional[QueryMatcher] = None) -> Optional[Dict[str, Any]]:
+        """Appelle la route JSON Next.js de la page; None si la page HTML doit prendre le relais"""
+        beatport_build_id.stats["json_requests"] += 1
+        data_url = self.build_data_url(page_url, build_id, locale)
+        try:
+            response = await self.fetch(data_url, headers={"Accept": "application/json", "x-nextjs-data": "1"})
+        except RateLimitException:
+            # Repasser par la page HTML doublerait la charge pendant la pause de la plateforme
+            raise
+        except ScraperException as e:
+            logger.warning(f"Route JSON Next.js en échec ({e.message}), repli sur la page HTML")
+            return None
+
+        if response.status_code == 404:
+            # Redéploiement (buildId périmé) ou ressource absente: la page HTML tranche, le buildId
+            # partagé reste en place pour les autres requêtes
+            return None
+
+        next_data, lazy = await parse_executor.run(decode_data_route, response.content, matcher)
+        self._count_lazy_decode(lazy)
+        if next_data is not None:
+            next_data["buildId"] = build_id
+        return next_data
+
+    @staticmethod
+    def _count_lazy_decode(lazy: Optional[bool]) -> None:
+        if lazy is not None:
+            beatport_build_id.stats["lazy_decodes" if lazy else "lazy_fallbacks"] += 1
+
+    @staticmethod
+    def build_data_url(page_url: str, build_id: str, locale: Optional[str] = None) -> str:
+        """https://www.beatport.com/search?q=x -> https://www.beatport.com/_next/data/<buildId>/search.json?q=x"""
+        parts = urlsplit(page_url)
+        path = parts.path.rstrip("/") or "/index"
+        prefix = f"/{locale}" if locale else ""
+        return urlunsplit((parts.scheme, parts.netloc, f"/_next/data/{build_id}{prefix}{path}.json", parts.query, ""))
+
+    def _extract_next_data(self, content: Union[bytes, str]) -> Dict[str, Any]:
+        return extract_next_data(content)
+
+
+# Instance singleton partagée par les scrapers Beatport
+beatport_build_id = BeatportBuildId()
+
+metrics.register("beatport_next_data", beatport_build_id.get_metrics)
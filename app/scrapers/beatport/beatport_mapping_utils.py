@@ -1,7 +1,10 @@
 import logging
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import quote
 
+from pydantic import BaseModel, HttpUrl, TypeAdapter, ValidationError
+
 from app.models import Release, Track
 from app.models.artist_profile import ArtistProfile
 from app.models.beatport_models import BeatportEntityType
@@ -12,6 +15,19 @@ logger = logging.getLogger(__name__)
 BEATPORT_BASE_URL = "https://www.beatport.com"
 
 
+HTTP_URL = TypeAdapter(HttpUrl)
+
+
+@lru_cache(maxsize=4096)
+def normalize_url(url: Optional[str]) -> Optional[HttpUrl]:
+    """
+    URL validée une fois puis réutilisée: un champ HttpUrl accepte l'instance telle quelle, sans
+    la re-parser. Réservé aux URLs d'artistes et de labels, qui reviennent d'un résultat et d'une
+    requête à l'autre; les autres sont validées avec la liste
+    """
+    return HTTP_URL.validate_python(url) if url is not None else None
+
+
 class BeatportMappingUtils:
     """Utilitaires pour mapper les données Beatport vers nos modèles"""
 
@@ -25,24 +41,16 @@ class BeatportMappingUtils:
         else:
             return f"{BEATPORT_BASE_URL}/{entity_type.value}/{slug}"
 
+    @staticmethod
+    def build_search_page_url(query: str, entity_type: BeatportEntityType, page: int, per_page: int) -> str:
+        """Page de recherche amont d'un seul type d'entité (/search/tracks?q=...&page=2&per_page=10)"""
+        return f"{BEATPORT_BASE_URL}/search/{entity_type.value}s?q={quote(query)}&page={page}&per_page={per_page}"
+
     @staticmethod
     def extract_artist(artist_data: Dict[str, Any]) -> ArtistProfile:
         """Extrait les données d'un profil d'artiste depuis les données JSON"""
         try:
-            # Deux formats: id/name ou artist_id/artist_name suivant la recherche ou release
-            artist_id = artist_data.get("id", artist_data.get("artist_id", 0))
-            name = artist_data.get("name", artist_data.get("artist_name", ""))
-            slug = BeatportMappingUtils._build_slug(artist_data, name)
-            url = BeatportMappingUtils.build_url(BeatportEntityType.ARTIST, slug, artist_id)
-
-            avatar_url = BeatportMappingUtils._extract_image_url(artist_data, "artist")
-
-            return ArtistProfile(
-                id=artist_id,
-                name=name,
-                url=url,
-                avatar_url=avatar_url
-            )
+            return ArtistProfile.model_validate(BeatportMappingUtils.artist_fields(artist_data))
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction du profil d'artiste: {str(e)}")
             raise
@@ -51,81 +59,16 @@ class BeatportMappingUtils:
     def extract_track(track_data: Dict[str, Any]) -> Track:
         """Extrait les données d'un track depuis les données JSON"""
         try:
-            # Support des deux formats: id/name ou track_id/track_name
-            track_id = track_data.get("id", track_data.get("track_id", 0))
-            title = track_data.get("name", track_data.get("track_name", ""))
-            slug = BeatportMappingUtils._build_slug(track_data, title)
-            url = BeatportMappingUtils.build_url(BeatportEntityType.TRACK, slug, track_id)
-            release_date = BeatportMappingUtils._extract_date(track_data)
-            genre = BeatportMappingUtils._extract_genre(track_data)
-            bpm = track_data.get("bpm", None)
-            play_count = track_data.get("plays", None)
-            download_count = track_data.get("downloads", None)
-
-            artwork_url = BeatportMappingUtils._extract_image_url(track_data, "track")
-            # Si pas d'image de track, essayer l'image de la release associée
-            if not artwork_url and "release" in track_data:
-                artwork_url = BeatportMappingUtils._extract_image_url(track_data["release"], "release")
-
-            artists, _ = BeatportMappingUtils._extract_artists_and_remixers(track_data)
-
-            labels = []
-            if "label" in track_data and isinstance(track_data["label"], dict):
-                label_data = track_data["label"]
-                labels = [BeatportMappingUtils.extract_label(label_data)]
-
-            key = BeatportMappingUtils._extract_key(track_data)
-
-            return Track(
-                id=track_id,
-                title=title,
-                url=url,
-                artwork_url=artwork_url,
-                play_count=play_count,
-                download_count=download_count,
-                release_date=release_date,
-                genre=genre,
-                bpm=bpm,
-                key=key,
-                labels=labels,
-                artists=artists,
-            )
+            return Track.model_validate(BeatportMappingUtils.track_fields(track_data))
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction du track: {str(e)}")
             raise
 
-
     @staticmethod
     def extract_release(release_data: Dict[str, Any]) -> Release:
         """Extrait les données d'une release depuis les données JSON"""
         try:
-            # Deux formats: id/name ou release_id/release_name suivant la recherche ou release
-            release_id = release_data.get("id", release_data.get("release_id", 0))
-            title = release_data.get("name", release_data.get("release_name", ""))
-            slug = BeatportMappingUtils._build_slug(release_data, title)
-            url = BeatportMappingUtils.build_url(BeatportEntityType.RELEASE, slug, release_id)
-            release_date = BeatportMappingUtils._extract_date(release_data)
-            track_count = release_data.get("track_count", 0)
-            catalog_code = release_data.get("catalog_number", None)
-
-            artwork_url = BeatportMappingUtils._extract_image_url(release_data, "release")
-
-            artists, remixers = BeatportMappingUtils._extract_artists_and_remixers(release_data)
-
-            if "label" in release_data:
-                label = BeatportMappingUtils.extract_label(release_data["label"])
-
-            return Release(
-                id=release_id,
-                title=title,
-                url=url,
-                artwork_url=artwork_url,
-                release_date=release_date,
-                track_count=track_count,
-                catalog_code=catalog_code,
-                label=label,
-                artists=artists,
-            )
+            return Release.model_validate(BeatportMappingUtils.release_fields(release_data))
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction de la release: {str(e)}")
             raise
@@ -134,24 +77,128 @@ class BeatportMappingUtils:
     def extract_label(label_data: Dict[str, Any]) -> ArtistProfile:
         """Extrait les données d'un label depuis les données JSON"""
         try:
-            # Deux formats: id/name ou label_id/label_name suivant la recherche ou release
-            label_id = label_data.get("id", label_data.get("label_id", 0))
-            name = label_data.get("name", label_data.get("label_name", ""))
-            slug = BeatportMappingUtils._build_slug(label_data, name)
-            url = BeatportMappingUtils.build_url(BeatportEntityType.LABEL, slug, label_id)
-
-            avatar_url = BeatportMappingUtils._extract_image_url(label_data, "label")
-
-            return ArtistProfile(
-                id=label_id,
-                name=name,
-                url=url,
-                avatar_url=avatar_url
-            )
+            return ArtistProfile.model_validate(BeatportMappingUtils.label_fields(label_data))
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction du label: {str(e)}")
             raise
 
+    @staticmethod
+    def extract_items(entity_type: BeatportEntityType, items_data: Iterable[Dict[str, Any]]) -> List[BaseModel]:
+        """
+        Extrait une liste d'éléments d'un même type: les champs sont assemblés en dicts puis validés
+        en un seul appel Pydantic. Les éléments invalides sont ignorés (avec un avertissement)
+        """
+        fields_func = ENTITY_FIELDS[entity_type]
+        adapter, model = ENTITY_ADAPTERS[entity_type]
+
+        items_fields = []
+        for item_data in items_data:
+            try:
+                items_fields.append(fields_func(item_data))
+            except Exception as e:
+                logger.warning(f"Erreur lors de l'extraction d'un {entity_type.value}: {str(e)}")
+
+        try:
+            return adapter.validate_python(items_fields)
+        except ValidationError:
+            # Validation élément par élément pour n'écarter que les éléments invalides
+            items = []
+            for fields in items_fields:
+                try:
+                    items.append(model.model_validate(fields))
+                except ValidationError as e:
+                    logger.warning(f"Erreur lors de l'extraction d'un {entity_type.value}: {str(e)}")
+            return items
+
+    @staticmethod
+    def artist_fields(artist_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Champs d'un ArtistProfile pour un artiste, avant validation"""
+        # Deux formats: id/name ou artist_id/artist_name suivant la recherche ou release
+        artist_id = artist_data.get("id", artist_data.get("artist_id", 0))
+        name = artist_data.get("name", artist_data.get("artist_name", ""))
+        slug = BeatportMappingUtils._build_slug(artist_data, name)
+
+        return {
+            "id": artist_id,
+            "name": name,
+            "url": normalize_url(BeatportMappingUtils.build_url(BeatportEntityType.ARTIST, slug, artist_id)),
+            "avatar_url": normalize_url(BeatportMappingUtils._extract_image_url(artist_data, "artist")),
+        }
+
+    @staticmethod
+    def track_fields(track_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Champs d'un Track, artistes et labels inclus, avant validation"""
+        # Support des deux formats: id/name ou track_id/track_name
+        track_id = track_data.get("id", track_data.get("track_id", 0))
+        title = track_data.get("name", track_data.get("track_name", ""))
+        slug = BeatportMappingUtils._build_slug(track_data, title)
+
+        artwork_url = BeatportMappingUtils._extract_image_url(track_data, "track")
+        # Si pas d'image de track, essayer l'image de la release associée
+        if not artwork_url and "release" in track_data:
+            artwork_url = BeatportMappingUtils._extract_image_url(track_data["release"], "release")
+
+        artists, _ = BeatportMappingUtils._artists_and_remixers_fields(track_data)
+
+        labels = []
+        if "label" in track_data and isinstance(track_data["label"], dict):
+            labels = [BeatportMappingUtils.label_fields(track_data["label"])]
+
+        return {
+            "id": track_id,
+            "title": title,
+            "url": BeatportMappingUtils.build_url(BeatportEntityType.TRACK, slug, track_id),
+            "artwork_url": artwork_url,
+            "play_count": track_data.get("plays", None),
+            "download_count": track_data.get("downloads", None),
+            "release_date": BeatportMappingUtils._extract_date(track_data),
+            "genre": BeatportMappingUtils._extract_genre(track_data),
+            "bpm": track_data.get("bpm", None),
+            "key": BeatportMappingUtils._extract_key(track_data),
+            "labels": labels,
+            "artists": artists,
+        }
+
+    @staticmethod
+    def release_fields(release_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Champs d'une Release, artistes et label inclus, avant validation"""
+        # Deux formats: id/name ou release_id/release_name suivant la recherche ou release
+        release_id = release_data.get("id", release_data.get("release_id", 0))
+        title = release_data.get("name", release_data.get("release_name", ""))
+        slug = BeatportMappingUtils._build_slug(release_data, title)
+
+        artists, remixers = BeatportMappingUtils._artists_and_remixers_fields(release_data)
+
+        if "label" in release_data:
+            label = BeatportMappingUtils.label_fields(release_data["label"])
+
+        return {
+            "id": release_id,
+            "title": title,
+            "url": BeatportMappingUtils.build_url(BeatportEntityType.RELEASE, slug, release_id),
+            "artwork_url": BeatportMappingUtils._extract_image_url(release_data, "release"),
+            "release_date": BeatportMappingUtils._extract_date(release_data),
+            "track_count": release_data.get("track_count", 0),
+            "catalog_code": release_data.get("catalog_number", None),
+            "label": label,
+            "artists": artists,
+        }
+
+    @staticmethod
+    def label_fields(label_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Champs d'un ArtistProfile pour un label, avant validation"""
+        # Deux formats: id/name ou label_id/label_name suivant la recherche ou release
+        label_id = label_data.get("id", label_data.get("label_id", 0))
+        name = label_data.get("name", label_data.get("label_name", ""))
+        slug = BeatportMappingUtils._build_slug(label_data, name)
+
+        return {
+            "id": label_id,
+            "name": name,
+            "url": normalize_url(BeatportMappingUtils.build_url(BeatportEntityType.LABEL, slug, label_id)),
+            "avatar_url": normalize_url(BeatportMappingUtils._extract_image_url(label_data, "label")),
+        }
+
     @staticmethod
     def _build_slug(data: Dict[str, Any], name: str) -> str:
         # Le slug est le nom de l'artiste ou du label en minuscule avec des espaces remplacés par des tirets
@@ -200,23 +247,23 @@ class BeatportMappingUtils:
         return None
 
     @staticmethod
-    def _extract_artists_and_remixers(data: Dict[str, Any]) -> tuple[List[ArtistProfile], List[ArtistProfile]]:
-        artists: List[ArtistProfile] = []
-        remixers: List[ArtistProfile] = []
+    def _artists_and_remixers_fields(data: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        artists: List[Dict[str, Any]] = []
+        remixers: List[Dict[str, Any]] = []
 
         if "artists" in data and isinstance(data["artists"], list):
             for artist_data in data["artists"]:
                 # Vérifier si c'est un remixer
                 is_remixer = "artist_type_name" in artist_data and artist_data.get("artist_type_name") == "Remixer"
 
-                artist_obj = BeatportMappingUtils.extract_artist(artist_data)
+                artist_fields = BeatportMappingUtils.artist_fields(artist_data)
                 if is_remixer:
-                    remixers.append(artist_obj)
+                    remixers.append(artist_fields)
                 else:
-                    artists.append(artist_obj)
+                    artists.append(artist_fields)
 
         return artists, remixers
-    
+
     @staticmethod
     def _extract_key(track_data):
         key = None
@@ -224,4 +271,19 @@ class BeatportMappingUtils:
             key = track_data.get("key_name", None)
         elif "key" in track_data and "key_name" in track_data["key"]:
             key = track_data["key"].get("key_name", None)
-        return key
\ No newline at end of file
+        return key
+
+
+# Assemblage des champs et validation d'une liste entière par type d'entité (BeatportMappingUtils.extract_items)
+ENTITY_FIELDS = {
+    BeatportEntityType.ARTIST: BeatportMappingUtils.artist_fields,
+    BeatportEntityType.TRACK: BeatportMappingUtils.track_fields,
+    BeatportEntityType.RELEASE: BeatportMappingUtils.release_fields,
+    BeatportEntityType.LABEL: BeatportMappingUtils.label_fields,
+}
+ENTITY_ADAPTERS = {
+    BeatportEntityType.ARTIST: (TypeAdapter(List[ArtistProfile]), ArtistProfile),
+    BeatportEntityType.TRACK: (TypeAdapter(List[Track]), Track),
+    BeatportEntityType.RELEASE: (TypeAdapter(List[Release]), Release),
+    BeatportEntityType.LABEL: (TypeAdapter(List[ArtistProfile]), ArtistProfile),
+}
@@ -1,11 +1,9 @@
-import json
 import logging
-import re
 from datetime import date, datetime
 from typing import Dict, Any, Optional
 from urllib.parse import urlencode
 
-from app.core.errors import ParsingException, ResourceNotFoundException
+from app.core.errors import MissingPageDataException, ParsingException, ResourceNotFoundException
 from app.models import LimitEnum
 from app.models.beatport_models import (
     BeatportEntityType,
@@ -14,13 +12,13 @@ from app.models.beatport_models import (
     BeatportFacetFields,
     BeatportFacetItem
 )
-from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.beatport.beatport_base_scraper import BeatportBaseScraper
 from app.scrapers.beatport.beatport_mapping_utils import BeatportMappingUtils
 
 logger = logging.getLogger(__name__)
 
 
-class BeatportReleasesScraper(BaseScraper):
+class BeatportReleasesScraper(BeatportBaseScraper):
     """Scraper pour les releases sur Beatport"""
 
     async def scrape(
@@ -46,10 +44,10 @@ class BeatportReleasesScraper(BaseScraper):
             end_date=end_date
         )
 
-        # Récupérer la page HTML
-        response = await self.fetch(releases_url)
+        # Récupérer les données Next.js de la page (route JSON, sinon page HTML)
+        status_code, next_data_json = await self.fetch_next_data(releases_url, matcher=self._is_releases_query)
 
-        if response.status_code == 404:
+        if status_code == 404:
             raise ResourceNotFoundException(
                 resource_type=f"{entity_type.value.capitalize()} Beatport",
                 resource_id=entity_slug,
@@ -57,12 +55,8 @@ class BeatportReleasesScraper(BaseScraper):
             )
 
         try:
-            # Extraire les données JSON du script NEXT_DATA
-            html_content = response.text
-            next_data_json = self._extract_next_data(html_content)
-
             if not next_data_json:
-                raise ParsingException(
+                raise MissingPageDataException(
                     message=f"Impossible de trouver les données NEXT_DATA pour {entity_type.value} '{entity_slug}'",
                     details={"url": releases_url}
                 )
@@ -119,25 +113,6 @@ class BeatportReleasesScraper(BaseScraper):
 
         return f"{base_url}?{urlencode(query_params)}"
 
-    def _extract_next_data(self, html_content: str) -> Dict[str, Any]:
-        # Rechercher le script avec l'ID __NEXT_DATA__
-        pattern = r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>'
-        match = re.search(pattern, html_content, re.DOTALL)
-
-        if not match:
-            # Log de debug, l'exception sera levée par l'appelant
-            logger.error("Script __NEXT_DATA__ non trouvé dans la page HTML")
-            return {}
-
-        # Extraire et parser le JSON
-        json_str = match.group(1)
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            # Log de debug, l'exception sera levée par l'appelant
-            logger.error(f"Erreur lors du parsing JSON: {str(e)}")
-            return {}
-
     def _extract_releases_and_facets(self, next_data: Dict[str, Any]) -> BeatportReleasesResult:
         # Extraire les releases et les facets des données JSON
         try:
@@ -152,12 +127,7 @@ class BeatportReleasesScraper(BaseScraper):
             extracted_releases = []
 
             if releases_data:
-                for release_data in releases_data:
-                    try:
-                        release = BeatportMappingUtils.extract_release(release_data)
-                        extracted_releases.append(release)
-                    except Exception as e:
-                        logger.warning(f"Erreur lors de l'extraction d'une release: {str(e)}")
+                extracted_releases = BeatportMappingUtils.extract_items(BeatportEntityType.RELEASE, releases_data)
 
             # Extraire les facets
             facets_data = data.get("facets", {})
@@ -179,12 +149,10 @@ class BeatportReleasesScraper(BaseScraper):
 
             # Parcourir les queries pour trouver celle qui contient les releases
             for query in queries:
-                query_key = query.get("queryKey", [""])[0]
-                if "releases" in str(query_key).lower() and "state" in query and "data" in query["state"]:
+                if self._is_releases_query(query):
                     data = query["state"]["data"]
-                    if "results" in data and isinstance(data["results"], list):
-                        logger.info(f"Trouvé {len(data['results'])} releases dans results")
-                        return data  # Retourne toute la structure data qui contient results et facets
+                    logger.info(f"Trouvé {len(data['results'])} releases dans results")
+                    return data  # Retourne toute la structure data qui contient results et facets
 
             logger.warning("Aucune structure de données de releases reconnue dans next_data_json")
             return {}
@@ -192,6 +160,14 @@ class BeatportReleasesScraper(BaseScraper):
             logger.error(f"Erreur lors de l'extraction des données de releases et facets: {str(e)}")
             return {}
 
+    @staticmethod
+    def _is_releases_query(query: Dict[str, Any]) -> bool:
+        # Query de releases dont les données contiennent la liste results
+        query_key = query.get("queryKey") or [""]
+        data = query.get("state", {}).get("data")
+        return ("releases" in str(query_key[0]).lower() and isinstance(data, dict)
+                and isinstance(data.get("results"), list))
+
     def _extract_facets(self, facets_data: Dict[str, Any]) -> Optional[BeatportFacets]:
         # Extraire les facets des données JSON
         try:
@@ -1,86 +1,104 @@
-import json
+import asyncio
 import logging
-import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
-from app.core.errors import ParsingException, ResourceNotFoundException
+from app.core.errors import MissingPageDataException, ParsingException, ResourceNotFoundException
 from app.models import BeatportSearchResult, LimitEnum
 from app.models.beatport_models import BeatportEntityType
-from app.scrapers.base_scraper import BaseScraper
+from app.scrapers.beatport.beatport_base_scraper import BeatportBaseScraper
 from app.scrapers.beatport.beatport_mapping_utils import BeatportMappingUtils
-from app.services import PaginationService
+from app.services import PaginationService, result_cache
+from app.services.http_cache_service import bypass_http_cache
 
 logger = logging.getLogger(__name__)
 
+# Types d'entités présents dans les résultats de recherche
+SEARCH_ENTITY_TYPES = [BeatportEntityType.ARTIST, BeatportEntityType.TRACK,
+                       BeatportEntityType.RELEASE, BeatportEntityType.LABEL]
 
-class BeatportSearchScraper(BaseScraper):
+
+def normalize_search_query(query: str) -> str:
+    """Requête normalisée (casse, espaces): une seule page de recherche amont par requête"""
+    return " ".join(query.split()).lower()
+
+
+class BeatportSearchScraper(BeatportBaseScraper):
     """Scraper pour la recherche sur Beatport"""
 
     async def scrape(self, query: str, page: int = 1, limit: LimitEnum = LimitEnum.TEN,
                      entity_type_filter: BeatportEntityType = None) -> BeatportSearchResult:
         logger.info(f"Recherche Beatport pour: '{query}'")
-
-        # Construire l'URL de recherche
-        search_url = BeatportMappingUtils.build_url(BeatportEntityType.SEARCH, query)
-
-        # Récupérer la page HTML
-        response = await self.fetch(search_url)
-
-        if response.status_code == 404:
+        normalized_query = normalize_search_query(query)
+
+        # Données de la page /search de la requête (tous les types d'entités), en cache au niveau
+        # de la requête: chaque page, limite et filtre est servi depuis le même payload
+        search_data = await self._get_search_data(normalized_query)
+
+        # Fenêtre au-delà des éléments du payload alors que l'amont en annonce davantage:
+        # page de recherche amont du type d'entité
+        beyond_payload = [entity_type for entity_type in self._entities_to_process(entity_type_filter)
+                          if self._exceeds_payload(search_data, entity_type, page, limit)]
+        upstream_pages = dict(zip(beyond_payload, await asyncio.gather(
+            *(self._get_search_data(normalized_query, entity_type, page, limit) for entity_type in beyond_payload))))
+
+        # Extraire les résultats de recherche
+        search_results = self._extract_search_results(search_data, page, limit, entity_type_filter, upstream_pages)
+
+        logger.info("Recherche Beatport terminée")
+
+        return search_results
+
+    async def _get_search_data(self, query: str, entity_type: Optional[BeatportEntityType] = None,
+                               page: Optional[int] = None, limit: Optional[LimitEnum] = None) -> Dict[str, Any]:
+        """
+        Données de recherche (state.data de la query de recherche) de la page /search de la requête,
+        ou de la page amont d'un type d'entité. Mises en cache dans le cache des résultats; un bypass
+        de l'outil appelant force aussi leur rechargement
+        """
+        if entity_type is None:
+            search_url = BeatportMappingUtils.build_url(BeatportEntityType.SEARCH, query)
+        else:
+            search_url = BeatportMappingUtils.build_search_page_url(query, entity_type, page, limit.value)
+
+        return await result_cache.get_or_compute(
+            "beatport_search_payload",
+            {"query": query, "entity_type": entity_type, "page": page, "limit": limit},
+            lambda: self._fetch_search_data(search_url, query),
+            bypass=bypass_http_cache.get(),
+        )
+
+    async def _fetch_search_data(self, search_url: str, query: str) -> Dict[str, Any]:
+        # Récupérer les données Next.js de la page (route JSON, sinon page HTML)
+        status_code, next_data_json = await self.fetch_next_data(search_url, matcher=self._is_search_query)
+
+        if status_code == 404:
             raise ResourceNotFoundException(
                 resource_type="Recherche Beatport",
                 resource_id=query
             )
 
-        try:
-            # Extraire les données JSON du script NEXT_DATA
-            html_content = response.text
-            next_data_json = self._extract_next_data(html_content)
-
-            if not next_data_json:
-                raise ParsingException(
-                    message=f"Impossible de trouver les données NEXT_DATA pour la recherche '{query}'",
-                    details={"url": search_url}
-                )
-
-            # Extraire les résultats de recherche
-            search_results = self._extract_search_results(next_data_json, page, limit, entity_type_filter)
-
-            logger.info("Recherche Beatport terminée")
+        if not next_data_json:
+            raise MissingPageDataException(
+                message=f"Impossible de trouver les données NEXT_DATA pour la recherche '{query}'",
+                details={"url": search_url}
+            )
 
-            return search_results
+        try:
+            # Trouver les données de recherche
+            return self._find_search_data(next_data_json)
 
         except Exception as e:
-            if not isinstance(e, (ResourceNotFoundException, ParsingException)):
-                raise ParsingException(
-                    message=f"Erreur lors du parsing de la recherche Beatport pour '{query}': {str(e)}",
-                    details={"url": search_url, "error": str(e)}
-                )
-            raise
-
-    def _extract_next_data(self, html_content: str) -> Dict[str, Any]:
-        # Rechercher le script avec l'ID __NEXT_DATA__
-        pattern = r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>'
-        match = re.search(pattern, html_content, re.DOTALL)
-
-        if not match:
-            logger.error("Script __NEXT_DATA__ non trouvé dans la page HTML")
-            return {}
+            raise ParsingException(
+                message=f"Erreur lors du parsing de la recherche Beatport pour '{query}': {str(e)}",
+                details={"url": search_url, "error": str(e)}
+            )
 
-        # Extraire et parser le JSON
-        json_str = match.group(1)
+    def _extract_search_results(self, search_data: Dict[str, Any], page: int, limit: LimitEnum,
+                                entity_type_filter: BeatportEntityType = None,
+                                upstream_pages: Optional[Dict[BeatportEntityType, Dict[str, Any]]] = None
+                                ) -> BeatportSearchResult:
+        # Extrait les résultats de la page demandée depuis les données de recherche
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            logger.error(f"Erreur lors du parsing JSON: {str(e)}")
-            return {}
-
-    def _extract_search_results(self, next_data: Dict[str, Any], page: int, limit: LimitEnum,
-                                entity_type_filter: BeatportEntityType = None) -> BeatportSearchResult:
-        # Extrait les résultats de recherche des données JSON
-        try:
-            # Trouver les données de recherche
-            search_data = self._find_search_data(next_data)
             if not search_data:
                 logger.warning("Aucune donnée de recherche trouvée dans NEXT_DATA")
                 return BeatportSearchResult(
@@ -88,60 +106,46 @@ class BeatportSearchScraper(BaseScraper):
                     artists=[], tracks=[], releases=[], labels=[]
                 )
 
-            # Définir les mappings entre types d'entités et leurs fonctions d'extraction
-            entity_mappings = {
-                BeatportEntityType.ARTIST: BeatportMappingUtils.extract_artist,
-                BeatportEntityType.TRACK: BeatportMappingUtils.extract_track,
-                BeatportEntityType.RELEASE: BeatportMappingUtils.extract_release,
-                BeatportEntityType.LABEL: BeatportMappingUtils.extract_label
-            }
-
-            # Déterminer les entités à traiter
-            entities_to_process = list(entity_mappings.keys())
-            if entity_type_filter and entity_type_filter != BeatportEntityType.SEARCH:
-                entities_to_process = [entity_type_filter]
-
-            # Extraire les résultats pour chaque type d'entité
-            artists = []
-            tracks = []
-            releases = []
-            labels = []
-
-            for entity_type in entities_to_process:
-                if entity_type in entity_mappings:
-                    extract_func = entity_mappings[entity_type]
-                    # Assigner les résultats au bon champ avec match case (Python 3.10+)
-                    match entity_type:
-                        case BeatportEntityType.ARTIST:
-                            artists = self._extract_entity_items(search_data, entity_type, extract_func, page, limit)
-                        case BeatportEntityType.TRACK:
-                            tracks = self._extract_entity_items(search_data, entity_type, extract_func, page, limit)
-                        case BeatportEntityType.RELEASE:
-                            releases = self._extract_entity_items(search_data, entity_type, extract_func, page, limit)
-                        case BeatportEntityType.LABEL:
-                            labels = self._extract_entity_items(search_data, entity_type, extract_func, page, limit)
-
-            # Calculer le nombre total de résultats (somme des éléments dans toutes les listes)
-            total_results = len(artists) + len(tracks) + len(releases) + len(labels)
+            # Extraire les résultats de la page pour chaque type d'entité
+            results: Dict[BeatportEntityType, List] = {}
+            total_results = 0
+
+            for entity_type in self._entities_to_process(entity_type_filter):
+                upstream_page = (upstream_pages or {}).get(entity_type)
+                if upstream_page is not None:
+                    # Page amont: ses éléments sont exactement ceux de la fenêtre demandée
+                    results[entity_type], _ = self._extract_entity_items(upstream_page, entity_type, 1, limit)
+                    _, raw_count = self._raw_items(search_data, entity_type)
+                else:
+                    results[entity_type], raw_count = self._extract_entity_items(search_data, entity_type, page, limit)
+                # Nombre total sur les données brutes, pas sur les pages extraites
+                total_results += raw_count
 
             # Construire et retourner le résultat final
             return BeatportSearchResult(
                 total_results=total_results,
                 page=page,
                 limit=limit,
-                artists=artists,
-                tracks=tracks,
-                releases=releases,
-                labels=labels
+                artists=results.get(BeatportEntityType.ARTIST, []),
+                tracks=results.get(BeatportEntityType.TRACK, []),
+                releases=results.get(BeatportEntityType.RELEASE, []),
+                labels=results.get(BeatportEntityType.LABEL, [])
             )
 
         except Exception as e:
-            logger.error(f"Erreur lors de l'extraction des résultats de recherche: {str(e)}")
-            return BeatportSearchResult(
-                total_results=0, page=page, limit=limit,
-                artists=[], tracks=[], releases=[], labels=[]
+            # Exception plutôt qu'un résultat vide: les exceptions ne sont pas mises en cache
+            raise ParsingException(
+                message=f"Erreur lors de l'extraction des résultats de recherche Beatport: {str(e)}",
+                details={"page": page, "limit": limit.value, "error": str(e)}
             )
 
+    @staticmethod
+    def _entities_to_process(entity_type_filter: Optional[BeatportEntityType]) -> List[BeatportEntityType]:
+        # Types d'entités à extraire selon le filtre
+        if entity_type_filter and entity_type_filter != BeatportEntityType.SEARCH:
+            return [entity_type_filter] if entity_type_filter in SEARCH_ENTITY_TYPES else []
+        return SEARCH_ENTITY_TYPES
+
     def _find_search_data(self, next_data: Dict[str, Any]) -> Dict[str, Any]:
         # Trouve les données de recherche dans la structure JSON"""
         props = next_data.get("props", {})
@@ -150,38 +154,44 @@ class BeatportSearchScraper(BaseScraper):
         queries = dehydrated_state.get("queries", [])
 
         # Chercher les données de recherche dans les queries
-        entity_types = [f"{entity_type.value}s" for entity_type in BeatportEntityType]
-
         for query in queries:
-            if "state" in query and "data" in query["state"]:
-                data = query["state"]["data"]
-                # Vérifier si les données contiennent au moins une des clés d'entité
-                if isinstance(data, dict) and any(entity in data for entity in entity_types):
-                    return data
+            if self._is_search_query(query):
+                return query["state"]["data"]
 
         return {}
 
-    def _extract_entity_items(self, search_data: Dict[str, Any], entity_type: BeatportEntityType,
-                              extract_func, page: int, limit: LimitEnum) -> List:
-        # Extrait les éléments d'un type d'entité spécifique et retourne une nouvelle liste
-        data_field = f"{entity_type.value}s"
-
-        # Vérifier si les données existent
-        if data_field not in search_data or "data" not in search_data[data_field]:
-            return []
+    @staticmethod
+    def _is_search_query(query: Dict[str, Any]) -> bool:
+        # Query dont les données contiennent au moins une des clés d'entité
+        data = query.get("state", {}).get("data")
+        return isinstance(data, dict) and any(f"{entity_type.value}s" in data for entity_type in BeatportEntityType)
+
+    @staticmethod
+    def _raw_items(search_data: Dict[str, Any], entity_type: BeatportEntityType) -> Tuple[List[Dict[str, Any]], int]:
+        # Éléments bruts d'un type d'entité et nombre total annoncé par l'amont (count), à défaut leur nombre
+        entity_data = search_data.get(f"{entity_type.value}s")
+        if not isinstance(entity_data, dict):
+            return [], 0
+
+        items_data = entity_data.get("data") or []
+        count = entity_data.get("count")
+        return items_data, count if isinstance(count, int) and count > len(items_data) else len(items_data)
+
+    @staticmethod
+    def _exceeds_payload(search_data: Dict[str, Any], entity_type: BeatportEntityType, page: int,
+                         limit: LimitEnum) -> bool:
+        # Fenêtre demandée au-delà des éléments du payload, qui n'en contient qu'une partie
+        items_data, count = BeatportSearchScraper._raw_items(search_data, entity_type)
+        _, end_idx = PaginationService.page_window(page, limit)
+        return end_idx > len(items_data) and count > len(items_data)
 
-        items_data = search_data[data_field]["data"]
+    def _extract_entity_items(self, search_data: Dict[str, Any], entity_type: BeatportEntityType,
+                              page: int, limit: LimitEnum) -> Tuple[List, int]:
+        # Extrait les éléments de la page demandée pour un type d'entité, avec le nombre d'éléments bruts
+        items_data, count = self._raw_items(search_data, entity_type)
         if not items_data:
-            return []
-
-        # Extraire les éléments dans une nouvelle liste
-        extracted_items = []
-        for item_data in items_data:
-            try:
-                item = extract_func(item_data)
-                extracted_items.append(item)
-            except Exception as e:
-                logger.warning(f"Erreur lors de l'extraction d'un {entity_type.value}: {str(e)}")
-
-        # Appliquer la pagination et retourner une nouvelle liste
-        return PaginationService.paginate_results(extracted_items, page, limit)
+            return [], count
+
+        # Seuls les éléments bruts de la page sont mappés, validés en une fois
+        page_items = PaginationService.paginate_iter(items_data, page, limit)
+        return BeatportMappingUtils.extract_items(entity_type, page_items), count
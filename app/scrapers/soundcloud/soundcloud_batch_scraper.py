@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, TypeVar, Union
+
+from app.core.config import settings
+from app.core.errors import PermanentScraperException
+from app.models import (SoundcloudProfileItem, SoundcloudProfilesBatchResult, SoundcloudSocialLinksBatchResult,
+                        SoundcloudSocialLinksItem)
+from app.scrapers.soundcloud.soundcloud_profile_scraper import SoundcloudProfileScraper
+from app.scrapers.soundcloud.soundcloud_webprofiles_scraper import SoundcloudWebprofilesScraper
+from app.services import fan_out, result_cache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SoundcloudBatchScraper:
+    """
+    Récupération par lot pour une liste d'identifiants SoundCloud choisis par l'appelant: identifiants
+    dédoublonnés, appels à concurrence bornée (fan_out), chaque identifiant passant par le cache des
+    résultats de l'outil unitaire. Une erreur ne concerne que son identifiant, jamais le lot
+    """
+
+    @staticmethod
+    async def fetch_each(
+            tool: str,
+            user_ids: List[int],
+            fetch: Callable[[int], Awaitable[T]],
+            bypass_cache: bool = False,
+    ) -> Dict[int, Union[T, BaseException]]:
+        """
+        Résultat ou exception par identifiant unique, dans l'ordre de première apparition. Pas le délai
+        global de l'enrichissement d'une recherche: un lot suit la limite de débit SoundCloud
+        (SOUNDCLOUD_BATCH_DEADLINE, sans délai global par défaut), chaque appel gardant son délai propre
+        """
+        if len(user_ids) > settings.SOUNDCLOUD_BATCH_MAX_IDS:
+            raise PermanentScraperException(
+                message=f"Trop d'identifiants: {len(user_ids)} (maximum {settings.SOUNDCLOUD_BATCH_MAX_IDS})",
+                details={"count": len(user_ids), "max": settings.SOUNDCLOUD_BATCH_MAX_IDS}
+            )
+
+        unique_ids = list(dict.fromkeys(user_ids))
+        results = await fan_out.run(
+            unique_ids,
+            lambda user_id: result_cache.get_or_compute(
+                tool, {"user_id": user_id}, lambda: fetch(user_id), bypass=bypass_cache
+            ),
+            deadline=settings.SOUNDCLOUD_BATCH_DEADLINE,
+        )
+        return dict(zip(unique_ids, results))
+
+    @staticmethod
+    def error_message(error: BaseException) -> str:
+        # asyncio.wait_for lève un TimeoutError sans message
+        return str(error) or ("Délai dépassé" if isinstance(error, asyncio.TimeoutError) else type(error).__name__)
+
+    async def scrape_profiles(self, user_ids: List[int], bypass_cache: bool = False) -> SoundcloudProfilesBatchResult:
+        logger.info(f"Récupération de {len(user_ids)} profils par ID")
+        scraper = SoundcloudProfileScraper()
+        results = await self.fetch_each("soundcloud_get_profile", user_ids, scraper.scrape, bypass_cache)
+
+        items = []
+        for user_id, profile in results.items():
+            if isinstance(profile, BaseException):
+                logger.warning(f"Erreur lors de la récupération du profil {user_id}: {self.error_message(profile)}")
+                items.append(SoundcloudProfileItem(user_id=user_id, error=self.error_message(profile)))
+            else:
+                items.append(SoundcloudProfileItem(user_id=user_id, profile=profile))
+        return SoundcloudProfilesBatchResult(results=items)
+
+    async def scrape_social_links(self, user_ids: List[int],
+                                  bypass_cache: bool = False) -> SoundcloudSocialLinksBatchResult:
+        logger.info(f"Récupération des réseaux sociaux pour {len(user_ids)} identifiants")
+        scraper = SoundcloudWebprofilesScraper()
+        results = await self.fetch_each("soundcloud_get_webprofiles", user_ids, scraper.scrape, bypass_cache)
+
+        items = []
+        for user_id, social_links in results.items():
+            if isinstance(social_links, BaseException):
+                logger.warning(f"Erreur lors de la récupération des réseaux sociaux pour le profil {user_id}: "
+                               f"{self.error_message(social_links)}")
+                items.append(SoundcloudSocialLinksItem(user_id=user_id, error=self.error_message(social_links)))
+            else:
+                items.append(SoundcloudSocialLinksItem(user_id=user_id, social_links=social_links))
+        return SoundcloudSocialLinksBatchResult(results=items)
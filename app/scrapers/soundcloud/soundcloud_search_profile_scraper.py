@@ -1,11 +1,12 @@
-import asyncio
 import logging
+from typing import Optional
 
 from app.core.errors import ParsingException, ResourceNotFoundException
 from app.models import SoundcloudSearchResult, LimitEnum
 from app.scrapers.base_scraper import BaseScraper
 from app.scrapers.soundcloud.soundcloud_mapping_utils import SoundcloudMappingUtils
 from app.scrapers.soundcloud.soundcloud_webprofiles_scraper import SoundcloudWebprofilesScraper
+from app.services import fan_out
 from app.services.soundcloud import soundcloud_api
 
 logger = logging.getLogger(__name__)
@@ -14,7 +15,14 @@ logger = logging.getLogger(__name__)
 class SoundcloudSearchProfileScraper(BaseScraper):
     """Scraper pour la recherche sur Soundcloud"""
 
-    async def scrape(self, name: str, page: int = 1, limit: LimitEnum = LimitEnum.TEN) -> SoundcloudSearchResult:
+    async def scrape(self, name: str, page: int = 1, limit: LimitEnum = LimitEnum.TEN,
+                     include_social_links: bool = False,
+                     social_links_top_k: Optional[int] = None) -> SoundcloudSearchResult:
+        """
+        Recherche de profils. Les réseaux sociaux coûtent un appel amont par profil: ils ne sont
+        récupérés qu'avec include_social_links, pour les social_links_top_k premiers profils
+        seulement si indiqué (social_links à None pour les profils non enrichis)
+        """
         logger.info(f"Recherche de profils pour: '{name}'")
 
         try:
@@ -27,7 +35,9 @@ class SoundcloudSearchProfileScraper(BaseScraper):
             collection = json_data.get("collection", [])
 
             # Extraire les réseaux sociaux
-            profiles = await self._extract_profiles_with_social_networks(collection)
+            profiles = await self._extract_profiles_with_social_networks(
+                collection, include_social_links, social_links_top_k
+            )
 
             # Construire et retourner le résultat
             search_result = SoundcloudSearchResult(
@@ -48,35 +58,36 @@ class SoundcloudSearchProfileScraper(BaseScraper):
                 )
             raise
 
-    async def _extract_profiles_with_social_networks(self, collection):
-        # Préparation des données de profil et tâches pour les réseaux sociaux
-        profile_data_list = []
-        webprofile_tasks = []
+    async def _extract_profiles_with_social_networks(self, collection, include_social_links: bool = False,
+                                                     social_links_top_k: Optional[int] = None):
+        # Filtrer et collecter les profils utilisateurs
+        profile_data_list = [user_data for user_data in collection if user_data.get("kind") == "user"]
         webprofiles_scraper = SoundcloudWebprofilesScraper()
 
-        # Filtrer et collecter les profils utilisateurs
-        for user_data in collection:
-            if user_data.get("kind") == "user":
-                profile_id = user_data.get("id", 0)
-                profile_data_list.append(user_data)
-                webprofile_tasks.append(webprofiles_scraper.scrape(profile_id))
+        # Profils enrichis: aucun par défaut, tous ou les K premiers avec include_social_links
+        enriched_count = 0
+        if include_social_links:
+            enriched_count = len(profile_data_list) if social_links_top_k is None else max(0, social_links_top_k)
 
-        # Récupérer tous les réseaux sociaux en parallèle
-        social_links_results = []
-        if webprofile_tasks:
-            social_links_results = await asyncio.gather(*webprofile_tasks, return_exceptions=True)
+        # Récupérer les réseaux sociaux en parallèle, à concurrence bornée: au délai global, les
+        # profils sont retournés avec les réseaux sociaux déjà arrivés
+        social_links_results = await fan_out.run(
+            [profile_data.get("id", 0) for profile_data in profile_data_list[:enriched_count]],
+            webprofiles_scraper.scrape
+        )
 
         # Créer les profils en intégrant les réseaux sociaux directement
         profiles = []
         for i, profile_data in enumerate(profile_data_list):
-            # Déterminer les réseaux sociaux pour ce profil
-            social_links = []
-            if i < len(social_links_results):
-                if not isinstance(social_links_results[i], Exception):
-                    social_links = social_links_results[i]
-                else:
-                    logger.warning(
-                        f"Erreur lors de la récupération des réseaux sociaux pour le profil {profile_data.get('id')}: {str(social_links_results[i])}")
+            # Profil non enrichi: réseaux sociaux non demandés (None)
+            social_links = social_links_results[i] if i < len(social_links_results) else None
+
+            # Si les réseaux sociaux sont erronés ou hors délai, on passe un tableau vide
+            if isinstance(social_links, BaseException):
+                logger.warning(
+                    f"Erreur lors de la récupération des réseaux sociaux pour le profil {profile_data.get('id')}: "
+                    f"{str(social_links) or type(social_links).__name__}")
+                social_links = []
 
             # Construire le profil avec ses réseaux sociaux
             profile = SoundcloudMappingUtils.build_profile(profile_data, social_links)
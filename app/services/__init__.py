@@ -1,7 +1,30 @@
+from app.services.metrics_service import metrics
+from app.services.rate_limit_service import rate_limiter
+from app.services.concurrency_service import concurrency_limiter
+from app.services.coalescing_service import request_coalescer
+from app.services.http_cache_service import http_cache
+from app.services.result_cache_service import result_cache
+from app.services.http_client_service import http_client, get_platform
+from app.services.parse_executor_service import parse_executor
+from app.services.fan_out_service import fan_out
 from app.services.pagination_service import PaginationService
 from app.services.retry_service import with_retry, async_with_retry
 
-__all__ = ["PaginationService", "with_retry", "async_with_retry"]
+__all__ = [
+    "PaginationService",
+    "with_retry",
+    "async_with_retry",
+    "http_client",
+    "get_platform",
+    "metrics",
+    "rate_limiter",
+    "concurrency_limiter",
+    "request_coalescer",
+    "http_cache",
+    "result_cache",
+    "parse_executor",
+    "fan_out",
+]
 
 # Importer les sous-packages
 from app.services import soundcloud
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Headers qui changent la réponse amont: deux requêtes avec des valeurs différentes ne sont pas fusionnées
+KEY_HEADERS = ("authorization", "accept", "if-none-match", "if-modified-since")
+
+CoalescingKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+
+def normalize_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """URL fusionnée avec ses paramètres, triés, sans fragment"""
+    request_url = httpx.URL(url)
+    if params:
+        request_url = request_url.copy_merge_params(params)
+    query = sorted(request_url.params.multi_items())
+    normalized_url = str(request_url.copy_with(query=None, fragment=None))
+    if query:
+        normalized_url = f"{normalized_url}?{httpx.QueryParams(query)}"
+    return normalized_url
+
+
+def coalescing_key(
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+) -> CoalescingKey:
+    """Clé normalisée d'une requête: méthode, URL avec paramètres triés, headers significatifs"""
+    normalized_url = normalize_url(url, params)
+    lowered = {key.lower(): value for key, value in (headers or {}).items()}
+    key_headers = tuple((name, lowered[name]) for name in KEY_HEADERS if name in lowered)
+    return method.upper(), normalized_url, key_headers
+
+
+class _Flight:
+    """Appel amont partagé et nombre d'appelants qui l'attendent encore"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """
+    Single-flight: les appels identiques lancés pendant qu'un premier est en vol attendent
+    son résultat au lieu de solliciter l'amont. L'appel partagé n'est annulé que lorsque
+    tous les appelants ont abandonné.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Any, _Flight] = {}
+        self.stats = {"requests": 0, "executions": 0, "coalesced": 0, "abandoned": 0}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _forget(self, key: Any, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def run(self, key: Any, factory: Callable[[], Awaitable[T]]) -> T:
+        """Exécute `factory()` ou rejoint l'exécution en cours pour la même clé"""
+        self.stats["requests"] += 1
+        flight = self._flights.get(key)
+
+        if flight is None:
+            self.stats["executions"] += 1
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task, f=flight: self._on_done(key, f))
+        else:
+            self.stats["coalesced"] += 1
+
+        flight.waiters += 1
+        try:
+            # shield: l'annulation d'un appelant n'annule pas l'appel partagé
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                # Dernier appelant parti: plus personne n'attend la réponse
+                self.stats["abandoned"] += 1
+                self._forget(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _on_done(self, key: Any, flight: _Flight) -> None:
+        self._forget(key, flight)
+        # Évite l'avertissement "exception never retrieved" si tous les appelants ont abandonné
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def reset(self) -> None:
+        """Réinitialise les statistiques (les appels en vol se terminent normalement)"""
+        self.stats = {key: 0 for key in self.stats}
+
+    def get_metrics(self) -> Dict[str, Any]:
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "in_flight": self.in_flight,
+            "coalescing_ratio": round(self.stats["coalesced"] / requests, 3) if requests else 0.0,
+        }
+
+
+# Instance singleton du single-flight des requêtes sortantes
+request_coalescer = RequestCoalescer()
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.errors import NetworkException, RateLimitException, TemporaryScraperException
+
+logger = logging.getLogger(__name__)
+
+
+class RequestOutcome(Enum):
+    SUCCESS = "success"  # Réponse rapide: augmentation additive
+    NEUTRAL = "neutral"  # Réponse lente ou erreur sans rapport avec la charge: pas d'ajustement
+    OVERLOAD = "overload"  # 429, 5xx, timeout: diminution multiplicative
+
+
+def classify_status(status_code: int) -> RequestOutcome:
+    if status_code == 429 or status_code >= 500:
+        return RequestOutcome.OVERLOAD
+    return RequestOutcome.SUCCESS
+
+
+def classify_exception(exception: BaseException) -> RequestOutcome:
+    # Équivalents transport de RateLimitException / TemporaryScraperException / NetworkException
+    if isinstance(exception, (httpx.TimeoutException, httpx.TransportError)):
+        return RequestOutcome.OVERLOAD
+    if isinstance(exception, (RateLimitException, TemporaryScraperException, NetworkException)):
+        return RequestOutcome.OVERLOAD
+    return RequestOutcome.NEUTRAL
+
+
+class AdaptiveLimiter:
+    """
+    Limiteur de concurrence AIMD pour un hôte: la limite augmente de 1 par fenêtre de requêtes
+    rapides réussies (1/limit par succès) et est multipliée par `backoff` sur surcharge
+    """
+
+    def __init__(
+            self,
+            initial: int,
+            min_limit: int,
+            max_limit: int,
+            backoff: float,
+            latency_threshold: float,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_threshold = latency_threshold
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self.stats = {"successes": 0, "overloads": 0, "decreases": 0}
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    async def acquire(self) -> float:
+        """Attend une place libre et retourne l'instant de début de la requête"""
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            return time.monotonic()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # La place a été accordée pendant l'annulation: on la rend
+                self.in_flight -= 1
+                self._wake_waiters()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        return time.monotonic()
+
+    def release(self, started_at: float, outcome: RequestOutcome) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        now = time.monotonic()
+
+        if outcome == RequestOutcome.OVERLOAD:
+            self.stats["overloads"] += 1
+            # Une seule réduction pour les requêtes lancées sous l'ancienne limite
+            if started_at >= self._last_decrease:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = now
+                self.stats["decreases"] += 1
+                logger.info(f"Surcharge détectée: limite de concurrence réduite à {self.current_limit}")
+
+        elif outcome == RequestOutcome.SUCCESS and now - started_at <= self.latency_threshold:
+            self.stats["successes"] += 1
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+        self._wake_waiters()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            **self.stats,
+        }
+
+
+class ConcurrencyLimiterService:
+    """Limiteurs de concurrence adaptatifs (AIMD), un par plateforme amont"""
+
+    def __init__(self):
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+
+    def get_limiter(self, platform: str) -> Optional[AdaptiveLimiter]:
+        if not settings.ADAPTIVE_CONCURRENCY_ENABLED:
+            return None
+        limiter = self._limiters.get(platform)
+        if limiter is None:
+            limiter = AdaptiveLimiter(
+                initial=settings.ADAPTIVE_CONCURRENCY_INITIAL,
+                min_limit=settings.ADAPTIVE_CONCURRENCY_MIN,
+                max_limit=settings.ADAPTIVE_CONCURRENCY_MAX,
+                backoff=settings.ADAPTIVE_CONCURRENCY_BACKOFF,
+                latency_threshold=settings.ADAPTIVE_CONCURRENCY_LATENCY_THRESHOLD,
+            )
+            self._limiters[platform] = limiter
+        return limiter
+
+    def reset(self) -> None:
+        self._limiters.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {platform: limiter.get_metrics() for platform, limiter in self._limiters.items()}
+
+
+# Instance singleton des limiteurs de concurrence
+concurrency_limiter = ConcurrencyLimiterService()
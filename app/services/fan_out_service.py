@@ -0,0 +1,92 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar, Union
+
+from app.core.config import settings
+from app.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+I = TypeVar("I")
+T = TypeVar("T")
+
+
+class FanOutService:
+    """
+    Appels d'enrichissement en éventail (un appel par élément: réseaux sociaux de chaque profil...)
+    à concurrence bornée. Chaque appel a son propre délai, mesuré à partir de son démarrage; au délai
+    global, les appels encore en cours sont annulés et les résultats déjà arrivés sont retournés
+    """
+
+    def __init__(self):
+        self.stats = {"runs": 0, "items": 0, "completed": 0, "errors": 0, "timeouts": 0, "deadline_exceeded": 0}
+
+    async def run(
+            self,
+            items: Sequence[I],
+            worker: Callable[[I], Awaitable[T]],
+            concurrency: Optional[int] = None,
+            item_timeout: Optional[float] = None,
+            deadline: Optional[float] = None,
+    ) -> List[Union[T, BaseException]]:
+        """
+        Appelle worker(item) pour chaque élément, au plus `concurrency` à la fois. Retourne les résultats
+        dans l'ordre des éléments, comme asyncio.gather(return_exceptions=True): l'exception levée
+        pour un appel en échec, asyncio.TimeoutError pour un appel hors délai ou non terminé au délai
+        global. Délais en secondes, 0 = sans délai; par défaut, ceux de la configuration
+        """
+        concurrency = settings.FAN_OUT_CONCURRENCY if concurrency is None else concurrency
+        item_timeout = settings.FAN_OUT_ITEM_TIMEOUT if item_timeout is None else item_timeout
+        deadline = settings.FAN_OUT_DEADLINE if deadline is None else deadline
+
+        self.stats["runs"] += 1
+        self.stats["items"] += len(items)
+        if not items:
+            return []
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def call(item: I) -> T:
+            async with semaphore:
+                if item_timeout > 0:
+                    return await asyncio.wait_for(worker(item), timeout=item_timeout)
+                return await worker(item)
+
+        tasks = [asyncio.create_task(call(item)) for item in items]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=deadline if deadline > 0 else None)
+        finally:
+            # Délai global atteint ou appelant annulé: les appels restants sont abandonnés
+            for task in tasks:
+                task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            logger.warning(f"Délai global de {deadline}s atteint: {len(pending)}/{len(items)} appels abandonnés")
+
+        results: List[Union[T, BaseException]] = []
+        for task in tasks:
+            if task in pending:
+                self.stats["deadline_exceeded"] += 1
+                results.append(asyncio.TimeoutError(f"Délai global de {deadline}s dépassé"))
+            elif task.exception() is not None:
+                exception = task.exception()
+                self.stats["timeouts" if isinstance(exception, asyncio.TimeoutError) else "errors"] += 1
+                results.append(exception)
+            else:
+                self.stats["completed"] += 1
+                results.append(task.result())
+        return results
+
+    def reset(self) -> None:
+        for name in self.stats:
+            self.stats[name] = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"concurrency": settings.FAN_OUT_CONCURRENCY, "item_timeout": settings.FAN_OUT_ITEM_TIMEOUT,
+                "deadline": settings.FAN_OUT_DEADLINE, **self.stats}
+
+
+# Instance singleton partagée par les scrapers
+fan_out = FanOutService()
+
+metrics.register("fan_out", fan_out.get_metrics)
@@ -0,0 +1,472 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.services.coalescing_service import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# Statuts stockables sans directive explicite (RFC 9110 §15.1, "heuristically cacheable")
+CACHEABLE_STATUSES = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+
+# Le corps stocké est déjà décodé: les headers d'encodage et hop-by-hop ne sont pas conservés
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+# Fraîcheur heuristique: 10% de l'âge du document (Last-Modified), plafonnée à un jour
+HEURISTIC_FRACTION = 0.1
+HEURISTIC_MAX_LIFETIME = 86400.0
+
+# Paramètres portant des identifiants: jamais dans la clé ni dans l'URL stockée (SQLite), et sans
+# effet sur la réponse (un jeton qui change à chaque rotation ne doit pas créer de nouvelles clés)
+CREDENTIAL_PARAMS = {"access_token", "oauth_token", "client_secret"}
+
+SendFunction = Callable[[Dict[str, str]], Awaitable[httpx.Response]]
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Directives Cache-Control en minuscules: {"max-age": "60", "no-cache": None, ...}"""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """URL normalisée servant de clé, sans les paramètres d'identification"""
+    parsed = httpx.URL(normalize_url(url, params))
+    query = [(name, value) for name, value in parsed.params.multi_items() if name.lower() not in CREDENTIAL_PARAMS]
+    return str(parsed.copy_with(params=httpx.QueryParams(query))) if query else str(parsed.copy_with(query=None))
+
+
+def _parse_seconds(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class CacheEntry:
+    """Réponse stockée: statut, headers, corps décodé et instant de stockage"""
+
+    def __init__(
+            self,
+            url: str,
+            status_code: int,
+            headers: List[Tuple[str, str]],
+            content: bytes,
+            stored_at: float,
+            ttl_override: Optional[float] = None,
+            vary: Optional[Dict[str, str]] = None,
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at
+        self.ttl_override = ttl_override
+        self.vary = vary or {}
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + sum(len(name) + len(value) for name, value in self.headers)
+
+    def header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return None
+
+    def freshness_lifetime(self) -> float:
+        if self.ttl_override is not None:
+            return self.ttl_override
+
+        directives = parse_cache_control(self.header("cache-control"))
+        if "no-cache" in directives:
+            return 0.0
+        max_age = _parse_seconds(directives.get("max-age"))
+        if max_age is not None:
+            return max_age
+
+        date = _parse_http_date(self.header("date")) or self.stored_at
+        expires = _parse_http_date(self.header("expires"))
+        if expires is not None:
+            return max(0.0, expires - date)
+        if self.header("expires") is not None:
+            # Expires invalide (souvent "0" ou "-1"): déjà expiré
+            return 0.0
+
+        last_modified = _parse_http_date(self.header("last-modified"))
+        if last_modified is not None and self.status_code in CACHEABLE_STATUSES:
+            return min(HEURISTIC_MAX_LIFETIME, max(0.0, date - last_modified) * HEURISTIC_FRACTION)
+        return 0.0
+
+    def age(self, now: float) -> float:
+        return (_parse_seconds(self.header("age")) or 0.0) + max(0.0, now - self.stored_at)
+
+    def is_fresh(self, now: float) -> bool:
+        return self.age(now) < self.freshness_lifetime()
+
+    def has_validators(self) -> bool:
+        return self.header("etag") is not None or self.header("last-modified") is not None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.header("etag") is not None:
+            headers["If-None-Match"] = self.header("etag")
+        if self.header("last-modified") is not None:
+            headers["If-Modified-Since"] = self.header("last-modified")
+        return headers
+
+    def matches(self, request_headers: Optional[Dict[str, str]]) -> bool:
+        """Vérifie que les headers nommés par Vary sont identiques à ceux de la requête stockée"""
+        lowered = {key.lower(): value for key, value in (request_headers or {}).items()}
+        return all(lowered.get(name, "") == value for name, value in self.vary.items())
+
+    def revalidated(self, response_headers: httpx.Headers, now: float) -> "CacheEntry":
+        """Nouvelle entrée après une réponse 304: headers mis à jour, fraîcheur repartie de zéro"""
+        updated = {key.lower(): value for key, value in response_headers.items()
+                   if key.lower() not in DROPPED_HEADERS}
+        kept = [(key, value) for key, value in self.headers if key.lower() not in updated]
+        return CacheEntry(
+            self.url, self.status_code, kept + list(updated.items()), self.content, now,
+            ttl_override=self.ttl_override, vary=self.vary,
+        )
+
+    def to_response(self) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=httpx.Request("GET", self.url),
+            extensions={"from_cache": True},
+        )
+
+
+class MemoryCacheStore:
+    """Niveau mémoire: LRU bornée en octets"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.delete(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.size_bytes += entry.size
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= evicted.size
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+
+class SqliteCacheStore:
+    """Niveau disque: base SQLite bornée en octets, éviction des entrées les moins récemment lues"""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Ouverture paresseuse: l'import du module ne crée pas de fichier
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT, vary TEXT, "
+                "content BLOB, stored_at REAL, ttl REAL, size INTEGER, accessed REAL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT url, status, headers, vary, content, stored_at, ttl FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+            connection.commit()
+
+        url, status, headers, vary, content, stored_at, ttl = row
+        return CacheEntry(
+            url, status, [tuple(header) for header in json.loads(headers)], bytes(content), stored_at,
+            ttl_override=ttl, vary=json.loads(vary),
+        )
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.url, entry.status_code, json.dumps(entry.headers), json.dumps(entry.vary),
+                 entry.content, entry.stored_at, entry.ttl_override, entry.size, time.time()),
+            )
+            self._evict(connection)
+            connection.commit()
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        self.evictions += len(evicted)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM entries")
+            connection.commit()
+
+    def stats(self) -> Dict[str, int]:
+        if self._connection is None:
+            return {"entries": 0, "bytes": 0}
+        with self._lock:
+            count, total = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {"entries": count, "bytes": total}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# Positionné pendant un calcul demandé sans cache (bypass_cache): les entrées fraîches sont ignorées
+# et chaque GET est revalidé auprès de l'amont; la réponse obtenue remplace l'entrée stockée
+bypass_http_cache: contextvars.ContextVar[bool] = contextvars.ContextVar("bypass_http_cache", default=False)
+
+
+class HttpCacheService:
+    """
+    Cache HTTP privé (RFC 9111) du transport: sert les réponses fraîches, revalide les réponses
+    expirées par requête conditionnelle (If-None-Match / If-Modified-Since) et reconstitue les 304
+    à partir du corps stocké. Mémoire LRU en premier niveau, SQLite en second.
+    """
+
+    def __init__(self, memory: Optional[MemoryCacheStore] = None, disk: Optional[SqliteCacheStore] = None):
+        self.memory = memory if memory is not None else MemoryCacheStore(settings.HTTP_CACHE_MEMORY_MAX_BYTES)
+        self.disk = disk
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "invalidated": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.HTTP_CACHE_ENABLED
+
+    @staticmethod
+    def _ttl_for(platform: str) -> Optional[float]:
+        """TTL forcé de la plateforme, ou None pour suivre les directives amont"""
+        key = platform.upper().replace(".", "_").replace("-", "_")
+        ttl = getattr(settings, f"HTTP_CACHE_TTL_{key}", -1)
+        return ttl if ttl >= 0 else None
+
+    async def _lookup(self, key: str) -> Optional[CacheEntry]:
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None:
+                self.memory.set(key, entry)
+        return entry
+
+    async def _store(self, key: str, entry: CacheEntry) -> None:
+        self.memory.set(key, entry)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, entry)
+        self.stats["stored"] += 1
+
+    def _build_entry(
+            self,
+            response: httpx.Response,
+            request_headers: Optional[Dict[str, str]],
+            platform: str,
+    ) -> Optional[CacheEntry]:
+        """Construit l'entrée à stocker, ou None si la réponse n'est pas stockable"""
+        if response.status_code not in CACHEABLE_STATUSES:
+            return None
+        vary_header = response.headers.get("vary", "")
+        if vary_header.strip() == "*":
+            return None
+
+        ttl_override = self._ttl_for(platform)
+        if ttl_override is None and "no-store" in parse_cache_control(response.headers.get("cache-control")):
+            return None
+
+        lowered = {key.lower(): value for key, value in (request_headers or {}).items()}
+        vary = {name.strip().lower(): lowered.get(name.strip().lower(), "")
+                for name in vary_header.split(",") if name.strip()}
+        entry = CacheEntry(
+            cache_key(str(response.url)) if response.request is not None else "",
+            response.status_code,
+            [(key, value) for key, value in response.headers.items() if key.lower() not in DROPPED_HEADERS],
+            response.content,
+            time.time(),
+            ttl_override=ttl_override,
+            vary=vary,
+        )
+        # Sans fraîcheur ni validateur, l'entrée ne pourrait jamais être resservie
+        if entry.freshness_lifetime() <= 0 and not entry.has_validators():
+            return None
+        return entry
+
+    async def get_fresh(
+            self,
+            url: str,
+            params: Optional[Dict[str, Any]],
+            headers: Optional[Dict[str, str]],
+    ) -> Optional[httpx.Response]:
+        """Réponse stockée encore fraîche pour ce GET, sans requête amont ni revalidation"""
+        if bypass_http_cache.get():
+            return None
+        entry = await self._lookup(cache_key(url, params))
+        if entry is None or not entry.matches(headers) or not entry.is_fresh(time.time()):
+            return None
+        self.stats["hits"] += 1
+        return entry.to_response()
+
+    async def fetch(
+            self,
+            url: str,
+            params: Optional[Dict[str, Any]],
+            headers: Optional[Dict[str, str]],
+            platform: str,
+            send: SendFunction,
+    ) -> httpx.Response:
+        """GET à travers le cache: `send(headers)` n'est appelé que si aucune réponse fraîche n'est stockée"""
+        key = cache_key(url, params)
+        entry = await self._lookup(key)
+        if entry is not None and not entry.matches(headers):
+            entry = None
+
+        if entry is not None and not bypass_http_cache.get() and entry.is_fresh(time.time()):
+            self.stats["hits"] += 1
+            return entry.to_response()
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.conditional_headers())
+
+        response = await send(request_headers)
+
+        if entry is not None and response.status_code == 304:
+            self.stats["revalidated"] += 1
+            entry = entry.revalidated(response.headers, time.time())
+            await self._store(key, entry)
+            return entry.to_response()
+
+        self.stats["misses"] += 1
+        new_entry = self._build_entry(response, headers, platform)
+        if new_entry is not None:
+            await self._store(key, new_entry)
+        elif entry is not None and response.status_code < 500:
+            await self.invalidate(url, params)
+        return response
+
+    async def invalidate(self, url: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Invalide l'URL après une méthode non sûre (RFC 9111 §4.4)"""
+        key = cache_key(url, params)
+        self.memory.delete(key)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.delete, key)
+        self.stats["invalidated"] += 1
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["revalidated"] + self.stats["misses"]
+        result = {
+            **self.stats,
+            "hit_ratio": round((self.stats["hits"] + self.stats["revalidated"]) / lookups, 3) if lookups else 0.0,
+            "memory": {"entries": len(self.memory), "bytes": self.memory.size_bytes,
+                       "max_bytes": self.memory.max_bytes, "evictions": self.memory.evictions},
+        }
+        if self.disk is not None:
+            result["disk"] = {**self.disk.stats(), "max_bytes": self.disk.max_bytes,
+                              "evictions": self.disk.evictions}
+        return result
+
+
+def _build_http_cache() -> HttpCacheService:
+    disk = None
+    if settings.HTTP_CACHE_BACKEND == "sqlite":
+        disk = SqliteCacheStore(settings.HTTP_CACHE_PATH, settings.HTTP_CACHE_DISK_MAX_BYTES)
+    return HttpCacheService(MemoryCacheStore(settings.HTTP_CACHE_MEMORY_MAX_BYTES), disk)
+
+
+# Instance singleton du cache HTTP
+http_cache = _build_http_cache()
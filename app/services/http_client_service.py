@@ -0,0 +1,345 @@
+import asyncio
+import logging
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.services.coalescing_service import RequestCoalescer, coalescing_key, request_coalescer
+from app.services.http_cache_service import HttpCacheService, http_cache
+from app.services.concurrency_service import (ConcurrencyLimiterService, classify_exception,
+                                              classify_status, concurrency_limiter)
+from app.services.metrics_service import metrics
+from app.services.rate_limit_service import RateLimiterService, parse_retry_after, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Correspondance entre les hôtes amont connus et leur plateforme
+PLATFORM_HOSTS = {
+    "api.soundcloud.com": "soundcloud",
+    "soundcloud.com": "soundcloud",
+    "www.beatport.com": "beatport",
+    "beatport.com": "beatport",
+    "bandcamp.com": "bandcamp",
+}
+
+# En-têtes qui ne décrivent plus un corps relu et tronqué
+STREAMED_DROPPED_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+def get_platform(url: str) -> str:
+    """Retourne la plateforme d'une URL (soundcloud, beatport, bandcamp) ou son hôte si inconnue"""
+    host = (urlsplit(url).hostname or "").lower()
+    if host in PLATFORM_HOSTS:
+        return PLATFORM_HOSTS[host]
+    # Les sous-domaines Bandcamp (artiste.bandcamp.com) partagent la même plateforme
+    for known_host, platform in PLATFORM_HOSTS.items():
+        if host.endswith(f".{known_host}"):
+            return platform
+    return host
+
+
+class HttpClientService:
+    """
+    Service de transport HTTP partagé: un httpx.AsyncClient longue durée par hôte amont,
+    pour réutiliser les connexions (keep-alive) au lieu de refaire DNS + TCP + TLS à chaque requête
+    """
+
+    def __init__(
+            self,
+            transport: Optional[httpx.AsyncBaseTransport] = None,
+            limiter: Optional[RateLimiterService] = None,
+            concurrency: Optional[ConcurrencyLimiterService] = None,
+            coalescer: Optional[RequestCoalescer] = None,
+            cache: Optional[HttpCacheService] = None,
+    ):
+        self._transport = transport
+        self._rate_limiter = limiter or rate_limiter
+        self._concurrency = concurrency or concurrency_limiter
+        self._coalescer = coalescer or request_coalescer
+        self._cache = cache if cache is not None else http_cache
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, Optional[asyncio.AbstractEventLoop]]] = {}
+        self._closing: Set[asyncio.Task] = set()
+        self.retired_clients = 0
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(settings.REQUEST_TIMEOUT, pool=settings.HTTP_POOL_TIMEOUT)
+        return httpx.AsyncClient(limits=limits, timeout=timeout, transport=self._transport)
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    @staticmethod
+    def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def get_client(self, url: str) -> httpx.AsyncClient:
+        """Retourne le client partagé de l'hôte de l'URL, créé à la demande"""
+        origin = self._origin(url)
+        loop = self._running_loop()
+        entry = self._clients.get(origin)
+
+        # Un client fermé ou créé sur une autre boucle d'événements ne peut pas être réutilisé
+        if entry is None or entry[0].is_closed or entry[1] is not loop:
+            if entry is not None:
+                self._retire(*entry)
+            client = self._build_client()
+            self._clients[origin] = (client, loop)
+            logger.debug(f"Nouveau client HTTP partagé pour {origin}")
+            return client
+
+        return entry[0]
+
+    def _retire(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Ferme un client remplacé, sur sa boucle d'origine quand elle peut encore l'exécuter"""
+        if client.is_closed:
+            return
+        self.retired_clients += 1
+        current = self._running_loop()
+        if loop is not None and loop.is_running():
+            # Boucle active dans un autre thread: la fermeture lui est confiée
+            asyncio.run_coroutine_threadsafe(self._close_client(client), loop)
+        elif loop is not None and not loop.is_closed() and current is None:
+            loop.run_until_complete(self._close_client(client))
+        elif current is not None:
+            # Boucle fermée: les connexions ne peuvent plus être fermées proprement, mais le client
+            # est marqué fermé et son pool vidé
+            task = current.create_task(self._close_client(client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_client(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Fermeture incomplète d'un client HTTP remplacé: {e}")
+
+    async def request(
+            self,
+            method: str,
+            url: str,
+            headers: Optional[Dict[str, str]] = None,
+            params: Optional[Dict[str, Any]] = None,
+            data: Optional[Dict[str, Any]] = None,
+            json: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None,
+            follow_redirects: bool = True,
+    ) -> httpx.Response:
+        dispatch = partial(self._dispatch, method, url, params=params, data=data, json=json,
+                           timeout=timeout, follow_redirects=follow_redirects)
+
+        # Les GET passent par le cache HTTP: réponse fraîche servie localement, sinon revalidation
+        if self._cache.enabled and method.upper() == "GET":
+            return await self._cache.fetch(url, params, headers, get_platform(url), dispatch)
+
+        response = await dispatch(headers)
+        if self._cache.enabled and method.upper() not in ("GET", "HEAD") and response.status_code < 400:
+            await self._cache.invalidate(url, params)
+        return response
+
+    async def request_until(
+            self,
+            method: str,
+            url: str,
+            markers: Sequence[bytes],
+            max_bytes: int,
+            headers: Optional[Dict[str, str]] = None,
+            params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None,
+            follow_redirects: bool = True,
+    ) -> httpx.Response:
+        """
+        Requête en streaming: le corps est lu jusqu'à ce que les `markers` aient été vus dans l'ordre,
+        puis la connexion est fermée. Au plus `max_bytes` octets sont gardés en mémoire.
+        L'extension "truncated" de la réponse indique si le corps n'a pas été lu en entier.
+        Un corps partiel n'est jamais stocké dans le cache HTTP, qui n'est consulté qu'en lecture
+        """
+        if self._cache.enabled and method.upper() == "GET":
+            cached = await self._cache.get_fresh(url, params, headers)
+            if cached is not None:
+                return cached
+
+        read = partial(self._read_until, method, url, headers, params, timeout, follow_redirects,
+                       tuple(markers), max_bytes)
+        send = partial(self._guarded, url, read)
+        if settings.REQUEST_COALESCING_ENABLED and method.upper() in ("GET", "HEAD"):
+            key = coalescing_key(method, url, params, headers) + (follow_redirects, "until", tuple(markers), max_bytes)
+            return await self._coalescer.run(key, send)
+        return await send()
+
+    async def _dispatch(
+            self,
+            method: str,
+            url: str,
+            headers: Optional[Dict[str, str]],
+            params: Optional[Dict[str, Any]],
+            data: Optional[Dict[str, Any]],
+            json: Optional[Dict[str, Any]],
+            timeout: Optional[float],
+            follow_redirects: bool,
+    ) -> httpx.Response:
+        send = partial(self._send, method, url, headers, params, data, json, timeout, follow_redirects)
+
+        # Les GET identiques en vol partagent un seul appel amont (la réponse est déjà lue)
+        if settings.REQUEST_COALESCING_ENABLED and method.upper() in ("GET", "HEAD"):
+            key = coalescing_key(method, url, params, headers) + (follow_redirects,)
+            return await self._coalescer.run(key, send)
+
+        return await send()
+
+    async def _send(
+            self,
+            method: str,
+            url: str,
+            headers: Optional[Dict[str, str]],
+            params: Optional[Dict[str, Any]],
+            data: Optional[Dict[str, Any]],
+            json: Optional[Dict[str, Any]],
+            timeout: Optional[float],
+            follow_redirects: bool,
+    ) -> httpx.Response:
+        return await self._guarded(url, lambda client: client.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            data=data,
+            json=json,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            follow_redirects=follow_redirects,
+        ))
+
+    async def _guarded(
+            self,
+            url: str,
+            perform: Callable[[httpx.AsyncClient], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        """Exécute `perform` sur le client partagé de l'hôte, sous limitation de débit et AIMD"""
+        platform = get_platform(url)
+        client = self.get_client(url)
+
+        # Chaque requête sortante consomme un jeton du seau de sa plateforme. Le jeton est pris avant
+        # la place de concurrence: une attente de jeton ou une pause 429 n'occupe pas de place et
+        # n'est pas comptée dans la latence mesurée par l'AIMD
+        await self._rate_limiter.acquire(platform)
+
+        # Limite de requêtes en vol adaptée à la santé de la plateforme (AIMD)
+        adaptive = self._concurrency.get_limiter(platform)
+        started_at = await adaptive.acquire() if adaptive else 0.0
+
+        try:
+            response = await perform(client)
+        except BaseException as e:
+            if adaptive:
+                adaptive.release(started_at, classify_exception(e))
+            raise
+
+        if adaptive:
+            adaptive.release(started_at, classify_status(response.status_code))
+
+        if response.status_code == 429:
+            # Pause de toute la plateforme plutôt qu'un retry indépendant par coroutine
+            self._rate_limiter.on_rate_limited(platform, parse_retry_after(response.headers.get("Retry-After")))
+
+        return response
+
+    @staticmethod
+    async def _read_until(
+            method: str,
+            url: str,
+            headers: Optional[Dict[str, str]],
+            params: Optional[Dict[str, Any]],
+            timeout: Optional[float],
+            follow_redirects: bool,
+            markers: Tuple[bytes, ...],
+            max_bytes: int,
+            client: httpx.AsyncClient,
+    ) -> httpx.Response:
+        buffer = bytearray()
+        marker_index = 0
+        search_from = 0
+        truncated = False
+
+        async with client.stream(
+                method,
+                url,
+                headers=headers,
+                params=params,
+                timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+                follow_redirects=follow_redirects,
+        ) as response:
+            async for chunk in response.aiter_bytes():
+                buffer += chunk
+                # Recherche incrémentale: seuls les nouveaux octets (et la frontière d'un marqueur
+                # à cheval sur deux chunks) sont parcourus
+                while marker_index < len(markers):
+                    marker = markers[marker_index]
+                    position = buffer.find(marker, max(search_from, len(buffer) - len(chunk) - len(marker) + 1))
+                    if position < 0:
+                        break
+                    search_from = position + len(marker)
+                    marker_index += 1
+                if marker_index == len(markers):
+                    # Les données utiles sont reçues: le reste de la page n'est pas téléchargé
+                    del buffer[search_from:]
+                    truncated = True
+                    break
+                if len(buffer) > max_bytes:
+                    logger.warning(f"Corps de {url} au-delà de {max_bytes} octets, lecture interrompue")
+                    del buffer[max_bytes:]
+                    truncated = True
+                    break
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=[(key, value) for key, value in response.headers.multi_items()
+                     if key.lower() not in STREAMED_DROPPED_HEADERS],
+            content=bytes(buffer),
+            request=response.request,
+            extensions={"truncated": truncated},
+        )
+
+    async def start(self) -> None:
+        """Prépare le service au démarrage de l'application (lifespan)"""
+        # Les clients créés avant le démarrage (imports, scripts) sont liés à une autre boucle
+        await self.close()
+        logger.info("Service de transport HTTP démarré")
+
+    async def close(self) -> None:
+        """Ferme tous les clients partagés et leurs connexions"""
+        self._cache.close()
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client, loop in clients:
+            if client.is_closed:
+                continue
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Erreur lors de la fermeture d'un client HTTP: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"clients": sorted(self._clients.keys()), "retired_clients": self.retired_clients}
+
+
+# Instance singleton du service de transport
+http_client = HttpClientService()
+
+metrics.register("http_clients", http_client.get_metrics)
+metrics.register("rate_limiter", rate_limiter.get_metrics)
+metrics.register("adaptive_concurrency", concurrency_limiter.get_metrics)
+metrics.register("request_coalescing", request_coalescer.get_metrics)
+metrics.register("http_cache", http_cache.get_metrics)
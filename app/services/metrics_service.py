@@ -0,0 +1,28 @@
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsService:
+    """Registre des métriques exposées par les services (niveaux, compteurs, temps d'attente...)"""
+
+    def __init__(self):
+        self._providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+        self._providers[name] = provider
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = {}
+        for name, provider in self._providers.items():
+            try:
+                snapshot[name] = provider()
+            except Exception as e:
+                logger.warning(f"Impossible de lire les métriques '{name}': {e}")
+                snapshot[name] = {"error": str(e)}
+        return snapshot
+
+
+# Instance singleton du registre de métriques
+metrics = MetricsService()
@@ -1,5 +1,6 @@
 import logging
-from typing import List, TypeVar
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple, TypeVar
 
 from app.models import LimitEnum
 
@@ -9,16 +10,30 @@ T = TypeVar('T')
 
 class PaginationService:
     """Service pour gérer la pagination des résultats"""
-    
+
     @staticmethod
-    def paginate_results(results: List[T], page: int, limit: LimitEnum) -> List[T]:
+    def page_window(page: int, limit: LimitEnum) -> Tuple[int, int]:
+        """Indices [début, fin[ des éléments de la page demandée"""
         start_idx = (page - 1) * limit.value
-        end_idx = start_idx + limit.value
-        
+        return start_idx, start_idx + limit.value
+
+    @staticmethod
+    def paginate_iter(items: Iterable[T], page: int, limit: LimitEnum) -> Iterator[T]:
+        """
+        Éléments de la page demandée, sans parcourir la suite: permet de ne mapper que les
+        éléments bruts de la page (le nombre total se calcule sur les données brutes)
+        """
+        start_idx, end_idx = PaginationService.page_window(page, limit)
+        return islice(items, start_idx, end_idx)
+
+    @staticmethod
+    def paginate_results(results: List[T], page: int, limit: LimitEnum) -> List[T]:
+        start_idx, end_idx = PaginationService.page_window(page, limit)
+
         # Vérifier si l'index de début est valide
         if start_idx < len(results):
             return results[start_idx:end_idx]
         else:
             # Si la page demandée dépasse le nombre de résultats disponibles, retourner une liste vide
             logger.warning(f"Page {page} demandée mais seulement {len(results)} résultats disponibles")
-            return []
\ No newline at end of file
+            return []
@@ -0,0 +1,79 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+
+from app.core.config import settings
+from app.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ParseExecutor:
+    """
+    Exécute le parsing des grosses pages (décodage JSON, HTML) dans un pool de processus pour ne pas
+    bloquer la boucle d'événements partagée par les sessions MCP. Les fonctions soumises sont des
+    fonctions de module qui reçoivent le contenu brut et retournent des dicts simples (picklables).
+    En dessous de `inline_max_bytes`, le transfert vers un processus coûte plus que le parsing:
+    il reste dans la boucle
+    """
+
+    def __init__(self, max_workers: int, inline_max_bytes: int):
+        self.max_workers = max_workers
+        self.inline_max_bytes = inline_max_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {"inline": 0, "offloaded": 0, "pool_failures": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: pas de fork d'un processus qui a déjà des threads (SQLite, to_thread)
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def run(self, function: Callable[..., T], content: Union[bytes, str], *args: Any) -> T:
+        """Appelle function(content, *args), dans le pool si le contenu dépasse le seuil"""
+        if not self.enabled or len(content) <= self.inline_max_bytes:
+            self.stats["inline"] += 1
+            return function(content, *args)
+
+        self.stats["offloaded"] += 1
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._get_pool(), functools.partial(function, content, *args))
+        except BrokenProcessPool:
+            # Processus de parsing tué (mémoire, signal): pool recréé à la prochaine page
+            logger.warning("Pool de parsing interrompu, parsing dans la boucle d'événements")
+            self.stats["pool_failures"] += 1
+            self._discard_pool()
+            return function(content, *args)
+
+    def _discard_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def close(self) -> None:
+        """Arrête les processus de parsing (arrêt de l'application): les parsings en cours se terminent"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"max_workers": self.max_workers, "inline_max_bytes": self.inline_max_bytes,
+                "pool_started": self._pool is not None, **self.stats}
+
+
+# Instance singleton partagée par les scrapers
+parse_executor = ParseExecutor(settings.PARSE_EXECUTOR_WORKERS, settings.PARSE_EXECUTOR_INLINE_MAX_BYTES)
+
+metrics.register("parse_executor", parse_executor.get_metrics)
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convertit un header Retry-After (secondes ou date HTTP) en secondes"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Seau à jetons: `rate` jetons par seconde, jusqu'à `burst` jetons accumulés.
+    Les réservations sont calculées sans verrou (pas d'await entre lecture et mise à jour),
+    un solde négatif représentant les requêtes déjà en file d'attente.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        # Incrémenté à chaque pause: invalide les réservations faites avant
+        self.generation = 0
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self) -> float:
+        """Réserve un jeton et retourne le temps d'attente avant de pouvoir l'utiliser"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        ready_at = self.updated + max(0.0, -self.tokens) / self.rate
+        return max(0.0, ready_at - now)
+
+    def pause(self, seconds: float) -> None:
+        """Suspend tout le seau: aucun jeton n'est distribué avant la fin de la pause"""
+        now = time.monotonic()
+        resume_at = now + seconds
+        if resume_at <= self.paused_until:
+            return
+        # Les réservations en cours sont abandonnées: les requêtes en attente réservent à nouveau
+        self.tokens = 0.0
+        self.updated = resume_at
+        self.paused_until = resume_at
+        self.generation += 1
+
+    def level(self) -> float:
+        """Nombre de jetons disponibles (négatif si des requêtes sont en attente)"""
+        now = time.monotonic()
+        if now <= self.updated:
+            return self.tokens
+        return min(self.burst, self.tokens + (now - self.updated) * self.rate)
+
+    def paused_for(self) -> float:
+        return max(0.0, self.paused_until - time.monotonic())
+
+
+class RateLimiterService:
+    """
+    Limiteur de débit par plateforme (seau à jetons). Chaque requête sortante acquiert un jeton;
+    un 429 avec Retry-After met en pause tout le seau de la plateforme au lieu de laisser
+    chaque coroutine réessayer de son côté.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    @staticmethod
+    def _limits_for(platform: str) -> tuple[float, int]:
+        key = platform.upper().replace(".", "_").replace("-", "_")
+        rate = getattr(settings, f"RATE_LIMIT_{key}_RATE", settings.RATE_LIMIT_DEFAULT_RATE)
+        burst = getattr(settings, f"RATE_LIMIT_{key}_BURST", settings.RATE_LIMIT_DEFAULT_BURST)
+        return rate, burst
+
+    def get_bucket(self, platform: str) -> TokenBucket:
+        bucket = self._buckets.get(platform)
+        if bucket is None:
+            rate, burst = self._limits_for(platform)
+            bucket = TokenBucket(rate, burst)
+            self._buckets[platform] = bucket
+            self._stats[platform] = {
+                "requests": 0, "delayed": 0, "total_wait": 0.0, "max_wait": 0.0, "pauses": 0
+            }
+        return bucket
+
+    async def acquire(self, platform: str) -> float:
+        """Attend un jeton pour la plateforme et retourne le temps d'attente total"""
+        bucket = self.get_bucket(platform)
+        stats = self._stats[platform]
+        stats["requests"] += 1
+
+        waited = 0.0
+        while True:
+            generation = bucket.generation
+            wait = bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+            # Une pause a pu être décidée pendant l'attente (429 reçu par une autre requête)
+            if bucket.generation == generation:
+                break
+
+        if waited > 0:
+            stats["delayed"] += 1
+            stats["total_wait"] += waited
+            stats["max_wait"] = max(stats["max_wait"], waited)
+        return waited
+
+    def on_rate_limited(self, platform: str, retry_after: Optional[float] = None) -> None:
+        """Met en pause la plateforme après une réponse 429"""
+        pause = retry_after if retry_after is not None else settings.RATE_LIMIT_DEFAULT_PAUSE
+        bucket = self.get_bucket(platform)
+        bucket.pause(pause)
+        self._stats[platform]["pauses"] += 1
+        logger.warning(f"Limite de taux atteinte pour {platform}: pause de {pause:.1f} secondes")
+
+    def reset(self) -> None:
+        """Réinitialise tous les seaux (nouvelle configuration, tests)"""
+        self._buckets.clear()
+        self._stats.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        result = {}
+        for platform, bucket in self._buckets.items():
+            stats = self._stats[platform]
+            delayed = stats["delayed"]
+            result[platform] = {
+                "rate": bucket.rate,
+                "burst": bucket.burst,
+                "tokens": round(bucket.level(), 3),
+                "paused_for": round(bucket.paused_for(), 3),
+                "requests": stats["requests"],
+                "delayed": delayed,
+                "pauses": stats["pauses"],
+                "avg_wait": round(stats["total_wait"] / delayed, 3) if delayed else 0.0,
+                "max_wait": round(stats["max_wait"], 3),
+            }
+        return result
+
+
+# Instance singleton du limiteur de débit
+rate_limiter = RateLimiterService()
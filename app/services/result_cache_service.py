@@ -0,0 +1,274 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import date
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from app.core.config import settings
+from app.core.errors import MissingPageDataException, ResourceNotFoundException
+from app.models import BandcampSearchResult, BeatportSearchResult, SoundcloudSearchResult
+from app.services.coalescing_service import RequestCoalescer
+from app.services.http_cache_service import bypass_http_cache
+from app.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Erreurs mémorisées par le cache négatif: elles se reproduiraient à l'identique si l'agent réessaie
+NEGATIVE_ERRORS = (ResourceNotFoundException, MissingPageDataException)
+SEARCH_RESULT_TYPES = (BandcampSearchResult, BeatportSearchResult, SoundcloudSearchResult)
+
+
+def _normalize_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def result_cache_key(tool: str, arguments: Dict[str, Any]) -> str:
+    """Clé d'un résultat: nom de l'outil + arguments normalisés (triés, sans valeurs None)"""
+    normalized = {name: _normalize_value(value) for name, value in arguments.items() if value is not None}
+    return f"{tool}:{json.dumps(normalized, sort_keys=True, default=str, ensure_ascii=False)}"
+
+
+def is_empty_search_result(value: Any) -> bool:
+    """Vrai pour un résultat de recherche dont toutes les listes sont vides"""
+    if not isinstance(value, SEARCH_RESULT_TYPES):
+        return False
+    return not any(getattr(value, name) for name, field in type(value).model_fields.items()
+                   if isinstance(getattr(value, name), list))
+
+
+class ResultCacheService:
+    """
+    Cache des résultats finaux (modèles Pydantic déjà mappés) des outils MCP et des routes REST.
+    Un hit évite le fetch, l'extraction, le décodage JSON et le mapping. LRU bornée en nombre
+    d'entrées, TTL par outil; les calculs concurrents d'une même clé sont fusionnés.
+    Une entrée expirée reste servie pendant `max_stale` secondes, le temps d'un rafraîchissement
+    en arrière-plan; au-delà, l'appelant attend un résultat frais.
+    Les 404, pages sans données et recherches vides vont dans un cache négatif séparé, à TTL court
+    et taille propre: un agent qui réessaie un mauvais slug ne resollicite pas l'amont.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.max_entries = max_entries if max_entries is not None else settings.RESULT_CACHE_MAX_ENTRIES
+        # clé -> (fin de fraîcheur, fin de tolérance stale, résultat)
+        self._entries: "OrderedDict[str, Tuple[float, float, Any]]" = OrderedDict()
+        # clé -> (expiration, erreur levée ou résultat vide)
+        self._negatives: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._coalescer = RequestCoalescer()
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        # clé -> instant avant lequel aucun nouveau rafraîchissement n'est tenté (après un échec)
+        self._refresh_not_before: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.RESULT_CACHE_ENABLED
+
+    @staticmethod
+    def ttl_for(tool: str) -> float:
+        return getattr(settings, f"RESULT_CACHE_TTL_{tool.upper()}", settings.RESULT_CACHE_DEFAULT_TTL)
+
+    @staticmethod
+    def max_stale_for(tool: str) -> float:
+        """Durée après expiration pendant laquelle le résultat est servi et rafraîchi en arrière-plan"""
+        return getattr(settings, f"RESULT_CACHE_MAX_STALE_{tool.upper()}", settings.RESULT_CACHE_DEFAULT_MAX_STALE)
+
+    def _tool_stats(self, tool: str) -> Dict[str, int]:
+        if tool not in self._stats:
+            self._stats[tool] = {
+                "hits": 0, "stale_hits": 0, "negative_hits": 0, "misses": 0, "bypassed": 0,
+                "refreshes": 0, "refresh_errors": 0,
+            }
+        return self._stats[tool]
+
+    def lookup(self, key: str) -> Tuple[Optional[Any], bool]:
+        """Retourne (résultat, frais); le résultat est None au-delà de la tolérance stale"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        fresh_until, stale_until, value = entry
+        now = self._clock()
+        if stale_until <= now:
+            del self._entries[key]
+            return None, False
+        self._entries.move_to_end(key)
+        return value, fresh_until > now
+
+    def get(self, key: str) -> Optional[Any]:
+        """Retourne le résultat s'il est encore frais"""
+        value, fresh = self.lookup(key)
+        return value if fresh else None
+
+    def set(self, key: str, value: Any, ttl: float, max_stale: float = 0.0) -> None:
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        fresh_until = self._clock() + ttl
+        self._negatives.pop(key, None)
+        self._entries[key] = (fresh_until, fresh_until + max(0.0, max_stale), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def lookup_negative(self, key: str) -> Optional[Any]:
+        """Retourne l'erreur ou le résultat vide mémorisé pour la clé, s'il n'a pas expiré"""
+        entry = self._negatives.get(key)
+        if entry is None:
+            return None
+        expires_at, outcome = entry
+        if expires_at <= self._clock():
+            del self._negatives[key]
+            return None
+        return outcome
+
+    def set_negative(self, key: str, outcome: Any) -> None:
+        ttl = settings.RESULT_CACHE_NEGATIVE_TTL
+        if ttl <= 0 or settings.RESULT_CACHE_NEGATIVE_MAX_ENTRIES <= 0:
+            return
+        # Le résultat négatif, plus récent, remplace un éventuel résultat positif
+        self._entries.pop(key, None)
+        self._negatives[key] = (self._clock() + ttl, outcome)
+        self._negatives.move_to_end(key)
+        while len(self._negatives) > settings.RESULT_CACHE_NEGATIVE_MAX_ENTRIES:
+            self._negatives.popitem(last=False)
+
+    async def get_or_compute(
+            self,
+            tool: str,
+            arguments: Dict[str, Any],
+            compute: Callable[[], Awaitable[T]],
+            bypass: bool = False,
+    ) -> T:
+        """Retourne le résultat en cache de l'outil pour ces arguments, ou le calcule et le stocke"""
+        if not self.enabled:
+            return await compute()
+
+        key = result_cache_key(tool, arguments)
+        stats = self._tool_stats(tool)
+
+        async def compute_and_store() -> T:
+            try:
+                value = await compute()
+            except NEGATIVE_ERRORS as e:
+                self.set_negative(key, e)
+                raise
+            if is_empty_search_result(value):
+                self.set_negative(key, value)
+            else:
+                self.set(key, value, self.ttl_for(tool), self.max_stale_for(tool))
+            return value
+
+        if bypass:
+            # Le bypass force un calcul frais, qui remplace l'entrée existante; le cache HTTP
+            # du transport revalide aussi ses réponses au lieu de servir une page encore fraîche
+            stats["bypassed"] += 1
+            token = bypass_http_cache.set(True)
+            try:
+                return await compute_and_store()
+            finally:
+                bypass_http_cache.reset(token)
+
+        negative = self.lookup_negative(key)
+        if negative is not None:
+            stats["negative_hits"] += 1
+            if isinstance(negative, Exception):
+                # La trace de la première levée n'a pas de sens pour cet appel
+                raise negative.with_traceback(None)
+            return negative
+
+        cached, fresh = self.lookup(key)
+        if cached is not None:
+            if fresh:
+                stats["hits"] += 1
+            else:
+                # Stale-while-revalidate: réponse immédiate, rafraîchissement en arrière-plan
+                stats["stale_hits"] += 1
+                self._schedule_refresh(tool, key, compute_and_store)
+            return cached
+
+        stats["misses"] += 1
+        return await self._coalescer.run(key, compute_and_store)
+
+    def _schedule_refresh(self, tool: str, key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+        """Lance un rafraîchissement en arrière-plan, un seul à la fois par clé"""
+        if key in self._refreshes:
+            return
+        # Après un échec, l'amont n'est pas resollicité à chaque hit stale
+        if self._clock() < self._refresh_not_before.get(key, 0.0):
+            return
+        stats = self._tool_stats(tool)
+        stats["refreshes"] += 1
+
+        async def refresh() -> None:
+            try:
+                await self._coalescer.run(key, compute)
+                self._refresh_not_before.pop(key, None)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # L'entrée stale reste servie jusqu'à la fin de sa tolérance
+                stats["refresh_errors"] += 1
+                self._refresh_not_before[key] = self._clock() + settings.RESULT_CACHE_REFRESH_BACKOFF
+                logger.warning(f"Échec du rafraîchissement en arrière-plan de {tool}: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._refreshes[key] = task
+        task.add_done_callback(lambda done: self._refreshes.pop(key) if self._refreshes.get(key) is done else None)
+
+    async def close(self) -> None:
+        """Annule les rafraîchissements en arrière-plan (arrêt de l'application)"""
+        tasks = list(self._refreshes.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshes.clear()
+
+    def clear(self) -> None:
+        for task in self._refreshes.values():
+            if not task.done() and not task.get_loop().is_closed():
+                task.cancel()
+        self._refreshes.clear()
+        self._refresh_not_before.clear()
+        self._entries.clear()
+        self._negatives.clear()
+        self._stats.clear()
+        self.evictions = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        tools = {}
+        for tool, stats in self._stats.items():
+            lookups = stats["hits"] + stats["stale_hits"] + stats["negative_hits"] + stats["misses"]
+            tools[tool] = {
+                **stats,
+                "ttl": self.ttl_for(tool),
+                "max_stale": self.max_stale_for(tool),
+                "hit_ratio": round((stats["hits"] + stats["stale_hits"] + stats["negative_hits"]) / lookups, 3)
+                if lookups else 0.0,
+            }
+        return {
+            "entries": len(self._entries),
+            "refreshing": len(self._refreshes),
+            "max_entries": self.max_entries,
+            "evictions": self.evictions,
+            "negative_entries": len(self._negatives),
+            "negative_max_entries": settings.RESULT_CACHE_NEGATIVE_MAX_ENTRIES,
+            "tools": tools,
+        }
+
+
+# Instance singleton du cache de résultats
+result_cache = ResultCacheService()
+
+metrics.register("result_cache", result_cache.get_metrics)
@@ -1,79 +1,197 @@
+import asyncio
+import inspect
 import logging
+import random
 import time
+from contextlib import aclosing
 from functools import wraps
-from typing import Any, Callable, List, Type, TypeVar, cast
+from typing import Any, Awaitable, Callable, List, Optional, Type, TypeVar, cast
 
-from tenacity import (RetryError, before_sleep_log, retry,
-                      retry_if_exception_type, stop_after_attempt,
-                      wait_exponential)
+from tenacity import (before_sleep_log, retry, retry_if_exception_type,
+                      stop_after_attempt, wait_exponential)
 
 from app.core.config import settings
-from app.core.errors import (PermanentScraperException, ScraperException,
-                             TemporaryScraperException)
+from app.core.errors import (NetworkException, PermanentScraperException,
+                             ScraperException, TemporaryScraperException)
 
 logger = logging.getLogger(__name__)
 
 # Type générique pour la fonction décorée
 F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+
+class RetryAttempt:
+    """
+    Tentative d'un AsyncRetrying: le bloc `with attempt:` capture l'exception levée,
+    l'itérateur décide ensuite de réessayer ou de la relever
+    """
+
+    def __init__(self, number: int, deadline_at: Optional[float]):
+        self.number = number
+        self.exception: Optional[Exception] = None
+        self._deadline_at = deadline_at
+
+    @property
+    def remaining(self) -> Optional[float]:
+        """Temps restant (en secondes) avant le délai total, None si pas de délai"""
+        if self._deadline_at is None:
+            return None
+        return max(0.0, self._deadline_at - time.monotonic())
+
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """Attend le résultat en respectant le délai total de la requête"""
+        remaining = self.remaining
+        if remaining is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, timeout=remaining)
+        except asyncio.TimeoutError:
+            raise NetworkException(
+                message="Délai total de la requête dépassé",
+                details={"error_type": "deadline", "attempt": self.number}
+            )
+
+    def __enter__(self) -> "RetryAttempt":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        # Seules les Exception sont capturées: CancelledError et KeyboardInterrupt se propagent
+        if isinstance(exc_value, Exception):
+            self.exception = exc_value
+            return True
+        return False
+
+
+class AsyncRetrying:
+    """
+    Moteur de retry asyncio: backoff exponentiel avec full jitter, respect du Retry-After
+    et délai total par requête. Les attentes utilisent asyncio.sleep et ne bloquent jamais la boucle.
+
+        async for attempt in AsyncRetrying():
+            with attempt:
+                response = await attempt.run(client.get(url))
+    """
+
+    def __init__(
+            self,
+            max_attempts: Optional[int] = None,
+            retry_exceptions: Optional[List[Type[Exception]]] = None,
+            min_wait: Optional[float] = None,
+            max_wait: Optional[float] = None,
+            deadline: Optional[float] = None,
+            sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        # Les valeurs par défaut sont lues à l'exécution pour suivre la configuration courante
+        self.max_attempts = max_attempts if max_attempts is not None else settings.MAX_RETRIES
+        self.retry_exceptions = tuple(retry_exceptions or [TemporaryScraperException])
+        self.min_wait = min_wait if min_wait is not None else settings.RETRY_BACKOFF_FACTOR
+        self.max_wait = max_wait if max_wait is not None else settings.RETRY_MAX_WAIT
+        self.deadline = deadline if deadline is not None else settings.RETRY_DEADLINE
+        self.sleep = sleep
+
+    def compute_wait(self, attempt_number: int, exception: Exception) -> float:
+        """Calcule l'attente avant la prochaine tentative"""
+        # Le serveur a indiqué quand réessayer: on le respecte
+        retry_after = getattr(exception, "retry_after", None)
+        if retry_after:
+            return float(retry_after)
+
+        # Full jitter: attente aléatoire entre 0 et le plafond exponentiel
+        ceiling = min(self.max_wait, self.min_wait * (2 ** (attempt_number - 1)))
+        return random.uniform(0, ceiling)
+
+    async def __aiter__(self):
+        deadline_at = time.monotonic() + self.deadline if self.deadline else None
+
+        for number in range(1, self.max_attempts + 1):
+            attempt = RetryAttempt(number, deadline_at)
+            yield attempt
+
+            exception = attempt.exception
+            if exception is None:
+                return
+
+            if not isinstance(exception, self.retry_exceptions) or number >= self.max_attempts:
+                raise exception
+
+            wait_time = self.compute_wait(number, exception)
+            if deadline_at is not None and time.monotonic() + wait_time >= deadline_at:
+                logger.info(f"Délai total atteint, abandon après {number} tentative(s): {str(exception)}")
+                raise exception
+
+            logger.info(
+                f"Tentative {number}/{self.max_attempts} échouée: {str(exception)}. "
+                f"Nouvelle tentative dans {wait_time:.2f} secondes."
+            )
+            await self.sleep(wait_time)
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any) -> T:
+        """Exécute la coroutine avec retries"""
+        async with aclosing(self.__aiter__()) as attempts:
+            async for attempt in attempts:
+                with attempt:
+                    return await attempt.run(func(*args, **kwargs))
+
+
+def _to_scraper_exception(e: Exception) -> ScraperException:
+    # Convertir les exceptions standard en ScraperException
+    return ScraperException(
+        message=f"Erreur inattendue: {str(e)}",
+        details={"original_error": str(e), "error_type": type(e).__name__}
+    )
 
 
 def with_retry(
         max_attempts: int = None,
         retry_exceptions: List[Type[Exception]] = None,
-        min_wait: float = 1.0,
-        max_wait: float = 10.0,
+        min_wait: float = None,
+        max_wait: float = None,
+        deadline: float = None,
 ) -> Callable[[F], F]:
-    if max_attempts is None:
-        max_attempts = settings.MAX_RETRIES
-
-    if retry_exceptions is None:
-        retry_exceptions = [TemporaryScraperException]
-
     def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                retrying = AsyncRetrying(
+                    max_attempts=max_attempts,
+                    retry_exceptions=retry_exceptions,
+                    min_wait=min_wait,
+                    max_wait=max_wait,
+                    deadline=deadline,
+                )
+                try:
+                    return await retrying.call(func, *args, **kwargs)
+                except ScraperException:
+                    # Après épuisement des tentatives, la dernière exception est relevée telle quelle
+                    raise
+                except Exception as e:
+                    raise _to_scraper_exception(e)
+
+            return cast(F, async_wrapper)
+
+        # Fonctions synchrones: tenacity, construit une seule fois par décoration
+        sync_retry = retry(
+            stop=stop_after_attempt(max_attempts if max_attempts is not None else settings.MAX_RETRIES),
+            wait=wait_exponential(
+                multiplier=settings.RETRY_BACKOFF_FACTOR,
+                min=min_wait if min_wait is not None else 1.0,
+                max=max_wait if max_wait is not None else 10.0,
+            ),
+            retry=retry_if_exception_type(tuple(retry_exceptions or [TemporaryScraperException])),
+            before_sleep=before_sleep_log(logger, logging.INFO),
+            reraise=True,
+        )
+        retrying_func = sync_retry(func)
+
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             try:
-                # Utilisation de tenacity pour gérer les retries
-                @retry(
-                    stop=stop_after_attempt(max_attempts),
-                    wait=wait_exponential(multiplier=settings.RETRY_BACKOFF_FACTOR, min=min_wait, max=max_wait),
-                    retry=retry_if_exception_type(tuple(retry_exceptions)),
-                    before_sleep=before_sleep_log(logger, logging.INFO),
-                    reraise=True,
-                )
-                def _wrapped_func() -> Any:
-                    return func(*args, **kwargs)
-
-                return _wrapped_func()
-
-            except RetryError as e:
-                # Si toutes les tentatives ont échoué, on récupère la dernière exception
-                last_exception = e.last_attempt.exception()
-
-                if isinstance(last_exception, TemporaryScraperException):
-                    # Convertir l'exception temporaire en exception permanente après tous les retries
-                    raise PermanentScraperException(
-                        message=f"Échec après {max_attempts} tentatives: {str(last_exception)}",
-                        status_code=last_exception.status_code,
-                        details={
-                            "original_error": str(last_exception),
-                            "attempts": max_attempts,
-                            **last_exception.details
-                        }
-                    )
-
-                # Si c'est déjà une exception permanente ou une autre exception, on la relève
-                raise last_exception
-
-            except Exception as e:
-                # Pour les exceptions non gérées
-                if not isinstance(e, ScraperException):
-                    # Convertir les exceptions standard en ScraperException
-                    raise ScraperException(
-                        message=f"Erreur inattendue: {str(e)}",
-                        details={"original_error": str(e), "error_type": type(e).__name__}
-                    )
+                return retrying_func(*args, **kwargs)
+            except ScraperException:
                 raise
+            except Exception as e:
+                raise _to_scraper_exception(e)
 
         return cast(F, wrapper)
 
@@ -89,59 +207,35 @@ async def async_with_retry(
         *args: Any,
         **kwargs: Any
 ) -> Any:
-    if max_attempts is None:
-        max_attempts = settings.MAX_RETRIES
-
-    if retry_exceptions is None:
-        retry_exceptions = [TemporaryScraperException]
-
-    attempt = 0
-    last_exception = None
-
-    while attempt < max_attempts:
-        try:
-            return await func(*args, **kwargs)
-
-        except tuple(retry_exceptions) as e:
-            attempt += 1
-            last_exception = e
-
-            if attempt >= max_attempts:
-                break
-
-            # Calcul du temps d'attente avec backoff exponentiel
-            wait_time = min(max_wait, min_wait * (2 ** (attempt - 1)))
-
-            logger.info(
-                f"Tentative {attempt}/{max_attempts} échouée: {str(e)}. "
-                f"Nouvelle tentative dans {wait_time:.2f} secondes."
-            )
-
-            # Attente avant la prochaine tentative
-            time.sleep(wait_time)
-
-        except Exception as e:
-            # Pour les exceptions non gérées ou permanentes
-            if not isinstance(e, ScraperException):
-                # Convertir les exceptions standard en ScraperException
-                raise ScraperException(
-                    message=f"Erreur inattendue: {str(e)}",
-                    details={"original_error": str(e), "error_type": type(e).__name__}
-                )
+    retrying = AsyncRetrying(
+        max_attempts=max_attempts,
+        retry_exceptions=retry_exceptions,
+        min_wait=min_wait,
+        max_wait=max_wait,
+    )
+
+    try:
+        return await retrying.call(func, *args, **kwargs)
+
+    except TemporaryScraperException as e:
+        if retry_exceptions and not isinstance(e, tuple(retry_exceptions)):
             raise
-
-    # Si toutes les tentatives ont échoué
-    if isinstance(last_exception, TemporaryScraperException):
         # Convertir l'exception temporaire en exception permanente après tous les retries
         raise PermanentScraperException(
-            message=f"Échec après {max_attempts} tentatives: {str(last_exception)}",
-            status_code=last_exception.status_code,
+            message=f"Échec après {retrying.max_attempts} tentatives: {str(e)}",
+            status_code=e.status_code,
             details={
-                "original_error": str(last_exception),
-                "attempts": max_attempts,
-                **last_exception.details
+                "original_error": str(e),
+                "attempts": retrying.max_attempts,
+                **e.details
             }
         )
 
-    # Si c'est déjà une exception permanente ou une autre exception, on la relève
-    raise last_exception
+    except ScraperException:
+        # Si c'est déjà une exception permanente, on la relève
+        raise
+
+    except Exception as e:
+        if retry_exceptions and isinstance(e, tuple(retry_exceptions)):
+            raise
+        raise _to_scraper_exception(e)
@@ -1,4 +1,4 @@
 from app.services.soundcloud.soundcloud_auth_service import soundcloud_auth
-from app.services.soundcloud.soundcloud_api_service import soundcloud_api
+from app.services.soundcloud.soundcloud_api_service import soundcloud_api, soundcloud_auth_modes
 
-__all__ = ["soundcloud_auth", "soundcloud_api"]
\ No newline at end of file
+__all__ = ["soundcloud_auth", "soundcloud_api", "soundcloud_auth_modes"]
\ No newline at end of file
@@ -1,20 +1,107 @@
 import logging
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlsplit
 
 import httpx
 
+from app.core.config import settings
 from app.core.errors import (
     NetworkException,
     PermanentScraperException,
     TemporaryScraperException,
     RateLimitException,
-    AuthenticationException
+    AuthenticationException,
+    ResourceNotFoundException
 )
 from app.services.soundcloud.soundcloud_auth_service import soundcloud_auth
-from app.services import with_retry
+from app.services import http_client, metrics, with_retry
 
 logger = logging.getLogger(__name__)
 
+# Modes d'authentification: header Authorization, ou access_token en paramètre d'URL
+AUTH_MODE_HEADER = "header"
+AUTH_MODE_QUERY = "query"
+
+
+def endpoint_family(url: str) -> str:
+    """Famille d'endpoints d'une URL: son chemin, identifiants numériques remplacés (/users/{id}/web-profiles)"""
+    path = urlsplit(url).path
+    return "/".join("{id}" if segment.isdigit() else segment for segment in path.split("/")) or "/"
+
+
+class SoundcloudAuthModes:
+    """
+    Dernier mode d'authentification accepté par famille d'endpoints: les appels suivants l'utilisent
+    directement au lieu de payer un aller-retour refusé. Le header reste le mode préféré: quand l'URL
+    a été retenue, le header est retenté par un seul appel toutes les SOUNDCLOUD_AUTH_MODE_REPROBE_INTERVAL
+    secondes (0 = à chaque appel)
+    """
+
+    def __init__(self):
+        self._families: Dict[str, Dict[str, Any]] = {}
+        self.stats = {"requests": 0, "fallbacks": 0, "probes": 0}
+
+    def _state(self, family: str) -> Dict[str, Any]:
+        state = self._families.get(family)
+        if state is None:
+            state = {"mode": AUTH_MODE_HEADER, "probe_at": 0.0, "fallbacks": 0, "probes": 0,
+                     AUTH_MODE_HEADER: 0, AUTH_MODE_QUERY: 0}
+            self._families[family] = state
+        return state
+
+    def choose(self, family: str) -> str:
+        """Mode à essayer en premier pour la famille"""
+        state = self._state(family)
+        self.stats["requests"] += 1
+        now = time.time()
+        if state["mode"] == AUTH_MODE_QUERY and now >= state["probe_at"]:
+            # Les appels concurrents gardent le mode retenu pendant l'essai
+            state["probe_at"] = now + settings.SOUNDCLOUD_AUTH_MODE_REPROBE_INTERVAL
+            state["probes"] += 1
+            self.stats["probes"] += 1
+            return AUTH_MODE_HEADER
+        return state["mode"]
+
+    def record_fallback(self, family: str) -> None:
+        # Mode refusé: la requête est émise une seconde fois avec l'autre mode
+        self._state(family)["fallbacks"] += 1
+        self.stats["fallbacks"] += 1
+
+    def record_success(self, family: str, mode: str) -> None:
+        state = self._state(family)
+        state[mode] += 1
+        if state["mode"] != mode:
+            logger.info(f"Authentification SoundCloud pour {family}: mode {mode} retenu")
+            state["mode"] = mode
+            if mode == AUTH_MODE_QUERY:
+                state["probe_at"] = time.time() + settings.SOUNDCLOUD_AUTH_MODE_REPROBE_INTERVAL
+
+    def mode(self, family: str) -> str:
+        state = self._families.get(family)
+        return state["mode"] if state else AUTH_MODE_HEADER
+
+    def reset(self) -> None:
+        self._families.clear()
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def get_metrics(self) -> Dict[str, Any]:
+        families = {
+            family: {"mode": state["mode"], "fallbacks": state["fallbacks"], "probes": state["probes"],
+                     "header_successes": state[AUTH_MODE_HEADER], "query_successes": state[AUTH_MODE_QUERY]}
+            for family, state in self._families.items()
+        }
+        return {"reprobe_interval": settings.SOUNDCLOUD_AUTH_MODE_REPROBE_INTERVAL, **self.stats,
+                "families": families}
+
+
+# Instance singleton partagée par les appels à l'API SoundCloud
+soundcloud_auth_modes = SoundcloudAuthModes()
+
+metrics.register("soundcloud_auth_modes", soundcloud_auth_modes.get_metrics)
+
+
 class SoundcloudApiService:
     """Service pour interagir avec l'API SoundCloud"""
     API_URL = "https://api.soundcloud.com"
@@ -30,83 +117,63 @@ class SoundcloudApiService:
             json: Optional[Dict[str, Any]] = None,
             use_auth_header: bool = True,
     ) -> httpx.Response:
-        if use_auth_header:
-            token = await soundcloud_auth.get_access_token()
-            auth_headers = {"Authorization": f"OAuth {token}"}
-            
-            # Préparer les headers
-            request_headers = {"Accept": "application/json"}
-            request_headers.update(auth_headers)
-            if headers:
-                request_headers.update(headers)
-                
-            # Utiliser l'URL originale sans modification
-            auth_url = url
-        else:
-            # Méthode alternative: obtenir l'URL authentifiée avec le token en paramètre
-            auth_url = await soundcloud_auth.build_auth_url(url)
-            # Préparer les headers
-            request_headers = {"Accept": "application/json"}
-            if headers:
-                request_headers.update(headers)
-        
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.request(
-                    method=method,
-                    url=auth_url,
-                    headers=request_headers,
-                    params=params,
-                    data=data,
-                    json=json,
+            response, token = await SoundcloudApiService._send(
+                url, method, headers, params, data, json, use_auth_header
+            )
+            if response.status_code == 401:
+                # Token expiré ou révoqué en cours de route: renouvelé une fois, la requête est rejouée
+                soundcloud_auth.invalidate_token(token)
+                response, _ = await SoundcloudApiService._send(
+                    url, method, headers, params, data, json, use_auth_header
                 )
+
+            if response.status_code == 429:
+                # Limite de taux atteinte
+                retry_after = response.headers.get("Retry-After")
+                retry_seconds = int(retry_after) if retry_after and retry_after.isdigit() else None
                 
-                if response.status_code == 429:
-                    # Limite de taux atteinte
-                    retry_after = response.headers.get("Retry-After")
-                    retry_seconds = int(retry_after) if retry_after and retry_after.isdigit() else None
-                    
-                    raise RateLimitException(
-                        message=f"Limite de taux atteinte pour {url}",
-                        retry_after=retry_seconds,
-                        details={"url": url, "status_code": response.status_code}
-                    )
-                
-                elif response.status_code >= 500:
-                    # Erreur serveur (temporaire)
-                    raise TemporaryScraperException(
-                        message=f"Erreur serveur pour {url}: {response.status_code}",
-                        details={"url": url, "status_code": response.status_code}
-                    )
-                
-                elif response.status_code == 403:
-                    # Erreur d'autorisation (Forbidden)
-                    error_details = {"url": url, "status_code": response.status_code}
-                    try:
-                        error_details["response_body"] = response.json()
-                    except Exception:
-                        error_details["response_text"] = response.text
-                    
-                    raise AuthenticationException(
-                        message=f"Accès interdit à {url}: vérifiez les autorisations de l'API SoundCloud",
-                        details=error_details
-                    )
+                raise RateLimitException(
+                    message=f"Limite de taux atteinte pour {url}",
+                    retry_after=retry_seconds,
+                    details={"url": url, "status_code": response.status_code}
+                )
+            
+            elif response.status_code >= 500:
+                # Erreur serveur (temporaire)
+                raise TemporaryScraperException(
+                    message=f"Erreur serveur pour {url}: {response.status_code}",
+                    details={"url": url, "status_code": response.status_code}
+                )
+            
+            elif response.status_code == 403:
+                # Erreur d'autorisation (Forbidden)
+                error_details = {"url": url, "status_code": response.status_code}
+                try:
+                    error_details["response_body"] = response.json()
+                except Exception:
+                    error_details["response_text"] = response.text
                 
-                elif response.status_code >= 400 and response.status_code != 404:
-                    # Erreur client (permanente)
-                    error_details = {"url": url, "status_code": response.status_code}
-                    try:
-                        error_details["response_body"] = response.json()
-                    except Exception:
-                        error_details["response_text"] = response.text
-                    
-                    raise PermanentScraperException(
-                        message=f"Erreur client pour {url}: {response.status_code}",
-                        status_code=response.status_code,
-                        details=error_details
-                    )
+                raise AuthenticationException(
+                    message=f"Accès interdit à {url}: vérifiez les autorisations de l'API SoundCloud",
+                    details=error_details
+                )
+            
+            elif response.status_code >= 400 and response.status_code != 404:
+                # Erreur client (permanente)
+                error_details = {"url": url, "status_code": response.status_code}
+                try:
+                    error_details["response_body"] = response.json()
+                except Exception:
+                    error_details["response_text"] = response.text
                 
-                return response
+                raise PermanentScraperException(
+                    message=f"Erreur client pour {url}: {response.status_code}",
+                    status_code=response.status_code,
+                    details=error_details
+                )
+            
+            return response
         
         except httpx.TimeoutException:
             raise NetworkException(
@@ -120,6 +187,46 @@ class SoundcloudApiService:
                 details={"url": url, "error_type": "request_error", "error": str(e)}
             )
     
+    @staticmethod
+    async def _send(
+            url: str,
+            method: str,
+            headers: Optional[Dict[str, str]],
+            params: Optional[Dict[str, Any]],
+            data: Optional[Dict[str, Any]],
+            json: Optional[Dict[str, Any]],
+            use_auth_header: bool,
+    ) -> Tuple[httpx.Response, Optional[str]]:
+        """Envoie la requête authentifiée; retourne la réponse et le token utilisé"""
+        if use_auth_header:
+            token = await soundcloud_auth.get_access_token()
+            # Préparer les headers
+            request_headers = {"Accept": "application/json", "Authorization": f"OAuth {token}"}
+            if headers:
+                request_headers.update(headers)
+
+            # Utiliser l'URL originale sans modification
+            auth_url = url
+        else:
+            # Méthode alternative: obtenir l'URL authentifiée avec le token en paramètre
+            auth_url = await soundcloud_auth.build_auth_url(url)
+            token = httpx.URL(auth_url).params.get("access_token")
+            # Préparer les headers
+            request_headers = {"Accept": "application/json"}
+            if headers:
+                request_headers.update(headers)
+
+        # Client partagé pour api.soundcloud.com: les connexions sont réutilisées
+        response = await http_client.request(
+            method=method,
+            url=auth_url,
+            headers=request_headers,
+            params=params,
+            data=data,
+            json=json,
+        )
+        return response, token
+
     @classmethod
     async def _fetch_with_auth_fallback(
         cls,
@@ -128,18 +235,26 @@ class SoundcloudApiService:
         method: str = "GET"
     ) -> httpx.Response:
         """
-        Effectue une requête avec fallback automatique en cas d'erreur 403.
-        Essaie d'abord avec le header Authorization, puis avec le paramètre d'URL.
+        Effectue une requête avec fallback automatique en cas d'erreur 403: le mode d'authentification
+        retenu pour la famille d'endpoints est essayé en premier, puis l'autre (header Authorization
+        ou paramètre d'URL). Le mode accepté est retenu pour les appels suivants
         """
+        family = endpoint_family(url)
+        mode = soundcloud_auth_modes.choose(family)
         try:
-            return await cls.fetch(url, method=method, params=params, use_auth_header=True)
-        except AuthenticationException as e:
+            response = await cls.fetch(url, method=method, params=params, use_auth_header=mode == AUTH_MODE_HEADER)
+        except AuthenticationException:
+            other_mode = AUTH_MODE_QUERY if mode == AUTH_MODE_HEADER else AUTH_MODE_HEADER
             logger.warning(
-                "Échec de l'authentification avec le header Authorization. "
-                "Tentative avec le paramètre d'URL..."
+                f"Échec de l'authentification en mode {mode} pour {family}. Tentative en mode {other_mode}..."
             )
-            # En cas d'échec d'authentification, essayer avec le paramètre d'URL
-            return await cls.fetch(url, method=method, params=params, use_auth_header=False)
+            soundcloud_auth_modes.record_fallback(family)
+            response = await cls.fetch(url, method=method, params=params,
+                                       use_auth_header=other_mode == AUTH_MODE_HEADER)
+            mode = other_mode
+
+        soundcloud_auth_modes.record_success(family, mode)
+        return response
     
     @classmethod
     async def search_users(cls, query: str, limit: int, offset: int = 0) -> Dict[str, Any]:
@@ -159,6 +274,8 @@ class SoundcloudApiService:
         """Récupère les informations d'un utilisateur SoundCloud"""
         url = f"{cls.API_URL}/users/{user_id}"
         response = await cls._fetch_with_auth_fallback(url)
+        if response.status_code == 404:
+            raise ResourceNotFoundException(resource_type="Profil Soundcloud", resource_id=str(user_id))
         return response.json()
     
     @classmethod
@@ -166,6 +283,8 @@ class SoundcloudApiService:
         """Récupère les profils web d'un utilisateur SoundCloud"""
         url = f"{cls.API_URL}/users/{user_id}/web-profiles"
         response = await cls._fetch_with_auth_fallback(url)
+        if response.status_code == 404:
+            raise ResourceNotFoundException(resource_type="Profils web Soundcloud", resource_id=str(user_id))
         return response.json()
 
 # Instance singleton du service API
@@ -1,29 +1,194 @@
+import asyncio
 import logging
 import time
+from typing import Any, Dict, Optional
 
 import httpx
 
 from app.core.config import settings
 from app.core.errors import AuthenticationException, NetworkException
+from app.services.http_client_service import http_client
+from app.services.metrics_service import metrics
+from app.services.soundcloud.soundcloud_token_store import StoredToken, build_token_store
 
 logger = logging.getLogger(__name__)
 
 
 class SoundcloudAuthService:
-    """Service pour gérer l'authentification OAuth 2.1 avec SoundCloud"""
+    """
+    Service pour gérer l'authentification OAuth 2.1 avec SoundCloud. Le renouvellement du token
+    est single-flight (un seul appel à /oauth2/token, les autres appelants attendent son résultat)
+    et anticipé: dans les TOKEN_EXPIRY_BUFFER secondes avant l'expiration, le token courant reste
+    servi pendant qu'une tâche en arrière-plan le renouvelle. Le token est partagé par un store
+    (fichier par défaut): les autres workers et les redémarrages réutilisent un token encore valide
+    """
     TOKEN_URL = "https://api.soundcloud.com/oauth2/token"
     TOKEN_EXPIRY_BUFFER = 300
+    # Délai avant une nouvelle tentative de renouvellement anticipé après un échec
+    TOKEN_REFRESH_RETRY = 30
+    # Attente maximale du verrou de renouvellement détenu par un autre processus, et intervalle de sondage
+    STORE_LOCK_TIMEOUT = 10.0
+    STORE_LOCK_POLL = 0.05
 
-    def __init__(self):
+    def __init__(self, store=None):
+        self._store = store
         self._access_token = None
+        # Dernier token refusé par l'API: jamais réadopté depuis le store
+        self._rejected_token = None
+        # Expiration réelle du token, et début du renouvellement anticipé
         self._token_expiry = 0
+        self._refresh_at = 0
+        self._refresh_not_before = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.stats = {"requests": 0, "refreshes": 0, "background_refreshes": 0, "refresh_errors": 0,
+                      "invalidations": 0, "adopted": 0, "store_errors": 0}
+
+    @property
+    def store(self):
+        # Construction paresseuse: le store configuré au premier usage, sans accès disque à l'import
+        if self._store is None:
+            self._store = build_token_store()
+        return self._store
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Un verrou asyncio est lié à la boucle d'événements sur laquelle il a servi
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+            self._refresh_task = None
+        return self._lock
+
+    def _is_valid(self) -> bool:
+        return bool(self._access_token) and time.time() < self._token_expiry
 
     async def get_access_token(self) -> str:
-        # Si le token n'existe pas ou est expiré, en obtenir un nouveau
-        if not self._access_token or time.time() >= self._token_expiry:
-            await self._refresh_token()
+        self.stats["requests"] += 1
+        lock = self._get_lock()
+
+        if not self._is_valid():
+            # Token absent ou expiré: un seul renouvellement, les appelants concurrents l'attendent
+            async with lock:
+                if not self._is_valid():
+                    await self._renew()
+        elif time.time() >= self._refresh_at:
+            self._schedule_refresh()
         return self._access_token
 
+    def _schedule_refresh(self) -> None:
+        """Renouvellement anticipé en arrière-plan, un seul à la fois; le token courant reste servi"""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if time.time() < self._refresh_not_before:
+            return
+        self.stats["background_refreshes"] += 1
+
+        async def refresh() -> None:
+            try:
+                async with self._get_lock():
+                    # Déjà renouvelé par un appelant qui attendait le verrou
+                    if time.time() < self._refresh_at:
+                        return
+                    await self._renew()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._refresh_not_before = time.time() + self.TOKEN_REFRESH_RETRY
+                logger.warning(f"Échec du renouvellement anticipé du token SoundCloud: {e}")
+
+        self._refresh_task = asyncio.create_task(refresh())
+
+    async def _renew(self) -> None:
+        """
+        Renouvelle le token sous le verrou du store: le token qu'un autre processus vient d'obtenir
+        est adopté plutôt que d'en demander un nouveau. Sans verrou dans le délai imparti, le token
+        est demandé quand même (au pire un token de plus)
+        """
+        store = self.store
+        locked = await self._acquire_store_lock()
+        try:
+            if self._adopt(await self._load_stored()):
+                return
+            await self._refresh_token()
+            try:
+                await asyncio.to_thread(store.save, StoredToken(self._access_token, self._token_expiry))
+            except Exception as e:
+                self.stats["store_errors"] += 1
+                logger.warning(f"Enregistrement du token SoundCloud partagé impossible: {e}")
+        finally:
+            if locked:
+                store.release()
+
+    async def _acquire_store_lock(self) -> bool:
+        # Sondage non bloquant: une attente annulée ne laisse jamais un verrou orphelin
+        deadline = time.time() + self.STORE_LOCK_TIMEOUT
+        while True:
+            try:
+                if self.store.try_acquire():
+                    return True
+            except Exception as e:
+                self.stats["store_errors"] += 1
+                logger.warning(f"Verrou du token SoundCloud partagé indisponible: {e}")
+                return False
+            if time.time() >= deadline:
+                logger.warning("Verrou du token SoundCloud partagé toujours détenu: renouvellement sans verrou")
+                return False
+            await asyncio.sleep(self.STORE_LOCK_POLL)
+
+    async def _load_stored(self) -> Optional[StoredToken]:
+        try:
+            return await asyncio.to_thread(self.store.load)
+        except Exception as e:
+            self.stats["store_errors"] += 1
+            logger.warning(f"Lecture du token SoundCloud partagé impossible: {e}")
+            return None
+
+    def _adopt(self, stored: Optional[StoredToken]) -> bool:
+        """Adopte le token du store s'il expire après le token courant et n'a pas été refusé"""
+        if stored is None or stored.access_token == self._rejected_token:
+            return False
+        if stored.expires_at <= max(time.time(), self._token_expiry):
+            return False
+        self._set_token(stored.access_token, stored.expires_at)
+        self.stats["adopted"] += 1
+        logger.info("Token d'accès SoundCloud partagé réutilisé")
+        return True
+
+    def _set_token(self, access_token: str, expires_at: float) -> None:
+        # Le token reste utilisable jusqu'à son expiration; il est renouvelé en arrière-plan
+        # dès l'entrée dans la marge de sécurité
+        self._access_token = access_token
+        self._token_expiry = expires_at
+        self._refresh_at = expires_at - self.TOKEN_EXPIRY_BUFFER
+        self._refresh_not_before = 0
+
+    def invalidate_token(self, token: Optional[str]) -> None:
+        """
+        Token refusé par l'API (401): le prochain appel en obtient un nouveau. Sans effet si le token
+        a déjà été renouvelé, pour que les requêtes concurrentes refusées ne renouvellent qu'une fois
+        """
+        if token and token == self._access_token:
+            self.stats["invalidations"] += 1
+            logger.warning("Token d'accès SoundCloud refusé, il sera renouvelé")
+            self._rejected_token = token
+            self._access_token = None
+            self._token_expiry = 0
+            self._refresh_at = 0
+
+    async def close(self) -> None:
+        """Annule le renouvellement anticipé en cours (arrêt de l'application)"""
+        task = self._refresh_task
+        self._refresh_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {**self.stats, "store": self.store.name, "token_valid": self._is_valid(),
+                "expires_in": max(0, round(self._token_expiry - time.time())) if self._access_token else 0}
+
     async def _refresh_token(self) -> None:
         if not settings.SOUNDCLOUD_CLIENT_ID or not settings.SOUNDCLOUD_CLIENT_SECRET:
             raise AuthenticationException(
@@ -40,49 +205,50 @@ class SoundcloudAuthService:
                 "client_secret": settings.SOUNDCLOUD_CLIENT_SECRET,
             }
 
-            # Effectuer la requête pour obtenir le token
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(
-                    self.TOKEN_URL,
-                    data=data,
-                    headers={
-                        "Content-Type": "application/x-www-form-urlencoded",
-                        "Accept": "application/json"
-                    }
-                )
+            # Effectuer la requête pour obtenir le token (client partagé pour api.soundcloud.com)
+            self.stats["refreshes"] += 1
+            client = http_client.get_client(self.TOKEN_URL)
+            response = await client.post(
+                self.TOKEN_URL,
+                data=data,
+                headers={
+                    "Content-Type": "application/x-www-form-urlencoded",
+                    "Accept": "application/json"
+                }
+            )
+
+            # Vérifier la réponse
+            if response.status_code != 200:
+                error_details = {"status_code": response.status_code}
+                try:
+                    error_details["response_body"] = response.json()
+                except Exception:
+                    error_details["response_text"] = response.text
 
-                # Vérifier la réponse
-                if response.status_code != 200:
-                    error_details = {"status_code": response.status_code}
-                    try:
-                        error_details["response_body"] = response.json()
-                    except Exception:
-                        error_details["response_text"] = response.text
-
-                    raise AuthenticationException(
-                        message=f"Échec de l'authentification SoundCloud: {response.status_code}",
-                        details=error_details
-                    )
-
-                # Extraire les données du token
-                token_data = response.json()
-                self._access_token = token_data.get("access_token")
-                expires_in = token_data.get("expires_in", 3600)  # Par défaut 1h
-
-                # Calculer l'expiration avec une marge de sécurité
-                self._token_expiry = time.time() + expires_in - self.TOKEN_EXPIRY_BUFFER
-
-                logger.info(
-                    "Token d'accès SoundCloud obtenu avec succès (expire dans %s secondes)",
-                    expires_in
+                raise AuthenticationException(
+                    message=f"Échec de l'authentification SoundCloud: {response.status_code}",
+                    details=error_details
                 )
 
+            # Extraire les données du token
+            token_data = response.json()
+            expires_in = token_data.get("expires_in", 3600)  # Par défaut 1h
+
+            self._set_token(token_data.get("access_token"), time.time() + expires_in)
+
+            logger.info(
+                "Token d'accès SoundCloud obtenu avec succès (expire dans %s secondes)",
+                expires_in
+            )
+
         except httpx.RequestError as e:
+            self.stats["refresh_errors"] += 1
             raise NetworkException(
                 message=f"Erreur de réseau lors de l'authentification SoundCloud: {str(e)}",
                 details={"error": str(e), "error_type": "network"}
             )
         except Exception as e:
+            self.stats["refresh_errors"] += 1
             raise AuthenticationException(
                 message=f"Erreur inattendue lors de l'authentification SoundCloud: {str(e)}",
                 details={"error": str(e)}
@@ -102,3 +268,5 @@ class SoundcloudAuthService:
 
 # Instance singleton du service d'authentification
 soundcloud_auth = SoundcloudAuthService()
+
+metrics.register("soundcloud_auth", soundcloud_auth.get_metrics)
@@ -0,0 +1,224 @@
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from typing import Optional
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # pragma: no cover - Windows
+    FCNTL_AVAILABLE = False
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Durée maximale de détention du verrou de renouvellement (SQLite): un processus arrêté en plein
+# renouvellement ne bloque pas les autres au-delà
+LOCK_LEASE_SECONDS = 30.0
+
+
+class StoredToken:
+    """Token d'accès partagé et son instant d'expiration (epoch)"""
+
+    def __init__(self, access_token: str, expires_at: float):
+        self.access_token = access_token
+        self.expires_at = expires_at
+
+    def to_json(self) -> str:
+        return json.dumps({"access_token": self.access_token, "expires_at": self.expires_at})
+
+    @classmethod
+    def from_json(cls, raw: str) -> Optional["StoredToken"]:
+        try:
+            data = json.loads(raw)
+            return cls(str(data["access_token"]), float(data["expires_at"]))
+        except (TypeError, ValueError, KeyError):
+            return None
+
+
+class MemoryTokenStore:
+    """Token propre au processus: aucun partage entre workers ni entre redémarrages"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._token: Optional[StoredToken] = None
+
+    def load(self) -> Optional[StoredToken]:
+        return self._token
+
+    def save(self, token: StoredToken) -> None:
+        self._token = token
+
+    def try_acquire(self) -> bool:
+        return True
+
+    def release(self) -> None:
+        pass
+
+    def clear(self) -> None:
+        self._token = None
+
+
+class FileTokenStore:
+    """
+    Token dans un fichier JSON partagé par les workers et conservé entre redémarrages. Écriture
+    atomique (fichier temporaire puis rename); le renouvellement est protégé par un verrou
+    consultatif (flock) sur un fichier voisin, libéré par le système si le processus s'arrête
+    """
+
+    name = "file"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self._lock_fd: Optional[int] = None
+
+    def _ensure_directory(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> Optional[StoredToken]:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                return StoredToken.from_json(file.read())
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Lecture du token SoundCloud partagé impossible ({self.path}): {e}")
+            return None
+
+    def save(self, token: StoredToken) -> None:
+        self._ensure_directory()
+        # Le token est un secret: fichier lisible par le seul propriétaire (mkstemp crée en 0600)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", prefix=".soundcloud_token.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(token.to_json())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def try_acquire(self) -> bool:
+        """Verrou de renouvellement non bloquant: False s'il est détenu par un autre processus"""
+        if not FCNTL_AVAILABLE:
+            return True
+        self._ensure_directory()
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._lock_fd is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def clear(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class SqliteTokenStore:
+    """
+    Token dans la base SQLite du cache (HTTP_CACHE_PATH), partageable par les conteneurs qui montent
+    le même volume. Le verrou de renouvellement est un bail en base, repris à son expiration
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._owner = uuid.uuid4().hex
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Ouverture paresseuse: l'import du module ne crée pas de fichier
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("CREATE TABLE IF NOT EXISTS soundcloud_token (id INTEGER PRIMARY KEY CHECK (id = 1), "
+                               "access_token TEXT, expires_at REAL, lock_owner TEXT, lock_until REAL)")
+            connection.execute("INSERT OR IGNORE INTO soundcloud_token (id, lock_until) VALUES (1, 0)")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def load(self) -> Optional[StoredToken]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT access_token, expires_at FROM soundcloud_token WHERE id = 1"
+            ).fetchone()
+        if row is None or not row[0]:
+            return None
+        return StoredToken(row[0], row[1])
+
+    def save(self, token: StoredToken) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("UPDATE soundcloud_token SET access_token = ?, expires_at = ? WHERE id = 1",
+                               (token.access_token, token.expires_at))
+            connection.commit()
+
+    def try_acquire(self) -> bool:
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute(
+                "UPDATE soundcloud_token SET lock_owner = ?, lock_until = ? "
+                "WHERE id = 1 AND (lock_owner IS NULL OR lock_until < ? OR lock_owner = ?)",
+                (self._owner, now + LOCK_LEASE_SECONDS, now, self._owner),
+            )
+            connection.commit()
+            return cursor.rowcount == 1
+
+    def release(self) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("UPDATE soundcloud_token SET lock_owner = NULL, lock_until = 0 "
+                               "WHERE id = 1 AND lock_owner = ?", (self._owner,))
+            connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            connection = self._connect()
+            connection.execute("UPDATE soundcloud_token SET access_token = NULL, expires_at = NULL WHERE id = 1")
+            connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def build_token_store():
+    """Store configuré par SOUNDCLOUD_TOKEN_STORE: file (défaut), sqlite ou memory"""
+    backend = settings.SOUNDCLOUD_TOKEN_STORE
+    if backend == "file":
+        return FileTokenStore(settings.SOUNDCLOUD_TOKEN_STORE_PATH)
+    if backend == "sqlite":
+        return SqliteTokenStore(settings.HTTP_CACHE_PATH)
+    if backend != "memory":
+        logger.warning(f"Store de token SoundCloud inconnu '{backend}': token conservé en mémoire")
+    return MemoryTokenStore()
@@ -0,0 +1,74 @@
+"""
+Benchmark: débit de parsing (pages/s) de la recherche Bandcamp, BeautifulSoup (html.parser)
+contre lxml (XPath compilées), sur la fixture de `tests/mocks/bandcamp_mocks.py` et sur une page
+synthétique proche d'une vraie page de résultats (18 résultats dans un balisage volumineux).
+Les profils produits par les deux backends sont comparés avant la mesure.
+
+    python -m benchmarks.bench_bandcamp_parsing --seconds 2
+"""
+import argparse
+import time
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from app.scrapers.bandcamp.bandcamp_lxml_parser import BandcampLxmlParser
+from app.scrapers.bandcamp.bandcamp_search_scraper import BandcampSearchScraper
+from tests.mocks.bandcamp_mocks import BANDCAMP_SEARCH_RESPONSE
+
+RESULT = """
+<li class="searchresult data-search">
+    <a class="artcont" href="https://artist-{i}.bandcamp.com?from=search">
+        <div class="art"><img src="https://f4.bcbits.com/img/{i:010d}_23.jpg"></div>
+    </a>
+    <div class="result-info">
+        <div class="itemtype">ARTIST</div>
+        <div class="heading"><a href="https://artist-{i}.bandcamp.com?from=search&amp;search_item_id={i}">Artist {i}</a></div>
+        <div class="subhead">Berlin, Germany</div>
+        <div class="genre">genre: techno</div>
+        <div class="tags data-search">tags: techno, minimal, dub techno, electronic</div>
+        <div class="itemurl"><a href="https://artist-{i}.bandcamp.com">https://artist-{i}.bandcamp.com</a></div>
+    </div>
+</li>
+"""
+
+
+def synthetic_page(results: int = 18) -> str:
+    chrome = '<div class="menubar"><a href="/discover">Discover</a><span class="icon"></span></div>' * 400
+    scripts = '<script type="text/javascript">var data = {"a": [1, 2, 3], "b": "x"};</script>' * 40
+    items = "".join(RESULT.format(i=i) for i in range(results))
+    return (f"<!DOCTYPE html><html><head>{scripts}</head><body>{chrome}"
+            f'<div class="search"><ul class="result-items">{items}</ul></div>{chrome}</body></html>')
+
+
+def _throughput(function: Callable[[], object], seconds: float) -> float:
+    pages = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        function()
+        pages += 1
+    return pages / (time.perf_counter() - start)
+
+
+def main(seconds: float) -> None:
+    scraper = BandcampSearchScraper()
+    pages = {"fixture": BANDCAMP_SEARCH_RESPONSE, "page synthétique": synthetic_page()}
+    print(f"{'page':<18}{'taille':>9}{'BeautifulSoup':>18}{'lxml':>16}{'gain':>8}")
+    for label, html in pages.items():
+        def soup() -> object:
+            return scraper._parse_search_results(BeautifulSoup(html, 'html.parser'))
+
+        def lxml() -> object:
+            return BandcampLxmlParser.parse_search_results(html)
+
+        assert [p.model_dump_json() for p in soup()] == [p.model_dump_json() for p in lxml()]
+        soup_rate = _throughput(soup, seconds)
+        lxml_rate = _throughput(lxml, seconds)
+        print(f"{label:<18}{len(html):>9}{soup_rate:>12.0f} pages/s{lxml_rate:>10.0f} pages/s"
+              f"{lxml_rate / soup_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=2, help="Durée de mesure par backend et par page")
+    main(parser.parse_args().seconds)
@@ -0,0 +1,121 @@
+"""
+Benchmark: mapping d'une recherche Beatport de 50 résultats par type d'entité vers les modèles
+Pydantic. Avant: un modèle validé par élément, URLs parsées à chaque fois. Après: champs assemblés
+en dicts, URLs normalisées en cache (normalize_url), liste validée en un appel
+(BeatportMappingUtils.extract_items). Mesure aussi model_construct, écarté car plus lent que la
+validation de pydantic-core.
+
+    python -m benchmarks.bench_beatport_mapping --trials 30
+"""
+import argparse
+import copy
+import statistics
+import timeit
+from typing import Any, Dict, List, Optional
+
+from app.models import ArtistProfile, Release, Track
+from app.models.beatport_models import BeatportEntityType
+from app.scrapers.beatport.beatport_base_scraper import extract_next_data
+from app.scrapers.beatport import beatport_mapping_utils
+from app.scrapers.beatport.beatport_mapping_utils import ENTITY_FIELDS, BeatportMappingUtils, normalize_url
+from tests.mocks.beatport_mocks import BEATPORT_SEARCH_RESPONSE
+
+ENTITY_TYPES = (BeatportEntityType.ARTIST, BeatportEntityType.TRACK, BeatportEntityType.RELEASE,
+                BeatportEntityType.LABEL)
+ITEM_EXTRACTORS = {
+    BeatportEntityType.ARTIST: BeatportMappingUtils.extract_artist,
+    BeatportEntityType.TRACK: BeatportMappingUtils.extract_track,
+    BeatportEntityType.RELEASE: BeatportMappingUtils.extract_release,
+    BeatportEntityType.LABEL: BeatportMappingUtils.extract_label,
+}
+MODELS = {BeatportEntityType.ARTIST: ArtistProfile, BeatportEntityType.TRACK: Track,
+          BeatportEntityType.RELEASE: Release, BeatportEntityType.LABEL: ArtistProfile}
+
+
+def search_items(results: int) -> Dict[BeatportEntityType, List[Dict[str, Any]]]:
+    """`results` éléments distincts par type d'entité, répliqués depuis la fixture de recherche"""
+    next_data = extract_next_data(BEATPORT_SEARCH_RESPONSE)
+    search_data = next_data["props"]["pageProps"]["dehydratedState"]["queries"][0]["state"]["data"]
+    items = {}
+    for entity_type in ENTITY_TYPES:
+        source = search_data[f"{entity_type.value}s"]["data"]
+        items[entity_type] = []
+        for index in range(results):
+            item = copy.deepcopy(source[index % len(source)])
+            item["id"] = 1_000_000 + index
+            items[entity_type].append(item)
+    return items
+
+
+def _construct(model: type, fields: Dict[str, Any]) -> Any:
+    # model_construct (sans validation) des modèles imbriqués puis du modèle, pour comparaison
+    for key in ("url", "artwork_url"):
+        fields[key] = normalize_url(fields.get(key))
+    for key in ("artists", "labels"):
+        if fields.get(key):
+            fields[key] = [ArtistProfile.model_construct(**artist) for artist in fields[key]]
+    if fields.get("label"):
+        fields["label"] = ArtistProfile.model_construct(**fields["label"])
+    return model.model_construct(**fields)
+
+
+def _raw_urls(url: Optional[str]) -> Optional[str]:
+    return url
+
+
+def main(rounds: int, results: int, trials: int) -> None:
+    items = search_items(results)
+    total = results * len(ENTITY_TYPES)
+
+    def item_by_item():
+        return {entity_type: [ITEM_EXTRACTORS[entity_type](data) for data in items[entity_type]]
+                for entity_type in ENTITY_TYPES}
+
+    def list_once():
+        return {entity_type: BeatportMappingUtils.extract_items(entity_type, items[entity_type])
+                for entity_type in ENTITY_TYPES}
+
+    def list_once_cold_cache():
+        normalize_url.cache_clear()
+        return list_once()
+
+    def construct():
+        return {entity_type: [_construct(MODELS[entity_type], ENTITY_FIELDS[entity_type](data))
+                              for data in items[entity_type]]
+                for entity_type in ENTITY_TYPES}
+
+    # (libellé, fonction, URLs normalisées en cache ou chaînes brutes validées à chaque fois)
+    modes = [
+        ("avant: validation par élément", item_by_item, False),
+        ("validation par liste", list_once, False),
+        ("après: liste + cache d'URLs froid", list_once_cold_cache, True),
+        ("après: liste + cache d'URLs chaud", list_once, True),
+        ("model_construct (écarté)", construct, True),
+    ]
+
+    print(f"{results} résultats par type d'entité ({total} éléments)")
+    reference = None
+    for label, mode, cached_urls in modes:
+        beatport_mapping_utils.normalize_url = normalize_url if cached_urls else _raw_urls
+        output = {entity_type: [model.model_dump_json() for model in models] for entity_type, models in mode().items()}
+        reference = reference or output
+        assert output == reference, f"{label}: résultat différent"
+
+    # Modes entrelacés: une dérive de la machine pendant la mesure les touche tous
+    timings: Dict[str, List[float]] = {label: [] for label, _, _ in modes}
+    for _ in range(trials):
+        for label, mode, cached_urls in modes:
+            beatport_mapping_utils.normalize_url = normalize_url if cached_urls else _raw_urls
+            timings[label].append(timeit.timeit(mode, number=rounds) / rounds)
+    for label, _, _ in modes:
+        print(f"{label:<36}{total / statistics.median(timings[label]):>10.0f} éléments/s")
+    beatport_mapping_utils.normalize_url = normalize_url
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20, help="Mappings par mesure")
+    parser.add_argument("--trials", type=int, default=30, help="Mesures par mode (médiane)")
+    parser.add_argument("--results", type=int, default=50, help="Résultats par type d'entité")
+    args = parser.parse_args()
+    main(args.rounds, args.results, args.trials)
@@ -0,0 +1,160 @@
+"""
+Benchmark: page HTML Beatport complète contre route JSON Next.js (/_next/data/<buildId>/...json).
+
+Un serveur local sert les deux représentations d'une recherche construite à partir de la fixture
+`tests/mocks/beatport_mocks.py` (résultats répliqués, balisage de page ajouté autour du
+__NEXT_DATA__ comme dans le rendu serveur) avec un débit limité. On mesure les octets reçus,
+la latence p50/p99 de `fetch_next_data` et la part passée à extraire/décoder les données.
+
+    python -m benchmarks.bench_beatport_next_data --requests 50 --results 25
+"""
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+from app.core.config import settings
+from app.scrapers.beatport import beatport_build_id
+from app.scrapers.beatport.beatport_base_scraper import extract_next_data
+from app.scrapers.beatport.beatport_search_scraper import BeatportSearchScraper
+from app.services import http_client
+from tests.mocks.beatport_mocks import BEATPORT_SEARCH_RESPONSE
+
+BUILD_ID = "bench-build"
+
+
+def build_fixtures(results: int, chrome_kb: int) -> Tuple[bytes, bytes]:
+    """Retourne (page HTML, réponse de la route JSON) pour la même recherche"""
+    next_data = extract_next_data(BEATPORT_SEARCH_RESPONSE)
+    search_data = next_data["props"]["pageProps"]["dehydratedState"]["queries"][0]["state"]["data"]
+    for entity in ("artists", "tracks", "releases", "labels"):
+        items = search_data.get(entity, {}).get("data", [])
+        if items:
+            search_data[entity]["data"] = [copy.deepcopy(items[i % len(items)]) for i in range(results)]
+    next_data.update({"buildId": BUILD_ID, "page": "/search", "query": {"q": "bench"}})
+
+    # Balisage rendu côté serveur: une carte par résultat, plus l'en-tête et les scripts de la page
+    cards = "".join(
+        f'<div class="track-card"><a href="/track/item/{i}"><img src="https://geo-media.beatport.com/'
+        f'image_size/95x95/{i}.jpg" alt="cover"/></a><span class="title">Item {i}</span></div>'
+        for i in range(results * 4)
+    )
+    chrome = '<link rel="preload" href="/_next/static/chunks/chunk.js" as="script"/>' * (chrome_kb * 1024 // 70)
+    html = (
+        f"<!DOCTYPE html><html><head>{chrome}</head><body><div id=\"__next\">{cards}</div>"
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script></body></html>'
+    )
+    data_route = json.dumps({"pageProps": next_data["props"]["pageProps"], "__N_SSP": True})
+    return html.encode(), data_route.encode()
+
+
+class StandInServer:
+    """Serveur HTTP/1.1 keep-alive qui sert la page ou la route JSON à débit limité"""
+
+    def __init__(self, html: bytes, data_route: bytes, bandwidth: float):
+        self.bodies = {"html": html, "json": data_route}
+        self.bandwidth = bandwidth
+        self.bytes_sent: Dict[str, int] = {"html": 0, "json": 0}
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                path = request.split(b" ", 2)[1]
+                kind = "json" if path.startswith(b"/_next/data/") else "html"
+                body = self.bodies[kind]
+                content_type = b"application/json" if kind == "json" else b"text/html; charset=utf-8"
+                # Temps de transfert simulé proportionnel à la taille de la réponse
+                await asyncio.sleep(len(body) / self.bandwidth)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: " + content_type + b"\r\n"
+                    b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                    b"Connection: keep-alive\r\n\r\n" + body
+                )
+                self.bytes_sent[kind] += len(body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/search?q=bench"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def _run(scraper: BeatportSearchScraper, url: str, total: int) -> List[float]:
+    latencies: List[float] = []
+    for _ in range(total):
+        start = time.perf_counter()
+        status_code, next_data = await scraper.fetch_next_data(url)
+        assert status_code == 200 and next_data["props"]["pageProps"]["dehydratedState"]
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _parse_time(scraper: BeatportSearchScraper, html: bytes, data_route: bytes, rounds: int = 50) -> Tuple[float, float]:
+    text = html.decode()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        scraper._extract_next_data(text)
+    html_ms = (time.perf_counter() - start) * 1000 / rounds
+    start = time.perf_counter()
+    for _ in range(rounds):
+        json.loads(data_route)
+    json_ms = (time.perf_counter() - start) * 1000 / rounds
+    return html_ms, json_ms
+
+
+def _report(label: str, sent: int, total: int, latencies: List[float], parse_ms: float) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{label:<22} octets/req={sent // total:<9} p50={quantiles[49]:7.2f} ms  "
+          f"p99={quantiles[98]:7.2f} ms  extraction={parse_ms:6.2f} ms")
+
+
+async def main(total: int, results: int, chrome_kb: int, bandwidth: float) -> None:
+    # Mesure du seul transport: pas de cache HTTP ni de limitation de débit sur le serveur local
+    settings.HTTP_CACHE_ENABLED = False
+    settings.RATE_LIMIT_DEFAULT_RATE = 1_000_000
+    settings.RATE_LIMIT_DEFAULT_BURST = 1_000_000
+
+    html, data_route = build_fixtures(results, chrome_kb)
+    server = StandInServer(html, data_route, bandwidth)
+    url = await server.start()
+    scraper = BeatportSearchScraper(user_agent="techno-scraper-bench")
+    html_ms, json_ms = _parse_time(scraper, html, data_route)
+
+    # Avant: page HTML complète à chaque requête
+    settings.BEATPORT_NEXT_DATA_ENABLED = False
+    latencies = await _run(scraper, url, total)
+    _report("page HTML", server.bytes_sent["html"], total, latencies, html_ms)
+
+    # Après: buildId connu, route JSON directe
+    settings.BEATPORT_NEXT_DATA_ENABLED = True
+    beatport_build_id.remember({"buildId": BUILD_ID})
+    latencies = await _run(scraper, url, total)
+    _report("route JSON Next.js", server.bytes_sent["json"], total, latencies, json_ms)
+
+    await http_client.close()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--results", type=int, default=25, help="Résultats par type d'entité")
+    parser.add_argument("--chrome-kb", type=int, default=150, help="Balisage de page hors __NEXT_DATA__ (Ko)")
+    parser.add_argument("--bandwidth", type=float, default=5_000_000, help="Débit simulé (octets/s)")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.requests, args.results, args.chrome_kb, args.bandwidth))
@@ -0,0 +1,63 @@
+"""
+Benchmark: extraction d'une page de recherche Beatport (4 types d'entité x 150 éléments bruts).
+Avant: tous les éléments mappés en modèles Pydantic puis découpés par PaginationService.paginate_results.
+Après: seuls les éléments bruts de la page sont mappés (PaginationService.paginate_iter), le nombre
+total vient des données brutes.
+
+    python -m benchmarks.bench_beatport_search_pagination --results 150 500
+"""
+import argparse
+import statistics
+import timeit
+from typing import Any, Dict, List
+
+from app.models import BeatportSearchResult, LimitEnum
+from app.scrapers.beatport.beatport_mapping_utils import BeatportMappingUtils
+from app.scrapers.beatport.beatport_search_scraper import BeatportSearchScraper
+from app.services import PaginationService
+from benchmarks.bench_beatport_mapping import ENTITY_TYPES, search_items
+
+
+def map_all_then_slice(items: Dict[Any, List[Dict[str, Any]]], page: int, limit: LimitEnum) -> BeatportSearchResult:
+    """Ancien chemin: mapping de tous les éléments, pagination des listes de modèles"""
+    pages = {entity_type: PaginationService.paginate_results(BeatportMappingUtils.extract_items(entity_type, data),
+                                                             page, limit)
+             for entity_type, data in items.items()}
+    return BeatportSearchResult(total_results=sum(len(models) for models in pages.values()), page=page,
+                                limit=limit, **{f"{entity_type.value}s": models for entity_type, models in pages.items()})
+
+
+def main(counts: List[int], page: int, rounds: int, trials: int) -> None:
+    scraper = BeatportSearchScraper()
+    limit = LimitEnum.TEN
+    for count in counts:
+        items = search_items(count)
+        search_data = {f"{entity_type.value}s": {"data": items[entity_type]} for entity_type in ENTITY_TYPES}
+
+        modes = [
+            ("avant: tout mapper puis découper", lambda: map_all_then_slice(items, page, limit)),
+            ("après: mapper la page seule", lambda: scraper._extract_search_results(search_data, page, limit)),
+        ]
+        before, after = (mode() for _, mode in modes)
+        assert before.model_dump(exclude={"total_results"}) == after.model_dump(exclude={"total_results"})
+
+        # Modes entrelacés: une dérive de la machine pendant la mesure les touche tous
+        timings: Dict[str, List[float]] = {label: [] for label, _ in modes}
+        for _ in range(trials):
+            for label, mode in modes:
+                timings[label].append(timeit.timeit(mode, number=rounds) / rounds)
+
+        print(f"{len(ENTITY_TYPES)} types x {count} éléments bruts, page {page} de {limit.value}")
+        print(f"  total_results: avant {before.total_results} (listes découpées), après {after.total_results} (brut)")
+        for label, _ in modes:
+            print(f"  {label:<36}{statistics.median(timings[label]) * 1000:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, nargs="+", default=[150, 500], help="Éléments bruts par type d'entité")
+    parser.add_argument("--page", type=int, default=1, help="Page demandée")
+    parser.add_argument("--rounds", type=int, default=20, help="Extractions par mesure")
+    parser.add_argument("--trials", type=int, default=15, help="Mesures par mode (médiane)")
+    args = parser.parse_args()
+    main(args.results, args.page, args.rounds, args.trials)
@@ -0,0 +1,128 @@
+"""
+Benchmark: page HTML Beatport lue en entier (buffered) contre lecture en streaming arrêtée
+à la fin du script __NEXT_DATA__.
+
+Chaque mode tourne dans un sous-processus pour mesurer son pic de RSS (ru_maxrss) en plus
+du pic d'allocations Python (tracemalloc) et du temps jusqu'au résultat. Le serveur local
+envoie la page par blocs à débit limité; `--next-data-at` place le __NEXT_DATA__ dans la page
+(1.0 = tout à la fin: le streaming ne peut alors rien économiser).
+
+    python -m benchmarks.bench_beatport_streaming --page-mb 4 --next-data-at 0.5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from app.core.config import settings
+from app.scrapers.beatport import beatport_build_id
+from app.scrapers.beatport.beatport_base_scraper import extract_next_data
+from app.scrapers.beatport.beatport_search_scraper import BeatportSearchScraper
+from app.services import http_client
+from tests.mocks.beatport_mocks import BEATPORT_SEARCH_RESPONSE
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_page(page_bytes: int, next_data_at: float) -> bytes:
+    next_data = json.dumps(extract_next_data(BEATPORT_SEARCH_RESPONSE))
+    script = f'<script id="__NEXT_DATA__" type="application/json">{next_data}</script>'
+    filler = '<div class="card"><a href="/track/x/1"><img src="/img.jpg"/></a>Titre</div>'
+    total_filler = max(0, page_bytes - len(script)) // len(filler)
+    before = int(total_filler * next_data_at)
+    return (f"<!DOCTYPE html><html><body>{filler * before}{script}"
+            f"{filler * (total_filler - before)}</body></html>").encode()
+
+
+class StandInServer:
+    """Serveur HTTP/1.1 qui envoie la page par blocs à débit limité"""
+
+    def __init__(self, page: bytes, bandwidth: float):
+        self.page = page
+        self.bandwidth = bandwidth
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                             b"Content-Length: " + str(len(self.page)).encode() + b"\r\n\r\n")
+                for start in range(0, len(self.page), CHUNK_SIZE):
+                    await asyncio.sleep(CHUNK_SIZE / self.bandwidth)
+                    writer.write(self.page[start:start + CHUNK_SIZE])
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Le client en streaming ferme la connexion dès qu'il a ce qu'il lui faut; un envoi
+            # encore en cours est annulé à l'arrêt du benchmark
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/search?q=bench"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def child(mode: str, total: int, page_mb: float, next_data_at: float, bandwidth: float) -> None:
+    settings.HTTP_CACHE_ENABLED = False
+    settings.RATE_LIMIT_DEFAULT_RATE = 1_000_000
+    settings.RATE_LIMIT_DEFAULT_BURST = 1_000_000
+    settings.BEATPORT_NEXT_DATA_ENABLED = False
+    settings.BEATPORT_STREAM_ENABLED = mode == "streaming"
+
+    server = StandInServer(build_page(int(page_mb * 1024 * 1024), next_data_at), bandwidth)
+    url = await server.start()
+    scraper = BeatportSearchScraper(user_agent="techno-scraper-bench")
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    latencies = []
+    for _ in range(total):
+        start = time.perf_counter()
+        status_code, next_data = await scraper.fetch_next_data(url)
+        assert status_code == 200 and next_data["props"]["pageProps"]
+        latencies.append((time.perf_counter() - start) * 1000)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    await http_client.close()
+    await server.stop()
+    print(f"{mode:<10} p50={statistics.median(latencies):8.2f} ms  max={max(latencies):8.2f} ms  "
+          f"pic Python={traced_peak / 1024 / 1024:6.2f} Mo  pic RSS +{(peak_rss - baseline_rss) / 1024:6.2f} Mo  "
+          f"(html_requests={beatport_build_id.stats['html_requests']})")
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"page {args.page_mb} Mo, __NEXT_DATA__ à {args.next_data_at:.0%}, débit {args.bandwidth / 1e6:.0f} Mo/s")
+    for mode in ("buffered", "streaming"):
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_beatport_streaming", "--child", mode,
+                        "--requests", str(args.requests), "--page-mb", str(args.page_mb),
+                        "--next-data-at", str(args.next_data_at), "--bandwidth", str(args.bandwidth)], check=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--page-mb", type=float, default=4)
+    parser.add_argument("--next-data-at", type=float, default=0.5, help="Position du __NEXT_DATA__ (0 à 1)")
+    parser.add_argument("--bandwidth", type=float, default=50_000_000, help="Débit simulé (octets/s)")
+    parser.add_argument("--child", choices=("buffered", "streaming"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    if args.child:
+        asyncio.run(child(args.child, args.requests, args.page_mb, args.next_data_at, args.bandwidth))
+    else:
+        main(args)
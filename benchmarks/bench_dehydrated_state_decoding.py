@@ -0,0 +1,80 @@
+"""
+Benchmark: décodage complet du __NEXT_DATA__ Beatport contre décodage incrémental (ijson) de la
+seule query utile du dehydratedState.
+
+Mesure par page le temps de décodage et le pic d'allocations Python (tracemalloc) sur les
+fixtures de `tests/mocks/beatport_mocks.py` et sur une page synthétique où la query utile est
+précédée de queries volumineuses (navigation, traductions, recommandations).
+
+    python -m benchmarks.bench_dehydrated_state_decoding --rounds 50
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from app.scrapers.beatport import beatport_base_scraper
+from app.scrapers.beatport.beatport_base_scraper import (HTML_QUERIES_PREFIX, extract_next_data, next_data_bounds,
+                                                       select_dehydrated_query)
+from app.scrapers.beatport.beatport_releases_scraper import BeatportReleasesScraper
+from app.scrapers.beatport.beatport_search_scraper import BeatportSearchScraper
+from tests.mocks.beatport_mocks import (BEATPORT_ARTIST_RELEASES_RESPONSE, BEATPORT_LABEL_RELEASES_RESPONSE,
+                                        BEATPORT_SEARCH_RESPONSE)
+
+
+def synthetic_page(extra_queries: int = 6, items: int = 2000) -> str:
+    """Page de releases dont la query utile arrive après des queries sans rapport"""
+    next_data = extract_next_data(BEATPORT_LABEL_RELEASES_RESPONSE)
+    queries = next_data["props"]["pageProps"]["dehydratedState"]["queries"]
+    for index in range(extra_queries):
+        entries = [{"id": i, "name": f"Entrée {i}", "url": f"/genre/x/{i}", "children": [{"id": i, "name": "y"}] * 3}
+                   for i in range(items)]
+        queries.insert(0, {"queryKey": [f"navigation-{index}"], "state": {"data": {"items": entries}}})
+    next_data["props"]["pageProps"]["translations"] = {f"key.{i}": f"Traduction {i}" for i in range(items * 5)}
+    return f'<html><script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script></html>'
+
+
+def full_decode(content: bytes, matcher: Callable[[Dict[str, Any]], bool]) -> Any:
+    queries = extract_next_data(content)["props"]["pageProps"]["dehydratedState"]["queries"]
+    return next(query for query in queries if matcher(query))
+
+
+def lazy_decode(content: bytes, matcher: Callable[[Dict[str, Any]], bool]) -> Any:
+    start, end = next_data_bounds(content)
+    return select_dehydrated_query(memoryview(content)[start:end], HTML_QUERIES_PREFIX, matcher)
+
+
+def _measure(function: Callable[[], Any], rounds: int) -> str:
+    milliseconds = min(timeit.repeat(function, number=rounds, repeat=3)) * 1000 / rounds
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return f"{milliseconds:9.3f} ms {peak / 1024:9.0f} Ko"
+
+
+def main(rounds: int) -> None:
+    pages = {
+        "recherche (fixture)": (BEATPORT_SEARCH_RESPONSE, BeatportSearchScraper._is_search_query),
+        "releases artiste": (BEATPORT_ARTIST_RELEASES_RESPONSE, BeatportReleasesScraper._is_releases_query),
+        "releases label": (BEATPORT_LABEL_RELEASES_RESPONSE, BeatportReleasesScraper._is_releases_query),
+        "page synthétique": (synthetic_page(), BeatportReleasesScraper._is_releases_query),
+    }
+    print(f"{'page':<22}{'taille':>10}  {'json complet':>22}  {'orjson complet':>22}  {'ijson query':>22}")
+    for label, (html, matcher) in pages.items():
+        content = html.encode()
+        assert full_decode(content, matcher) == lazy_decode(content, matcher)
+
+        beatport_base_scraper.ORJSON_AVAILABLE = False
+        stdlib = _measure(lambda: full_decode(content, matcher), rounds)
+        beatport_base_scraper.ORJSON_AVAILABLE = True
+        fast = _measure(lambda: full_decode(content, matcher), rounds)
+        lazy = _measure(lambda: lazy_decode(content, matcher), rounds)
+        print(f"{label:<22}{len(content):>10}  {stdlib:>22}  {fast:>22}  {lazy:>22}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50)
+    main(parser.parse_args().rounds)
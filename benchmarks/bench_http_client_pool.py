@@ -0,0 +1,111 @@
+"""
+Benchmark: un client httpx par requête (ancien fetch) contre le client partagé par hôte.
+
+Un serveur HTTP/1.1 local compte les connexions TCP acceptées (= handshakes) et répond
+avec un petit délai fixe. On mesure le nombre de handshakes et les latences p50/p99.
+
+    python -m benchmarks.bench_http_client_pool --requests 200 --concurrency 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from app.services.http_cache_service import HttpCacheService, MemoryCacheStore
+from app.services.http_client_service import HttpClientService
+
+RESPONSE_BODY = b'{"kind": "user", "id": 1}'
+
+
+class StandInServer:
+    """Serveur HTTP/1.1 minimal avec keep-alive qui compte les connexions"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.connections = 0
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                if not request:
+                    break
+                await asyncio.sleep(self.delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(RESPONSE_BODY)).encode() + b"\r\n"
+                    b"Connection: keep-alive\r\n\r\n" + RESPONSE_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/users/1"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def _run(fetch, url: str, total: int, concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await fetch(url)
+            assert response.status_code == 200
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+async def fetch_per_request_client(url: str) -> httpx.Response:
+    async with httpx.AsyncClient(timeout=30) as client:
+        return await client.get(url)
+
+
+def _report(label: str, connections: int, latencies: List[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{label:<28} handshakes={connections:<5} p50={quantiles[49]:7.2f} ms  p99={quantiles[98]:7.2f} ms")
+
+
+async def main(total: int, concurrency: int, delay: float) -> None:
+    # Avant: un client (et donc une connexion) par requête
+    server = StandInServer(delay)
+    url = await server.start()
+    latencies = await _run(fetch_per_request_client, url, total, concurrency)
+    _report("client par requête", server.connections, latencies)
+    await server.stop()
+
+    # Après: client partagé par hôte avec keep-alive. On appelle directement le client partagé:
+    # request() ajoute cache, fusion des requêtes et limites de débit, qui fausseraient la mesure du pool
+    server = StandInServer(delay)
+    url = await server.start()
+    service = HttpClientService(cache=HttpCacheService(MemoryCacheStore(0)))
+    latencies = await _run(lambda u: service.get_client(u).get(u), url, total, concurrency)
+    _report("client partagé (pool)", server.connections, latencies)
+    await service.close()
+    await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.002, help="Délai de réponse du serveur (s)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.delay))
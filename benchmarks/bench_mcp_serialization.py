@@ -0,0 +1,82 @@
+"""
+Benchmark: sérialisation de la réponse de beatport_get_label_releases pour de longues listes de
+releases. Avant: json.loads(model_dump_json()) dans l'outil puis json.dumps(indent=2) dans call_tool
+(trois passes, JSON indenté). Après: serialize_tool_result, une passe pydantic-core vers du JSON
+compact. Mesure les octets UTF-8 envoyés et le temps CPU par appel.
+
+    python -m benchmarks.bench_mcp_serialization --releases 50 500 5000
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from app.mcp.serialization import serialize_tool_result
+from app.models.beatport_models import BeatportReleasesResult
+from app.scrapers.beatport.beatport_base_scraper import extract_next_data
+from app.scrapers.beatport.beatport_releases_scraper import BeatportReleasesScraper
+from tests.mocks.beatport_mocks import BEATPORT_LABEL_RELEASES_RESPONSE
+
+
+def label_releases(count: int) -> BeatportReleasesResult:
+    """Résultat de `count` releases distinctes, répliquées depuis la fixture de releases de label"""
+    result = BeatportReleasesScraper()._extract_releases_and_facets(
+        extract_next_data(BEATPORT_LABEL_RELEASES_RESPONSE))
+    source = result.releases
+    releases = [source[index % len(source)].model_copy(update={"id": 1_000_000 + index})
+                for index in range(count)]
+    return result.model_copy(update={"releases": releases})
+
+
+def before(result: BeatportReleasesResult) -> str:
+    return json.dumps(json.loads(result.model_dump_json()), indent=2, ensure_ascii=False)
+
+
+def after(result: BeatportReleasesResult) -> str:
+    return serialize_tool_result(result).decode()
+
+
+def after_pretty(result: BeatportReleasesResult) -> str:
+    return serialize_tool_result(result, pretty=True).decode()
+
+
+def _cpu_per_call(function: Callable[[BeatportReleasesResult], str], result: BeatportReleasesResult,
+                  rounds: int) -> float:
+    start = time.process_time()
+    for _ in range(rounds):
+        function(result)
+    return (time.process_time() - start) / rounds
+
+
+def main(counts: List[int], rounds: int, trials: int) -> None:
+    modes = [
+        ("avant: 3 passes, indenté", before),
+        ("après: 1 passe, compact", after),
+        ("après: 1 passe, MCP_PRETTY_JSON", after_pretty),
+    ]
+    for count in counts:
+        result = label_releases(count)
+        reference = json.loads(before(result))
+        for label, mode in modes:
+            assert json.loads(mode(result)) == reference, f"{label}: résultat différent"
+
+        # Modes entrelacés: une dérive de la machine pendant la mesure les touche tous
+        timings: Dict[str, List[float]] = {label: [] for label, _ in modes}
+        for _ in range(trials):
+            for label, mode in modes:
+                timings[label].append(_cpu_per_call(mode, result, max(1, rounds // count)))
+
+        print(f"{count} releases")
+        for label, mode in modes:
+            size = len(mode(result).encode())
+            print(f"  {label:<34}{size / 1024:>10.1f} Ko{statistics.median(timings[label]) * 1000:>10.2f} ms CPU")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--releases", type=int, nargs="+", default=[50, 500, 5000], help="Tailles de liste")
+    parser.add_argument("--rounds", type=int, default=5000, help="Releases sérialisées par mesure")
+    parser.add_argument("--trials", type=int, default=15, help="Mesures par mode (médiane)")
+    args = parser.parse_args()
+    main(args.releases, args.rounds, args.trials)
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark de l'extraction du __NEXT_DATA__ Beatport.
+
+Avant: `response.text` (décodage de toute la page) + regex DOTALL + `json.loads` du segment.
+Après: recherche des balises dans les octets bruts, décodage du seul segment JSON (orjson si
+installé, sinon json). Mesuré sur les fixtures de `tests/mocks/beatport_mocks.py` et sur une
+page synthétique d'environ 2 Mo (balisage volumineux autour d'un __NEXT_DATA__ conséquent).
+
+    python -m benchmarks.bench_next_data_extractor --rounds 200
+"""
+import argparse
+import json
+import re
+import timeit
+from typing import Callable, Dict
+
+import httpx
+
+from app.scrapers.beatport import beatport_base_scraper
+from app.scrapers.beatport.beatport_base_scraper import extract_next_data
+from tests.mocks.beatport_mocks import (BEATPORT_ARTIST_RELEASES_RESPONSE, BEATPORT_LABEL_RELEASES_RESPONSE,
+                                        BEATPORT_SEARCH_RESPONSE)
+
+LEGACY_PATTERN = r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>'
+
+
+def legacy_extract(response: httpx.Response) -> Dict:
+    match = re.search(LEGACY_PATTERN, response.text, re.DOTALL)
+    return json.loads(match.group(1)) if match else {}
+
+
+def synthetic_page(target_bytes: int = 2 * 1024 * 1024) -> str:
+    """Page d'environ 2 Mo: un tiers de __NEXT_DATA__, le reste en balisage rendu côté serveur"""
+    release = extract_next_data(BEATPORT_ARTIST_RELEASES_RESPONSE)
+    query = release["props"]["pageProps"]["dehydratedState"]["queries"][0]
+    results = query["state"]["data"]["results"]
+    while len(json.dumps(release)) < target_bytes // 3:
+        results.extend(results[:50])
+    markup = '<div class="release-card"><a href="/release/x/1"><img src="/img.jpg"/></a>Titre é</div>'
+    body = markup * ((target_bytes - len(json.dumps(release))) // len(markup))
+    return (f"<!DOCTYPE html><html><body><div id=\"__next\">{body}</div>"
+            f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(release)}</script></body></html>')
+
+
+def _time(function: Callable[[], Dict], rounds: int) -> float:
+    return min(timeit.repeat(function, number=rounds, repeat=3)) * 1000 / rounds
+
+
+def main(rounds: int) -> None:
+    pages = {
+        "recherche (fixture)": BEATPORT_SEARCH_RESPONSE,
+        "releases artiste": BEATPORT_ARTIST_RELEASES_RESPONSE,
+        "releases label": BEATPORT_LABEL_RELEASES_RESPONSE,
+        "page synthétique 2 Mo": synthetic_page(),
+    }
+    print(f"{'page':<24}{'taille':>10}{'regex+json':>14}{'octets+json':>14}{'octets+orjson':>15}")
+    for label, html in pages.items():
+        content = html.encode()
+        # Une réponse neuve par appel: response.text est mis en cache par httpx après le premier accès
+        legacy = _time(lambda: legacy_extract(httpx.Response(200, content=content)), rounds)
+
+        beatport_base_scraper.ORJSON_AVAILABLE = False
+        stdlib = _time(lambda: extract_next_data(httpx.Response(200, content=content).content), rounds)
+        beatport_base_scraper.ORJSON_AVAILABLE = True
+        fast = _time(lambda: extract_next_data(httpx.Response(200, content=content).content), rounds)
+
+        assert legacy_extract(httpx.Response(200, content=content)) == extract_next_data(content)
+        print(f"{label:<24}{len(content):>10}{legacy:>11.3f} ms{stdlib:>11.3f} ms{fast:>12.3f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200)
+    main(parser.parse_args().rounds)
@@ -4,7 +4,56 @@ Configuration globale des tests pour le projet.
 import pytest
 import asyncio
 
+from app.core.config import settings
+from app.scrapers.beatport import beatport_build_id
+from app.services import concurrency_limiter, fan_out, rate_limiter, request_coalescer, result_cache
+from app.services.soundcloud import soundcloud_auth_modes
+
 # Remarque: ne pas définir la fixture event_loop, car elle est gérée par pytest-asyncio
 # et configurée dans pytest.ini avec asyncio_default_fixture_loop_scope = function
 
-# Autres fixtures utiles pour les tests peuvent être ajoutées ci-dessous 
\ No newline at end of file
+# Autres fixtures utiles pour les tests peuvent être ajoutées ci-dessous
+
+
+@pytest.fixture(autouse=True)
+def reset_transport_limiters():
+    """Isole les tests: les seaux de jetons et limites de concurrence sont partagés par les singletons"""
+    rate_limiter.reset()
+    concurrency_limiter.reset()
+    request_coalescer.reset()
+    fan_out.reset()
+    soundcloud_auth_modes.reset()
+    yield
+    rate_limiter.reset()
+    concurrency_limiter.reset()
+    request_coalescer.reset()
+    fan_out.reset()
+    soundcloud_auth_modes.reset()
+
+
+@pytest.fixture(autouse=True)
+def disable_http_cache(monkeypatch):
+    """Les tests mockent les réponses amont: le cache HTTP persistant ne doit pas les resservir"""
+    monkeypatch.setattr(settings, "HTTP_CACHE_ENABLED", False)
+
+
+@pytest.fixture(autouse=True)
+def memory_token_store(monkeypatch):
+    """Le token SoundCloud des tests n'est ni lu ni écrit dans le store partagé sur disque"""
+    monkeypatch.setattr(settings, "SOUNDCLOUD_TOKEN_STORE", "memory")
+
+
+@pytest.fixture(autouse=True)
+def clear_result_cache():
+    """Chaque test part d'un cache de résultats vide: les scrapers mockés doivent être appelés"""
+    result_cache.clear()
+    yield
+    result_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_beatport_build_id():
+    """Le buildId Next.js découvert par un test ne doit pas faire passer le suivant en mode JSON"""
+    beatport_build_id.reset()
+    yield
+    beatport_build_id.reset()
@@ -30,3 +30,10 @@ class TestRootRoutes:
         assert "app_name" in response.json()
         assert response.json()["app_name"] == settings.APP_NAME
         assert "version" in response.json()
+
+    def test_metrics_endpoint_integration(self):
+        """Tester la route des métriques (/metrics)"""
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert "rate_limiter" in response.json()
+        assert "http_clients" in response.json()
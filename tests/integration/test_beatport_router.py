@@ -75,6 +75,20 @@ class TestBeatportRoutes:
         # Vérifier que le scraper a été appelé (les arguments seront vérifiés par FastAPI)
         patch_beatport_search_scraper.assert_called_once()
 
+    def test_search_result_cache_integration(self, patch_beatport_search_scraper,
+                                             mock_beatport_search_result_integration):
+        """Test d'intégration: une recherche identique est servie par le cache de résultats"""
+        patch_beatport_search_scraper.return_value = mock_beatport_search_result_integration
+
+        first = client.get("/api/beatport/search/test_query?page=2", headers=API_HEADERS)
+        second = client.get("/api/beatport/search/test_query?page=2", headers=API_HEADERS)
+        assert first.json() == second.json()
+        patch_beatport_search_scraper.assert_called_once()
+
+        bypassed = client.get("/api/beatport/search/test_query?page=2&bypass_cache=true", headers=API_HEADERS)
+        assert bypassed.status_code == 200
+        assert patch_beatport_search_scraper.call_count == 2
+
     def test_search_empty_results_integration(self, patch_beatport_search_scraper,
                                               mock_beatport_empty_search_result_integration):
         """Test d'intégration: recherche sans résultats"""
@@ -193,3 +193,69 @@ class TestSoundcloudRoutes:
         data = response.json()
         assert "detail" in data
         assert "erreur inattendue" in data["detail"].lower()
+
+    def test_search_profiles_social_links_params_integration(self, patch_soundcloud_search_scraper,
+                                                             mock_soundcloud_search_data_integration):
+        """Test d'intégration: réseaux sociaux des K premiers profils seulement sur demande"""
+        patch_soundcloud_search_scraper.return_value = mock_soundcloud_search_data_integration
+
+        response = client.get("/api/soundcloud/search-profile/test_user?include_social_links=true&social_links_top_k=1",
+                              headers=API_HEADERS)
+        assert response.status_code == 200
+        assert patch_soundcloud_search_scraper.call_args.args[3:] == (True, 1)
+
+        response = client.get("/api/soundcloud/search-profile/test_user?social_links_top_k=0", headers=API_HEADERS)
+        assert response.status_code == 422
+
+    def test_get_webprofiles_batch_integration(self, patch_soundcloud_webprofiles_scraper,
+                                               mock_social_links_integration):
+        """Test d'intégration: réseaux sociaux de plusieurs profils, erreurs par ID"""
+        patch_soundcloud_webprofiles_scraper.side_effect = [
+            mock_social_links_integration,
+            ResourceNotFoundException(resource_type="Profils web Soundcloud", resource_id="2"),
+        ]
+
+        response = client.post("/api/soundcloud/webprofiles", json={"user_ids": [1, 2, 1]}, headers=API_HEADERS)
+        assert response.status_code == 200
+
+        results = response.json()["results"]
+        assert [item["user_id"] for item in results] == [1, 2]
+        assert len(results[0]["social_links"]) == 3
+        assert results[1]["social_links"] is None
+        assert "non trouvé" in results[1]["error"]
+
+    def test_get_webprofiles_batch_validation_integration(self, monkeypatch):
+        """Test d'intégration: lot vide ou trop grand refusé"""
+        response = client.post("/api/soundcloud/webprofiles", json={"user_ids": []}, headers=API_HEADERS)
+        assert response.status_code == 422
+
+        monkeypatch.setattr(settings, "SOUNDCLOUD_BATCH_MAX_IDS", 2)
+        response = client.post("/api/soundcloud/webprofiles", json={"user_ids": [1, 2, 3]}, headers=API_HEADERS)
+        assert response.status_code == 400
+
+    def test_get_profiles_batch_integration(self, patch_soundcloud_profile_scraper,
+                                            mock_soundcloud_profile_integration):
+        """Test d'intégration: plusieurs profils, erreurs par ID"""
+        patch_soundcloud_profile_scraper.side_effect = [
+            mock_soundcloud_profile_integration,
+            ResourceNotFoundException(resource_type="Profil Soundcloud", resource_id="2"),
+        ]
+
+        response = client.post("/api/soundcloud/profiles", json={"user_ids": [123456, 2, 123456]},
+                               headers=API_HEADERS)
+        assert response.status_code == 200
+
+        results = response.json()["results"]
+        assert [item["user_id"] for item in results] == [123456, 2]
+        assert results[0]["profile"]["name"] == "Test user integration"
+        assert results[1]["profile"] is None
+        assert "non trouvé" in results[1]["error"]
+
+    def test_get_profiles_batch_validation_integration(self, monkeypatch):
+        """Test d'intégration: lot vide ou trop grand refusé"""
+        response = client.post("/api/soundcloud/profiles", json={"user_ids": []}, headers=API_HEADERS)
+        assert response.status_code == 422
+
+        monkeypatch.setattr(settings, "SOUNDCLOUD_BATCH_MAX_IDS", 2)
+        response = client.post("/api/soundcloud/profiles", json={"user_ids": [1, 2, 3]}, headers=API_HEADERS)
+        assert response.status_code == 400
@@ -0,0 +1,79 @@
+"""
+Tests de la sérialisation des résultats des outils MCP (une passe, JSON compact UTF-8).
+"""
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from mcp.types import CallToolRequest, CallToolRequestParams
+
+from app.core.config import settings
+from app.mcp.serialization import serialize_tool_result
+from app.mcp.server import create_mcp_server
+from app.scrapers.beatport.beatport_base_scraper import extract_next_data
+from app.scrapers.beatport.beatport_releases_scraper import BeatportReleasesScraper
+from tests.mocks.beatport_mocks import BEATPORT_LABEL_RELEASES_RESPONSE
+
+
+@pytest.fixture
+def releases_result():
+    next_data = extract_next_data(BEATPORT_LABEL_RELEASES_RESPONSE)
+    return BeatportReleasesScraper()._extract_releases_and_facets(next_data)
+
+
+async def _call_tool(name, arguments):
+    handler = create_mcp_server().request_handlers[CallToolRequest]
+    response = await handler(CallToolRequest(method="tools/call",
+                                             params=CallToolRequestParams(name=name, arguments=arguments)))
+    return response.root.content[0].text
+
+
+class TestSerializeToolResult:
+
+    def test_same_content_as_model_dump_json(self, releases_result):
+        payload = serialize_tool_result(releases_result)
+
+        assert releases_result.releases
+        assert json.loads(payload) == json.loads(releases_result.model_dump_json())
+
+    def test_compact_by_default(self, releases_result):
+        payload = serialize_tool_result(releases_result)
+
+        assert isinstance(payload, bytes)
+        assert b"\n" not in payload
+        assert b'": ' not in payload
+
+    def test_pretty_mode(self, releases_result, monkeypatch):
+        monkeypatch.setattr(settings, "MCP_PRETTY_JSON", True)
+
+        payload = serialize_tool_result(releases_result)
+
+        assert payload.startswith(b'{\n  "releases"')
+        assert serialize_tool_result(releases_result, pretty=False) == releases_result.model_dump_json().encode()
+
+    def test_error_payload_and_non_ascii_as_utf8(self):
+        payload = serialize_tool_result({"error": "Échec: délai dépassé", "tool": "bandcamp_search",
+                                         "query": "Köln"})
+
+        assert payload == '{"error":"Échec: délai dépassé","tool":"bandcamp_search","query":"Köln"}'.encode()
+
+
+class TestCallToolSerialization:
+
+    @pytest.mark.asyncio
+    @patch('app.mcp.tools.beatport_tools.BeatportReleasesScraper')
+    async def test_result_serialized_once_compact(self, mock_scraper_class, releases_result):
+        mock_scraper_class.return_value.scrape = AsyncMock(return_value=releases_result)
+
+        text = await _call_tool("beatport_get_label_releases", {"entity_slug": "label", "entity_id": "1"})
+
+        assert text == releases_result.model_dump_json()
+
+    @pytest.mark.asyncio
+    @patch('app.mcp.tools.bandcamp_tools.BandcampSearchScraper')
+    async def test_error_payload_same_path(self, mock_scraper_class):
+        mock_scraper_class.return_value.scrape = AsyncMock(side_effect=Exception("Délai dépassé"))
+
+        text = await _call_tool("bandcamp_search", {"query": "techno"})
+
+        assert text == '{"error":"Délai dépassé","tool":"bandcamp_search","query":"techno"}'
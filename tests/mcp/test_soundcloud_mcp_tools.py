@@ -1,11 +1,14 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 
+from app.core.config import settings
 from app.mcp.tools.soundcloud_tools import (
     execute_soundcloud_search,
     execute_soundcloud_get_profile,
+    execute_soundcloud_get_profiles,
+    execute_soundcloud_get_social_links,
 )
-from app.models import SoundcloudSearchResult, SoundcloudProfile, LimitEnum
+from app.models import SoundcloudSearchResult, SoundcloudProfile, LimitEnum, SocialLink
 
 
 class TestSoundcloudMcpTools:
@@ -36,12 +39,11 @@ class TestSoundcloudMcpTools:
 
         result = await execute_soundcloud_search(query="test", page=1, limit=10)
 
-        assert "total_results" in result
-        assert result["total_results"] == 1
-        assert "profiles" in result
-        assert len(result["profiles"]) == 1
-        assert result["profiles"][0]["name"] == "Test Artist"
-        mock_scraper.scrape.assert_called_once_with(name="test", page=1, limit=LimitEnum.TEN)
+        assert result.total_results == 1
+        assert len(result.profiles) == 1
+        assert result.profiles[0].name == "Test Artist"
+        mock_scraper.scrape.assert_called_once_with(name="test", page=1, limit=LimitEnum.TEN,
+                                                    include_social_links=False, social_links_top_k=None)
 
     @pytest.mark.asyncio
     @patch('app.mcp.tools.soundcloud_tools.SoundcloudSearchProfileScraper')
@@ -59,7 +61,8 @@ class TestSoundcloudMcpTools:
 
         result = await execute_soundcloud_search(query="test", page=1, limit=25)
 
-        mock_scraper.scrape.assert_called_once_with(name="test", page=1, limit=LimitEnum.TWENTY_FIVE)
+        mock_scraper.scrape.assert_called_once_with(name="test", page=1, limit=LimitEnum.TWENTY_FIVE,
+                                                    include_social_links=False, social_links_top_k=None)
 
     @pytest.mark.asyncio
     @patch('app.mcp.tools.soundcloud_tools.SoundcloudSearchProfileScraper')
@@ -94,10 +97,9 @@ class TestSoundcloudMcpTools:
 
         result = await execute_soundcloud_get_profile(user_id=123456)
 
-        assert "id" in result
-        assert result["id"] == 123456
-        assert result["name"] == "Test Artist"
-        assert result["followers_count"] == 5000
+        assert result.id == 123456
+        assert result.name == "Test Artist"
+        assert result.followers_count == 5000
         mock_scraper.scrape.assert_called_once_with(user_id=123456)
 
     @pytest.mark.asyncio
@@ -113,3 +115,98 @@ class TestSoundcloudMcpTools:
         assert result["error"] == "Profile not found"
         assert result["tool"] == "soundcloud_get_profile"
         assert result["user_id"] == 999999
+
+    @pytest.mark.asyncio
+    @patch('app.mcp.tools.soundcloud_tools.SoundcloudProfileScraper')
+    async def test_execute_soundcloud_get_profile_uses_result_cache(self, mock_scraper_class):
+        mock_profile = SoundcloudProfile(
+            id=123456,
+            name="Test Artist",
+            url="https://soundcloud.com/test-artist",
+            social_links=[]
+        )
+
+        mock_scraper = AsyncMock()
+        mock_scraper.scrape.return_value = mock_profile
+        mock_scraper_class.return_value = mock_scraper
+
+        first = await execute_soundcloud_get_profile(user_id=123456)
+        second = await execute_soundcloud_get_profile(user_id=123456)
+        assert first == second
+        mock_scraper.scrape.assert_called_once_with(user_id=123456)
+
+        await execute_soundcloud_get_profile(user_id=123456, bypass_cache=True)
+        assert mock_scraper.scrape.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch('app.mcp.tools.soundcloud_tools.SoundcloudProfileScraper')
+    async def test_execute_soundcloud_get_profile_error_not_cached(self, mock_scraper_class):
+        mock_scraper = AsyncMock()
+        mock_scraper.scrape.side_effect = Exception("Temporary error")
+        mock_scraper_class.return_value = mock_scraper
+
+        await execute_soundcloud_get_profile(user_id=999999)
+        await execute_soundcloud_get_profile(user_id=999999)
+
+        assert mock_scraper.scrape.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch('app.mcp.tools.soundcloud_tools.SoundcloudSearchProfileScraper')
+    async def test_execute_soundcloud_search_with_social_links_top_k(self, mock_scraper_class):
+        mock_scraper = AsyncMock()
+        mock_scraper.scrape.return_value = SoundcloudSearchResult(total_results=0, page=1, limit=LimitEnum.TEN)
+        mock_scraper_class.return_value = mock_scraper
+
+        await execute_soundcloud_search(query="test", include_social_links=True, social_links_top_k=3)
+        await execute_soundcloud_search(query="test")
+
+        assert mock_scraper.scrape.call_args_list[0].kwargs["social_links_top_k"] == 3
+        assert mock_scraper.scrape.call_args_list[1].kwargs["include_social_links"] is False
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.soundcloud.soundcloud_webprofiles_scraper.SoundcloudWebprofilesScraper.scrape',
+           new_callable=AsyncMock)
+    async def test_execute_soundcloud_get_social_links(self, mock_webprofiles_scrape):
+        mock_webprofiles_scrape.side_effect = [
+            [SocialLink(platform="instagram", url="https://instagram.com/test")], Exception("Test error")
+        ]
+
+        result = await execute_soundcloud_get_social_links(user_ids=[1, 2, 1])
+
+        assert [item.user_id for item in result.results] == [1, 2]
+        assert result.results[0].social_links[0].platform.value == "instagram"
+        assert result.results[1].error == "Test error"
+
+    @pytest.mark.asyncio
+    async def test_execute_soundcloud_get_social_links_too_many_ids(self, monkeypatch):
+        monkeypatch.setattr(settings, "SOUNDCLOUD_BATCH_MAX_IDS", 2)
+
+        result = await execute_soundcloud_get_social_links(user_ids=[1, 2, 3])
+
+        assert result["tool"] == "soundcloud_get_social_links"
+        assert result["user_ids"] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.soundcloud.soundcloud_profile_scraper.SoundcloudProfileScraper.scrape',
+           new_callable=AsyncMock)
+    async def test_execute_soundcloud_get_profiles(self, mock_profile_scrape):
+        mock_profile_scrape.side_effect = [
+            SoundcloudProfile(id=1, name="Test Artist", url="https://soundcloud.com/test-artist"),
+            Exception("Test error"),
+        ]
+
+        result = await execute_soundcloud_get_profiles(user_ids=[1, 2, 2, 1])
+
+        assert mock_profile_scrape.await_count == 2
+        assert [item.user_id for item in result.results] == [1, 2]
+        assert result.results[0].profile.name == "Test Artist"
+        assert result.results[1].error == "Test error"
+
+    @pytest.mark.asyncio
+    async def test_execute_soundcloud_get_profiles_too_many_ids(self, monkeypatch):
+        monkeypatch.setattr(settings, "SOUNDCLOUD_BATCH_MAX_IDS", 2)
+
+        result = await execute_soundcloud_get_profiles(user_ids=[1, 2, 3])
+
+        assert result["tool"] == "soundcloud_get_profiles"
+        assert result["user_ids"] == [1, 2, 3]
@@ -47,10 +47,12 @@ BANDCAMP_404_RESPONSE = "Not Found"
 def mock_bandcamp_response_factory():
     """Factory pour créer des réponses HTTPX mock pour les tests Bandcamp"""
     
-    def _create_response(status_code=200, text=None, html=None):
+    def _create_response(status_code=200, text=None, html=None, encoding="utf-8"):
         response = MagicMock()
         response.status_code = status_code
         response.text = html or text or ""
+        response.content = response.text.encode(encoding)
+        response.charset_encoding = encoding
         return response
     
     return _create_response
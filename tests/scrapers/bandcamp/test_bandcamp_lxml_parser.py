@@ -0,0 +1,88 @@
+from unittest.mock import patch, AsyncMock
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.core.config import settings
+from app.models.bandcamp_models import BandcampEntityType
+from app.scrapers.bandcamp import bandcamp_lxml_parser
+from app.scrapers.bandcamp.bandcamp_lxml_parser import BandcampLxmlParser
+from app.scrapers.bandcamp.bandcamp_search_scraper import BandcampSearchScraper
+from tests.mocks.bandcamp_mocks import (
+    BANDCAMP_SEARCH_RESPONSE,
+    BANDCAMP_EMPTY_RESPONSE,
+    mock_bandcamp_response_factory
+)
+
+EDGE_CASES_RESPONSE = """
+<html><body><ul>
+    <li class="searchresult band">
+        <div class="art"><img src="https://f4.bcbits.com/img/a1_1.jpg"></div>
+        <div class="result-info">
+            <div class="heading"> <a href="/relative?from=search"> Nested <b>Name</b> &amp; Co </a></div>
+            <div class="subhead">
+                Lyon,
+                <span>France</span>
+            </div>
+            <div class="genre">Genre: deep&nbsp;techno</div>
+        </div>
+    </li>
+    <li class="searchresult"><div class="heading">Pas de lien</div></li>
+    <li class="searchresult"><div class="subhead">Pas de heading</div></li>
+    <li class="searchresult">
+        <div class="heading"><a href="https://minimal.bandcamp.com/music">Minimal</a></div>
+        <div class="subhead"></div>
+    </li>
+    <li class="other"><div class="heading"><a href="https://ignored.bandcamp.com">Ignoré</a></div></li>
+</ul></body></html>
+"""
+
+
+def _soup_profiles(html):
+    return BandcampSearchScraper()._parse_search_results(BeautifulSoup(html, 'html.parser'))
+
+
+class TestBandcampLxmlParser:
+
+    @pytest.mark.parametrize("html", [BANDCAMP_SEARCH_RESPONSE, BANDCAMP_EMPTY_RESPONSE, EDGE_CASES_RESPONSE])
+    def test_same_profiles_as_beautifulsoup(self, html):
+        profiles = BandcampLxmlParser.parse_search_results(html)
+
+        assert [p.model_dump_json() for p in profiles] == [p.model_dump_json() for p in _soup_profiles(html)]
+
+    def test_edge_cases(self):
+        profiles = BandcampLxmlParser.parse_search_results(EDGE_CASES_RESPONSE)
+
+        assert [p.name for p in profiles] == ["NestedName& Co", "Minimal"]
+        assert profiles[0].location == "France"
+        assert profiles[0].genre == "deep\xa0techno"
+        assert str(profiles[0].url) == "https://bandcamp.com/"
+        assert profiles[1].location is None
+        assert profiles[1].avatar_url is None
+
+    @pytest.mark.parametrize("html", ["", "   ", "invalid html"])
+    def test_empty_or_invalid_document(self, html):
+        assert BandcampLxmlParser.parse_search_results(html) == []
+
+
+class TestBandcampHtmlBackend:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("backend, lxml_available, expected", [
+        ("lxml", True, "lxml"),
+        ("lxml", False, "beautifulsoup"),
+        ("beautifulsoup", True, "beautifulsoup"),
+    ])
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_backend_selection(self, mock_fetch, backend, lxml_available, expected, monkeypatch,
+                                     mock_bandcamp_response_factory):
+        monkeypatch.setattr(settings, "BANDCAMP_HTML_BACKEND", backend)
+        monkeypatch.setattr(bandcamp_lxml_parser, "LXML_AVAILABLE", lxml_available)
+        mock_fetch.return_value = mock_bandcamp_response_factory(html=BANDCAMP_SEARCH_RESPONSE)
+
+        with patch.object(BandcampLxmlParser, "parse_search_results",
+                          wraps=BandcampLxmlParser.parse_search_results) as lxml_parse:
+            result = await BandcampSearchScraper().scrape("mutual rytm", entity_type=BandcampEntityType.BANDS)
+
+        assert len(result.bands) == 2
+        assert lxml_parse.called == (expected == "lxml")
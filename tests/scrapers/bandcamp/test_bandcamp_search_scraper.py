@@ -4,7 +4,9 @@ import pytest
 
 from app.core.errors import ResourceNotFoundException, ParsingException
 from app.models.bandcamp_models import BandcampEntityType
+from app.scrapers.bandcamp import bandcamp_search_scraper
 from app.scrapers.bandcamp.bandcamp_search_scraper import BandcampSearchScraper
+from app.services import parse_executor
 from tests.mocks.bandcamp_mocks import (
     BANDCAMP_SEARCH_RESPONSE,
     BANDCAMP_EMPTY_RESPONSE,
@@ -45,6 +47,24 @@ class TestBandcampSearchScraper:
         assert second_profile.location == "France"
         assert second_profile.genre == "techno"
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("encoding", ["utf-8", "iso-8859-1"])
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_raw_content_decoded_with_parsing(self, mock_fetch, encoding, scraper,
+                                                    mock_bandcamp_response_factory):
+        # Le contenu brut est soumis au parsing, décodé selon le charset de la réponse
+        html = BANDCAMP_SEARCH_RESPONSE.replace(">Mutual Rytm<", ">Mötley Rytm<")
+        mock_fetch.return_value = mock_bandcamp_response_factory(html=html, encoding=encoding)
+
+        with patch.object(parse_executor, "run", wraps=parse_executor.run) as run:
+            result = await scraper.scrape("mutual rytm", entity_type=BandcampEntityType.BANDS)
+
+        assert run.call_args.args[0] is bandcamp_search_scraper.parse_search_page
+        assert isinstance(run.call_args.args[1], bytes)
+        assert result.bands[0].name == "Mötley Rytm"
+        assert bandcamp_search_scraper.parse_search_page(html.encode(encoding), False, encoding)[0]["name"] \
+            == "Mötley Rytm"
+
     @pytest.mark.asyncio
     @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
     async def test_scrape_empty_results(self, mock_fetch, scraper, mock_bandcamp_response_factory):
@@ -0,0 +1,266 @@
+"""
+Tests pour le mode JSON Next.js (/_next/data/<buildId>/...json) et le décodage des données Next.js
+des scrapers Beatport.
+"""
+import json
+from unittest.mock import patch, AsyncMock
+
+import pytest
+from httpx import Response
+
+from app.core.config import settings
+from app.core.errors import RateLimitException, ResourceNotFoundException, TemporaryScraperException
+from app.scrapers.beatport import beatport_base_scraper, beatport_build_id
+from app.scrapers.beatport.beatport_base_scraper import (HTML_QUERIES_PREFIX, NEXT_DATA_END, NEXT_DATA_START,
+                                                       BeatportBaseScraper, extract_next_data,
+                                                       select_dehydrated_query)
+from app.scrapers.beatport.beatport_search_scraper import BeatportSearchScraper
+from app.services import result_cache
+from tests.mocks.beatport_mocks import BEATPORT_SEARCH_RESPONSE
+
+SEARCH_NEXT_DATA = extract_next_data(BEATPORT_SEARCH_RESPONSE)
+SEARCH_HTML_WITH_BUILD_ID = (
+    '<html><script id="__NEXT_DATA__" type="application/json">'
+    + json.dumps({**SEARCH_NEXT_DATA, "buildId": "build-1", "locale": "en"})
+    + "</script></html>"
+)
+SEARCH_DATA_ROUTE = {"pageProps": SEARCH_NEXT_DATA["props"]["pageProps"], "__N_SSP": True}
+
+
+class TestBeatportNextData:
+
+    @pytest.fixture
+    def scraper(self):
+        return BeatportSearchScraper()
+
+    def test_build_data_url(self):
+        url = BeatportBaseScraper.build_data_url("https://www.beatport.com/label/test/1/releases?page=2", "abc", "en")
+
+        assert url == "https://www.beatport.com/_next/data/abc/en/label/test/1/releases.json?page=2"
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_html_page_discovers_build_id_then_json_route_is_used(self, mock_fetch, scraper):
+        mock_fetch.side_effect = [Response(200, text=SEARCH_HTML_WITH_BUILD_ID), Response(200, json=SEARCH_DATA_ROUTE)]
+
+        first = await scraper.scrape(query="test")
+        # Le payload de recherche de la requête est en cache: le vider force un second fetch
+        result_cache.clear()
+        second = await scraper.scrape(query="test")
+
+        urls = [call.args[0] for call in mock_fetch.call_args_list]
+        assert urls == [
+            "https://www.beatport.com/search?q=test",
+            "https://www.beatport.com/_next/data/build-1/en/search.json?q=test",
+        ]
+        assert mock_fetch.call_args_list[1].kwargs["headers"]["x-nextjs-data"] == "1"
+        assert second == first
+        assert beatport_build_id.get_metrics()["json_requests"] == 1
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_redeploy_404_falls_back_to_html_and_refreshes_build_id(self, mock_fetch, scraper):
+        beatport_build_id.remember({"buildId": "old-build"})
+        mock_fetch.side_effect = [Response(404), Response(200, text=SEARCH_HTML_WITH_BUILD_ID)]
+
+        result = await scraper.scrape(query="test")
+
+        assert len(result.artists) > 0
+        assert beatport_build_id.build_id == "build-1"
+        assert beatport_build_id.get_metrics()["json_fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_not_found_confirmed_by_html_page(self, mock_fetch, scraper):
+        beatport_build_id.remember({"buildId": "build-1"})
+        mock_fetch.side_effect = [Response(404), Response(404, text="Not Found"), Response(200, json=SEARCH_DATA_ROUTE)]
+
+        with pytest.raises(ResourceNotFoundException):
+            await scraper.scrape(query="test")
+
+        # Ressource absente: le buildId partagé est conservé et la requête suivante reprend la route JSON
+        assert beatport_build_id.build_id == "build-1"
+        assert len((await scraper.scrape(query="other")).artists) > 0
+        assert mock_fetch.call_args_list[2].args[0] == "https://www.beatport.com/_next/data/build-1/search.json?q=other"
+        assert beatport_build_id.get_metrics()["build_id_changes"] == 1
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_not_found_page_with_new_build_id_replaces_it(self, mock_fetch, scraper):
+        beatport_build_id.remember({"buildId": "old-build"})
+        not_found_html = (
+            '<html><script id="__NEXT_DATA__" type="application/json">'
+            '{"props": {"pageProps": {}}, "page": "/404", "buildId": "build-2"}</script></html>'
+        )
+        mock_fetch.side_effect = [Response(404), Response(404, text=not_found_html)]
+
+        with pytest.raises(ResourceNotFoundException):
+            await scraper.scrape(query="test")
+
+        assert beatport_build_id.build_id == "build-2"
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_invalid_json_or_error_falls_back_to_html(self, mock_fetch, scraper):
+        beatport_build_id.remember({"buildId": "build-1"})
+        mock_fetch.side_effect = [
+            Response(200, text="<html>not json</html>"), Response(200, text=SEARCH_HTML_WITH_BUILD_ID),
+            TemporaryScraperException("Erreur serveur"), Response(200, text=SEARCH_HTML_WITH_BUILD_ID),
+        ]
+
+        assert len((await scraper.scrape(query="test")).artists) > 0
+        result_cache.clear()
+        assert len((await scraper.scrape(query="test")).artists) > 0
+        assert beatport_build_id.get_metrics()["json_fallbacks"] == 2
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_rate_limit_is_not_retried_on_html(self, mock_fetch, scraper):
+        beatport_build_id.remember({"buildId": "build-1"})
+        mock_fetch.side_effect = RateLimitException()
+
+        with pytest.raises(RateLimitException):
+            await scraper.scrape(query="test")
+
+        assert mock_fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_disabled_by_settings(self, mock_fetch, scraper, monkeypatch):
+        monkeypatch.setattr(settings, "BEATPORT_NEXT_DATA_ENABLED", False)
+        beatport_build_id.remember({"buildId": "build-1"})
+        mock_fetch.return_value = Response(200, text=SEARCH_HTML_WITH_BUILD_ID)
+
+        await scraper.scrape(query="test")
+
+        assert mock_fetch.call_args.args[0] == "https://www.beatport.com/search?q=test"
+
+
+class TestExtractNextData:
+
+    def test_extracts_from_raw_bytes(self):
+        content = SEARCH_HTML_WITH_BUILD_ID.encode()
+
+        assert extract_next_data(content)["buildId"] == "build-1"
+
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_same_result_with_and_without_orjson(self, orjson_available, monkeypatch):
+        monkeypatch.setattr(beatport_base_scraper, "ORJSON_AVAILABLE", orjson_available)
+
+        assert extract_next_data(BEATPORT_SEARCH_RESPONSE.encode()) == SEARCH_NEXT_DATA
+
+    def test_only_first_script_closing_tag_is_used(self):
+        content = ('<script id="__NEXT_DATA__" type="application/json">{"a": "\\u003c/script>"}</script>'
+                   '<script>var x = 1;</script>').encode()
+
+        assert extract_next_data(content) == {"a": "</script>"}
+
+    @pytest.mark.parametrize("content", [
+        b"<html><body>No script here</body></html>",
+        b'<script id="__NEXT_DATA__" type="application/json">{"a": 1}',
+        b'<script id="__NEXT_DATA__" type="application/json">{invalid</script>',
+        b'<script id="__NEXT_DATA__" type="application/json">[1, 2]</script>',
+    ])
+    def test_missing_unterminated_or_invalid_returns_empty(self, content):
+        assert extract_next_data(content) == {}
+
+
+class TestStreamedHtmlPage:
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_html_page_is_streamed_until_next_data_end(self, mock_fetch, monkeypatch):
+        monkeypatch.setattr(settings, "BEATPORT_STREAM_ENABLED", True)
+        mock_fetch.return_value = Response(200, text=SEARCH_HTML_WITH_BUILD_ID)
+
+        await BeatportSearchScraper().scrape(query="test")
+
+        assert mock_fetch.call_args.kwargs["stream_until"] == (NEXT_DATA_START, NEXT_DATA_END)
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_streaming_disabled_by_settings(self, mock_fetch, monkeypatch):
+        monkeypatch.setattr(settings, "BEATPORT_STREAM_ENABLED", False)
+        mock_fetch.return_value = Response(200, text=SEARCH_HTML_WITH_BUILD_ID)
+
+        await BeatportSearchScraper().scrape(query="test")
+
+        assert "stream_until" not in mock_fetch.call_args.kwargs
+
+
+class TestLazyDecoding:
+
+    @pytest.fixture
+    def page_with_extra_queries(self):
+        # Query volumineuse sans rapport placée avant la query de recherche
+        next_data = json.loads(json.dumps(SEARCH_NEXT_DATA))
+        queries = next_data["props"]["pageProps"]["dehydratedState"]["queries"]
+        queries.insert(0, {"queryKey": ["menu"], "state": {"data": {"items": [{"name": "x"}] * 100}}})
+        return ('<html><script id="__NEXT_DATA__" type="application/json">'
+                + json.dumps({**next_data, "buildId": "build-1", "locale": "en"}) + "</script></html>")
+
+    def test_select_dehydrated_query_returns_first_match(self, page_with_extra_queries):
+        content = extract_next_data(page_with_extra_queries)
+        payload = json.dumps(content).encode()
+
+        query = select_dehydrated_query(payload, HTML_QUERIES_PREFIX, BeatportSearchScraper._is_search_query)
+
+        assert query == SEARCH_NEXT_DATA["props"]["pageProps"]["dehydratedState"]["queries"][0]
+
+    @pytest.mark.parametrize("payload", [b'{"props": {"pageProps": {}}}', b'{"props": {"pageProps": {"dehydr'])
+    def test_select_dehydrated_query_without_match_returns_none(self, payload):
+        assert select_dehydrated_query(payload, HTML_QUERIES_PREFIX, lambda query: True) is None
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_html_page_decodes_only_matching_query(self, mock_fetch, page_with_extra_queries):
+        mock_fetch.return_value = Response(200, text=page_with_extra_queries)
+        scraper = BeatportSearchScraper()
+
+        status_code, next_data = await scraper.fetch_next_data("https://www.beatport.com/search?q=test",
+                                                               matcher=scraper._is_search_query)
+
+        assert status_code == 200
+        assert len(next_data["props"]["pageProps"]["dehydratedState"]["queries"]) == 1
+        assert (next_data["buildId"], next_data["locale"]) == ("build-1", "en")
+        assert beatport_build_id.build_id == "build-1"
+        assert beatport_build_id.get_metrics()["lazy_decodes"] == 1
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_json_route_gives_same_result_as_full_decode(self, mock_fetch, monkeypatch):
+        beatport_build_id.remember({"buildId": "build-1"})
+        mock_fetch.return_value = Response(200, json=SEARCH_DATA_ROUTE)
+
+        lazy = await BeatportSearchScraper().scrape(query="test")
+        monkeypatch.setattr(settings, "BEATPORT_LAZY_DECODE_ENABLED", False)
+        result_cache.clear()
+        full = await BeatportSearchScraper().scrape(query="test")
+
+        assert lazy == full
+        assert beatport_build_id.get_metrics()["lazy_decodes"] == 1
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_unexpected_layout_falls_back_to_full_decode(self, mock_fetch):
+        mock_fetch.return_value = Response(200, text=SEARCH_HTML_WITH_BUILD_ID)
+
+        status_code, next_data = await BeatportSearchScraper().fetch_next_data(
+            "https://www.beatport.com/search?q=test", matcher=lambda query: False)
+
+        assert next_data["props"] == SEARCH_NEXT_DATA["props"]
+        assert beatport_build_id.get_metrics()["lazy_fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("ijson_available, enabled", [(False, True), (True, False)])
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_full_decode_without_ijson_or_when_disabled(self, mock_fetch, ijson_available, enabled,
+                                                              monkeypatch):
+        monkeypatch.setattr(beatport_base_scraper, "IJSON_AVAILABLE", ijson_available)
+        monkeypatch.setattr(settings, "BEATPORT_LAZY_DECODE_ENABLED", enabled)
+        mock_fetch.return_value = Response(200, text=SEARCH_HTML_WITH_BUILD_ID)
+
+        result = await BeatportSearchScraper().scrape(query="test")
+
+        assert len(result.artists) > 0
+        assert beatport_build_id.get_metrics()["lazy_decodes"] == 0
@@ -1,6 +1,14 @@
+import pytest
+from pydantic import HttpUrl, ValidationError
+
 from app.models.beatport_models import BeatportEntityType
-from app.scrapers.beatport.beatport_mapping_utils import BeatportMappingUtils
-from tests.mocks.beatport_mocks import mock_beatport_release_data, mock_beatport_specific_format_release_data
+from app.scrapers.beatport.beatport_base_scraper import extract_next_data
+from app.scrapers.beatport.beatport_mapping_utils import BeatportMappingUtils, normalize_url
+from tests.mocks.beatport_mocks import (BEATPORT_SEARCH_RESPONSE, mock_beatport_release_data,
+                                        mock_beatport_specific_format_release_data)
+
+SEARCH_DATA = extract_next_data(BEATPORT_SEARCH_RESPONSE)["props"]["pageProps"]["dehydratedState"]["queries"][0][
+    "state"]["data"]
 
 
 class TestBeatportMappingUtils:
@@ -45,3 +53,49 @@ class TestBeatportMappingUtils:
         assert release.artists[0].name == "Test Artist"
         assert release.label.id == 555666
         assert release.label.name == "Test Label"
+
+
+class TestExtractItems:
+
+    @pytest.mark.parametrize("entity_type, extract_func", [
+        (BeatportEntityType.ARTIST, BeatportMappingUtils.extract_artist),
+        (BeatportEntityType.TRACK, BeatportMappingUtils.extract_track),
+        (BeatportEntityType.RELEASE, BeatportMappingUtils.extract_release),
+        (BeatportEntityType.LABEL, BeatportMappingUtils.extract_label),
+    ])
+    def test_same_result_as_item_by_item(self, entity_type, extract_func):
+        items_data = SEARCH_DATA[f"{entity_type.value}s"]["data"]
+
+        items = BeatportMappingUtils.extract_items(entity_type, items_data)
+
+        assert len(items) == len(items_data) > 0
+        assert [item.model_dump_json() for item in items] == [extract_func(data).model_dump_json() for data in items_data]
+
+    def test_invalid_items_are_skipped(self, mock_beatport_release_data):
+        items_data = [
+            mock_beatport_release_data,
+            {**mock_beatport_release_data, "id": "not-an-id"},  # Rejeté à la validation
+            {"id": 1, "name": "Sans label"},  # Champs incomplets: rejeté à l'assemblage
+            mock_beatport_release_data,
+        ]
+
+        releases = BeatportMappingUtils.extract_items(BeatportEntityType.RELEASE, items_data)
+
+        assert [release.id for release in releases] == [123456, 123456]
+
+    def test_empty_list(self):
+        assert BeatportMappingUtils.extract_items(BeatportEntityType.TRACK, []) == []
+
+
+class TestNormalizeUrl:
+
+    def test_validated_url_is_cached(self):
+        url = normalize_url("https://www.beatport.com/artist/test-artist/123456")
+
+        assert isinstance(url, HttpUrl)
+        assert normalize_url("https://www.beatport.com/artist/test-artist/123456") is url
+        assert normalize_url(None) is None
+
+    def test_invalid_url_is_rejected(self):
+        with pytest.raises(ValidationError):
+            normalize_url("not a url")
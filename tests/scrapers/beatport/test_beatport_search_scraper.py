@@ -1,11 +1,17 @@
-from unittest.mock import patch, AsyncMock
+import copy
+import json
+from unittest.mock import patch, AsyncMock, Mock
 
 import pytest
 
 from app.core.errors import ResourceNotFoundException, ParsingException
 from app.models import LimitEnum
 from app.models.beatport_models import BeatportEntityType
+from app.scrapers.beatport.beatport_base_scraper import extract_next_data
+from app.scrapers.beatport.beatport_mapping_utils import ENTITY_FIELDS
 from app.scrapers.beatport.beatport_search_scraper import BeatportSearchScraper
+from app.services import result_cache
+from app.services.http_cache_service import bypass_http_cache
 from tests.mocks.beatport_mocks import (
     BEATPORT_SEARCH_RESPONSE,
     BEATPORT_404_RESPONSE,
@@ -13,6 +19,20 @@ from tests.mocks.beatport_mocks import (
 )
 
 
+def large_search_data(results: int) -> dict:
+    """NEXT_DATA d'une recherche avec `results` éléments bruts distincts par type d'entité"""
+    next_data = extract_next_data(BEATPORT_SEARCH_RESPONSE)
+    search_data = next_data["props"]["pageProps"]["dehydratedState"]["queries"][0]["state"]["data"]
+    for field in ("artists", "tracks", "releases", "labels"):
+        source = search_data[field]["data"][0]
+        search_data[field]["data"] = [{**copy.deepcopy(source), "id": index} for index in range(results)]
+    return next_data
+
+
+def search_page(next_data: dict) -> str:
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>'
+
+
 class TestBeatportSearchScraper:
     @pytest.fixture
     def scraper(self):
@@ -159,4 +179,114 @@ class TestBeatportSearchScraper:
         
         # Vérifier que l'extraction retourne un dictionnaire vide
         result = scraper._extract_next_data(html_content)
-        assert result == {} 
\ No newline at end of file
+        assert result == {} 
+
+    @pytest.mark.parametrize("entity_type_filter, expected_total", [(None, 480), (BeatportEntityType.TRACK, 120)])
+    def test_only_page_items_are_mapped(self, scraper, entity_type_filter, expected_total):
+        fields_mocks = {entity_type: Mock(wraps=fields) for entity_type, fields in ENTITY_FIELDS.items()}
+
+        with patch.dict(ENTITY_FIELDS, fields_mocks):
+            results = scraper._extract_search_results(scraper._find_search_data(large_search_data(120)), page=2, limit=LimitEnum.TEN,
+                                                      entity_type_filter=entity_type_filter)
+
+        # Nombre total sur les éléments bruts, seuls les 10 éléments de la page sont mappés
+        assert results.total_results == expected_total
+        assert [track.id for track in results.tracks] == list(range(10, 20))
+        assert sum(mock.call_count for mock in fields_mocks.values()) == 10 * (expected_total // 120)
+
+    def test_page_beyond_raw_items_is_empty(self, scraper):
+        results = scraper._extract_search_results(scraper._find_search_data(large_search_data(15)), page=3, limit=LimitEnum.TEN)
+
+        assert results.total_results == 60
+        assert results.artists == results.tracks == results.releases == results.labels == []
+
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_extraction_error_raises_and_is_not_cached(self, mock_fetch, scraper, mock_beatport_response_factory):
+        mock_fetch.return_value = mock_beatport_response_factory(html=BEATPORT_SEARCH_RESPONSE)
+
+        async def search():
+            return await result_cache.get_or_compute("beatport_search", {"query": "test"},
+                                                     lambda: scraper.scrape(query="test"))
+
+        # Erreur d'extraction: ParsingException plutôt qu'un résultat vide, rien n'est mis en cache
+        with patch.object(scraper, "_extract_entity_items", side_effect=ValueError("payload inattendu")):
+            with pytest.raises(ParsingException):
+                await search()
+            with pytest.raises(ParsingException):
+                await search()
+        stats = result_cache.get_metrics()["tools"]["beatport_search"]
+        assert (stats["hits"], stats["negative_hits"], stats["misses"]) == (0, 0, 2)
+
+
+class TestSearchPayloadReuse:
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_pages_limits_and_filters_served_from_one_fetch(self, mock_fetch, mock_beatport_response_factory):
+        mock_fetch.return_value = mock_beatport_response_factory(html=search_page(large_search_data(60)))
+        scraper = BeatportSearchScraper()
+
+        first = await scraper.scrape(query="Test Query", page=1, limit=LimitEnum.TEN)
+        tracks = await scraper.scrape(query="  test   query ", page=3, limit=LimitEnum.TEN,
+                                      entity_type_filter=BeatportEntityType.TRACK)
+        labels = await scraper.scrape(query="test query", page=2, limit=LimitEnum.TWENTY_FIVE,
+                                      entity_type_filter=BeatportEntityType.LABEL)
+
+        assert mock_fetch.await_count == 1
+        assert "search?q=test%20query" in mock_fetch.call_args.args[0]
+        assert first.total_results == 240
+        assert [track.id for track in tracks.tracks] == list(range(20, 30))
+        assert [label.id for label in labels.labels] == list(range(25, 50))
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_upstream_page_fetched_only_beyond_payload(self, mock_fetch, mock_beatport_response_factory):
+        # Le payload /search ne contient que 10 des 45 tracks annoncés par l'amont
+        payload = large_search_data(10)
+        payload["props"]["pageProps"]["dehydratedState"]["queries"][0]["state"]["data"]["tracks"]["count"] = 45
+        upstream = large_search_data(20)
+        tracks_page = upstream["props"]["pageProps"]["dehydratedState"]["queries"][0]["state"]["data"]
+        tracks_page["tracks"]["data"] = tracks_page["tracks"]["data"][10:]
+        mock_fetch.side_effect = [mock_beatport_response_factory(html=search_page(payload)),
+                                  mock_beatport_response_factory(html=search_page(upstream))]
+        scraper = BeatportSearchScraper()
+
+        first_page = await scraper.scrape(query="test", page=1, entity_type_filter=BeatportEntityType.TRACK)
+        second_page = await scraper.scrape(query="test", page=2, entity_type_filter=BeatportEntityType.TRACK)
+        again = await scraper.scrape(query="test", page=2, entity_type_filter=BeatportEntityType.TRACK)
+
+        urls = [call.args[0] for call in mock_fetch.call_args_list]
+        assert urls == ["https://www.beatport.com/search?q=test",
+                        "https://www.beatport.com/search/tracks?q=test&page=2&per_page=10"]
+        assert [track.id for track in first_page.tracks] == list(range(10))
+        assert [track.id for track in second_page.tracks] == list(range(10, 20))
+        assert second_page.total_results == 45
+        assert again == second_page
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_page_beyond_complete_payload_is_not_fetched(self, mock_fetch, mock_beatport_response_factory):
+        mock_fetch.return_value = mock_beatport_response_factory(html=search_page(large_search_data(15)))
+
+        result = await BeatportSearchScraper().scrape(query="test", page=3)
+
+        assert mock_fetch.await_count == 1
+        assert result.total_results == 60
+        assert result.artists == result.tracks == result.releases == result.labels == []
+
+    @pytest.mark.asyncio
+    @patch('app.scrapers.base_scraper.BaseScraper.fetch', new_callable=AsyncMock)
+    async def test_bypass_refetches_payload(self, mock_fetch, mock_beatport_response_factory):
+        mock_fetch.return_value = mock_beatport_response_factory(html=BEATPORT_SEARCH_RESPONSE)
+        scraper = BeatportSearchScraper()
+
+        await scraper.scrape(query="test")
+        token = bypass_http_cache.set(True)
+        try:
+            await scraper.scrape(query="test")
+        finally:
+            bypass_http_cache.reset(token)
+
+        assert mock_fetch.await_count == 2
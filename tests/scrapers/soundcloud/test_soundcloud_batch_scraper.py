@@ -0,0 +1,159 @@
+import asyncio
+from unittest.mock import patch, AsyncMock
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.errors import PermanentScraperException, ResourceNotFoundException
+from app.scrapers.soundcloud.soundcloud_batch_scraper import SoundcloudBatchScraper
+from app.scrapers.soundcloud.soundcloud_profile_scraper import SoundcloudProfileScraper
+from app.services import http_client, rate_limiter, result_cache
+from tests.mocks.soundcloud_mocks import (mock_soundcloud_auth_service, mock_soundcloud_user_data,
+                                          mock_soundcloud_webprofiles_data)
+
+GET_USER_PATH = 'app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.get_user'
+WEBPROFILES_PATH = 'app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.get_user_webprofiles'
+
+
+class TestSoundcloudBatchScraper:
+
+    @pytest.fixture
+    def scraper(self):
+        return SoundcloudBatchScraper()
+
+    @pytest.mark.asyncio
+    @patch(WEBPROFILES_PATH, new_callable=AsyncMock)
+    async def test_social_links_deduplicated_with_per_id_errors(self, mock_webprofiles, scraper,
+                                                                mock_soundcloud_webprofiles_data):
+        async def webprofiles(user_id):
+            if user_id == 2:
+                raise ResourceNotFoundException(resource_type="Profils web Soundcloud", resource_id="2")
+            return mock_soundcloud_webprofiles_data
+
+        mock_webprofiles.side_effect = webprofiles
+
+        result = await scraper.scrape_social_links([1, 2, 1, 3])
+
+        assert mock_webprofiles.await_count == 3
+        assert [item.user_id for item in result.results] == [1, 2, 3]
+        assert result.results[0].social_links and result.results[2].social_links
+        assert result.results[1].social_links is None
+        assert result.results[1].error == "Profils web Soundcloud avec l'identifiant '2' non trouvé"
+
+    @pytest.mark.asyncio
+    @patch(WEBPROFILES_PATH, new_callable=AsyncMock)
+    async def test_cached_ids_are_not_refetched(self, mock_webprofiles, scraper, mock_soundcloud_webprofiles_data):
+        mock_webprofiles.return_value = mock_soundcloud_webprofiles_data
+
+        await scraper.scrape_social_links([1, 2])
+        result = await scraper.scrape_social_links([2, 3])
+
+        assert [call.args[0] for call in mock_webprofiles.await_args_list] == [1, 2, 3]
+        assert all(item.social_links for item in result.results)
+
+        await scraper.scrape_social_links([2], bypass_cache=True)
+        assert mock_webprofiles.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_too_many_ids_rejected(self, scraper, monkeypatch):
+        monkeypatch.setattr(settings, "SOUNDCLOUD_BATCH_MAX_IDS", 3)
+
+        with pytest.raises(PermanentScraperException):
+            await scraper.scrape_social_links([1, 2, 3, 4])
+
+    @pytest.mark.asyncio
+    @patch(WEBPROFILES_PATH, new_callable=AsyncMock)
+    @patch(GET_USER_PATH, new_callable=AsyncMock)
+    async def test_profiles_deduplicated_with_per_id_errors(self, mock_get_user, mock_webprofiles, scraper,
+                                                            mock_soundcloud_user_data,
+                                                            mock_soundcloud_webprofiles_data):
+        async def get_user(user_id):
+            if user_id == 2:
+                raise ResourceNotFoundException(resource_type="Profil Soundcloud", resource_id="2")
+            return {**mock_soundcloud_user_data, "id": user_id}
+
+        mock_get_user.side_effect = get_user
+        mock_webprofiles.return_value = mock_soundcloud_webprofiles_data
+
+        result = await scraper.scrape_profiles([1, 2, 3, 1, 3])
+
+        assert mock_get_user.await_count == 3
+        assert [item.user_id for item in result.results] == [1, 2, 3]
+        assert result.results[0].profile.id == 1 and result.results[2].profile.id == 3
+        assert result.results[0].profile.social_links
+        assert result.results[1].profile is None
+        assert result.results[1].error == "Profil Soundcloud avec l'identifiant '2' non trouvé"
+
+    @pytest.mark.asyncio
+    @patch(WEBPROFILES_PATH, new_callable=AsyncMock)
+    @patch(GET_USER_PATH, new_callable=AsyncMock)
+    async def test_profiles_reuse_cached_profiles(self, mock_get_user, mock_webprofiles, scraper,
+                                                  mock_soundcloud_user_data, mock_soundcloud_webprofiles_data):
+        mock_get_user.return_value = mock_soundcloud_user_data
+        mock_webprofiles.return_value = mock_soundcloud_webprofiles_data
+
+        # Profil déjà en cache via l'outil unitaire soundcloud_get_profile
+        await result_cache.get_or_compute("soundcloud_get_profile", {"user_id": 1},
+                                          lambda: SoundcloudProfileScraper().scrape(1))
+        await scraper.scrape_profiles([1, 2])
+
+        assert [call.args[0] for call in mock_get_user.await_args_list] == [1, 2]
+
+    @pytest.mark.asyncio
+    @patch(WEBPROFILES_PATH, new_callable=AsyncMock)
+    @patch(GET_USER_PATH, new_callable=AsyncMock)
+    async def test_profiles_bounded_concurrency(self, mock_get_user, mock_webprofiles, scraper, monkeypatch,
+                                                mock_soundcloud_user_data, mock_soundcloud_webprofiles_data):
+        monkeypatch.setattr(settings, "FAN_OUT_CONCURRENCY", 4)
+        in_flight = 0
+        max_in_flight = 0
+
+        async def get_user(user_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {**mock_soundcloud_user_data, "id": user_id}
+
+        mock_get_user.side_effect = get_user
+        mock_webprofiles.return_value = mock_soundcloud_webprofiles_data
+
+        result = await scraper.scrape_profiles(list(range(1, 21)))
+
+        assert max_in_flight == 4
+        assert all(item.profile is not None for item in result.results)
+
+    @pytest.mark.asyncio
+    async def test_max_batch_completes_under_rate_limit(self, scraper, monkeypatch, mock_soundcloud_user_data):
+        # Lot maximal par le vrai transport (seau à jetons SoundCloud, AIMD, single-flight), avec les
+        # réglages par défaut accélérés 20 fois: débit 10 -> 200 req/s, délais 5 s / 10 s -> 0,25 s / 0,5 s,
+        # latence amont 50 ms -> 2,5 ms. Le lot (400 appels) dure ~2 s, bien au-delà de FAN_OUT_DEADLINE
+        speedup = 20
+        monkeypatch.setattr(settings, "RATE_LIMIT_SOUNDCLOUD_RATE", settings.RATE_LIMIT_SOUNDCLOUD_RATE * speedup)
+        monkeypatch.setattr(settings, "FAN_OUT_ITEM_TIMEOUT", settings.FAN_OUT_ITEM_TIMEOUT / speedup)
+        monkeypatch.setattr(settings, "FAN_OUT_DEADLINE", settings.FAN_OUT_DEADLINE / speedup)
+        rate_limiter.reset()
+        requests = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            await asyncio.sleep(0.05 / speedup)
+            segments = request.url.path.strip("/").split("/")
+            if segments[-1] == "web-profiles":
+                return httpx.Response(200, json=[])
+            return httpx.Response(200, json={**mock_soundcloud_user_data, "id": int(segments[1])})
+
+        await http_client.close()
+        monkeypatch.setattr(http_client, "_transport", httpx.MockTransport(handler))
+        try:
+            user_ids = list(range(1, settings.SOUNDCLOUD_BATCH_MAX_IDS + 1))
+            result = await scraper.scrape_profiles(user_ids)
+        finally:
+            await http_client.close()
+
+        assert [item.error for item in result.results if item.error] == []
+        assert [item.profile.id for item in result.results] == user_ids
+        assert len(requests) == 2 * len(user_ids)
+        assert rate_limiter.get_metrics()["soundcloud"]["delayed"] > 0
@@ -1,11 +1,14 @@
+import asyncio
+import time
 from unittest.mock import patch, AsyncMock
 
 import pytest
 
+from app.core.config import settings
 from app.core.errors import ResourceNotFoundException, ParsingException
 from app.models import SoundcloudSearchResult, LimitEnum, SocialLink
 from app.scrapers.soundcloud.soundcloud_search_profile_scraper import SoundcloudSearchProfileScraper
-from tests.mocks.soundcloud_mocks import mock_soundcloud_search_data
+from tests.mocks.soundcloud_mocks import mock_soundcloud_search_data, mock_soundcloud_webprofiles_data
 
 
 class TestSoundcloudSearchProfileScraper:
@@ -26,7 +29,7 @@ class TestSoundcloudSearchProfileScraper:
         
         mock_webprofiles_scrape.side_effect = [social_links1, social_links2]
         
-        result = await scraper.scrape("test query", page=1, limit=LimitEnum.TEN)
+        result = await scraper.scrape("test query", page=1, limit=LimitEnum.TEN, include_social_links=True)
         
         assert isinstance(result, SoundcloudSearchResult)
         assert result.total_results == 2
@@ -81,7 +84,7 @@ class TestSoundcloudSearchProfileScraper:
         # Simuler une erreur lors de la récupération des réseaux sociaux
         mock_webprofiles_scrape.side_effect = Exception("Test error")
         
-        result = await scraper.scrape("test query")
+        result = await scraper.scrape("test query", include_social_links=True)
         
         assert isinstance(result, SoundcloudSearchResult)
         assert len(result.profiles) == 2
@@ -100,4 +103,73 @@ class TestSoundcloudSearchProfileScraper:
         with pytest.raises(ParsingException) as excinfo:
             await scraper.scrape("test query")
         
-        assert "Erreur lors du parsing" in str(excinfo.value)
\ No newline at end of file
+        assert "Erreur lors du parsing" in str(excinfo.value)
+
+    @pytest.mark.asyncio
+    @patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.search_users', new_callable=AsyncMock)
+    async def test_search_returns_within_deadline_with_arrived_social_links(self, mock_search_users, scraper,
+                                                                            mock_soundcloud_webprofiles_data,
+                                                                            monkeypatch):
+        monkeypatch.setattr(settings, "FAN_OUT_CONCURRENCY", 4)
+        # Le délai par appel libère les places prises par les appels lents, le délai global borne la recherche
+        monkeypatch.setattr(settings, "FAN_OUT_ITEM_TIMEOUT", 0.1)
+        monkeypatch.setattr(settings, "FAN_OUT_DEADLINE", 0.5)
+        mock_search_users.return_value = {
+            "total_results": 20,
+            "collection": [{"kind": "user", "id": user_id, "username": f"user{user_id}",
+                            "permalink_url": f"https://soundcloud.com/user{user_id}"} for user_id in range(20)]
+        }
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_webprofiles(user_id):
+            # Amont lent: un profil sur quatre ne répond pas avant le délai global
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            try:
+                await asyncio.sleep(5 if user_id % 4 == 3 else 0.01)
+                return mock_soundcloud_webprofiles_data
+            finally:
+                in_flight -= 1
+
+        with patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.get_user_webprofiles',
+                   side_effect=slow_webprofiles):
+            start = time.perf_counter()
+            result = await scraper.scrape("test query", page=1, limit=LimitEnum.TWENTY_FIVE,
+                                          include_social_links=True)
+            elapsed = time.perf_counter() - start
+
+        assert elapsed < 1
+        assert max_in_flight <= 4
+        assert len(result.profiles) == 20
+        assert [bool(profile.social_links) for profile in result.profiles] == [i % 4 != 3 for i in range(20)]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("include_social_links, social_links_top_k, expected_calls", [
+        (False, None, 0),
+        (True, 5, 5),
+        (True, None, 50),
+    ])
+    @patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.get_user_webprofiles',
+           new_callable=AsyncMock)
+    @patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.search_users', new_callable=AsyncMock)
+    async def test_social_links_enrichment_is_opt_in(self, mock_search_users, mock_webprofiles, scraper,
+                                                     mock_soundcloud_webprofiles_data, include_social_links,
+                                                     social_links_top_k, expected_calls):
+        mock_search_users.return_value = {
+            "total_results": 50,
+            "collection": [{"kind": "user", "id": user_id, "username": f"user{user_id}",
+                            "permalink_url": f"https://soundcloud.com/user{user_id}"} for user_id in range(50)]
+        }
+        mock_webprofiles.return_value = mock_soundcloud_webprofiles_data
+
+        result = await scraper.scrape("test query", limit=LimitEnum.FIFTY, include_social_links=include_social_links,
+                                      social_links_top_k=social_links_top_k)
+
+        # Appels amont: 1 recherche + 1 appel de réseaux sociaux par profil enrichi (au lieu de 51)
+        assert mock_search_users.await_count + mock_webprofiles.await_count == 1 + expected_calls
+        assert [call.args[0] for call in mock_webprofiles.await_args_list] == list(range(expected_calls))
+        assert len(result.profiles) == 50
+        assert all(profile.social_links for profile in result.profiles[:expected_calls])
+        assert all(profile.social_links is None for profile in result.profiles[expected_calls:])
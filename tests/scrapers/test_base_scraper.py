@@ -0,0 +1,79 @@
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.errors import NetworkException, PermanentScraperException
+from app.scrapers.base_scraper import BaseScraper
+
+
+class DummyScraper(BaseScraper):
+    async def scrape(self, *args, **kwargs):
+        return None
+
+
+class TestBaseScraper:
+
+    @pytest.fixture
+    def scraper(self):
+        return DummyScraper(user_agent="test-agent")
+
+    @pytest.fixture(autouse=True)
+    def no_retry_wait(self, monkeypatch):
+        monkeypatch.setattr(settings, "RETRY_BACKOFF_FACTOR", 0)
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_fetch_retries_server_errors(self, mock_request, scraper):
+        mock_request.side_effect = [
+            httpx.Response(500, text="error"),
+            httpx.Response(502, text="error"),
+            httpx.Response(200, text="ok"),
+        ]
+
+        response = await scraper.fetch("https://www.beatport.com/search?q=test")
+
+        assert response.status_code == 200
+        assert mock_request.call_count == 3
+        assert mock_request.call_args[1]["headers"]["User-Agent"] == "test-agent"
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_fetch_retries_network_errors(self, mock_request, scraper):
+        mock_request.side_effect = [httpx.ConnectError("boom"), httpx.Response(200, text="ok")]
+
+        response = await scraper.fetch("https://bandcamp.com/search?q=test")
+
+        assert response.status_code == 200
+        assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_fetch_gives_up_after_max_attempts(self, mock_request, scraper):
+        mock_request.side_effect = httpx.ReadTimeout("timeout")
+
+        with pytest.raises(NetworkException):
+            await scraper.fetch("https://bandcamp.com/search?q=test")
+
+        assert mock_request.call_count == settings.MAX_RETRIES
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_fetch_client_error_not_retried(self, mock_request, scraper):
+        mock_request.return_value = httpx.Response(400, text="bad request")
+
+        with pytest.raises(PermanentScraperException):
+            await scraper.fetch("https://bandcamp.com/search?q=test")
+
+        assert mock_request.call_count == 1
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    async def test_fetch_returns_404_without_retry(self, mock_request, scraper):
+        mock_request.return_value = httpx.Response(404, text="not found")
+
+        response = await scraper.fetch("https://www.beatport.com/label/unknown/1/releases")
+
+        assert response.status_code == 404
+        assert mock_request.call_count == 1
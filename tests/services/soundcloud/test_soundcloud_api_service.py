@@ -11,9 +11,13 @@ from app.core.errors import (
     PermanentScraperException,
     TemporaryScraperException,
     AuthenticationException,
-    RateLimitException
+    RateLimitException,
+    ResourceNotFoundException
 )
-from app.services.soundcloud.soundcloud_api_service import SoundcloudApiService
+from app.core.config import settings
+from app.services.soundcloud.soundcloud_api_service import (AUTH_MODE_HEADER, AUTH_MODE_QUERY,
+                                                             SoundcloudApiService, endpoint_family,
+                                                             soundcloud_auth_modes)
 
 
 class TestSoundcloudApiService:
@@ -21,6 +25,11 @@ class TestSoundcloudApiService:
     @pytest.fixture
     def api_service(self):
         return SoundcloudApiService()
+
+    @pytest.fixture(autouse=True)
+    def no_retry_wait(self, monkeypatch):
+        # Les retries sont réels: on supprime seulement l'attente entre les tentatives
+        monkeypatch.setattr(settings, "RETRY_BACKOFF_FACTOR", 0)
     
     @pytest.mark.asyncio
     @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
@@ -113,6 +122,62 @@ class TestSoundcloudApiService:
         
         # Vérifier que le message d'erreur est correct
         assert "Erreur serveur" in str(excinfo.value)
+        # Les erreurs temporaires sont réessayées jusqu'au nombre maximal de tentatives
+        assert mock_request.call_count == settings.MAX_RETRIES
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    @patch('app.services.soundcloud.soundcloud_auth.invalidate_token')
+    @patch('app.services.soundcloud.soundcloud_auth.get_access_token', new_callable=AsyncMock)
+    async def test_fetch_recovers_from_expired_token(self, mock_get_token, mock_invalidate, mock_request,
+                                                     api_service):
+        # Token révoqué en cours de route: renouvelé une fois, la requête est rejouée avec le nouveau
+        mock_get_token.side_effect = ["revoked_token", "fresh_token"]
+
+        unauthorized_response = MagicMock()
+        unauthorized_response.status_code = 401
+        success_response = MagicMock()
+        success_response.status_code = 200
+        mock_request.side_effect = [unauthorized_response, success_response]
+
+        response = await api_service.fetch("https://api.soundcloud.com/users/123")
+
+        assert response.status_code == 200
+        mock_invalidate.assert_called_once_with("revoked_token")
+        assert mock_request.call_args_list[1][1]["headers"]["Authorization"] == "OAuth fresh_token"
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    @patch('app.services.soundcloud.soundcloud_auth.get_access_token', new_callable=AsyncMock)
+    async def test_fetch_persistent_401_not_replayed_again(self, mock_get_token, mock_request, api_service):
+        mock_get_token.return_value = "test_access_token"
+
+        unauthorized_response = MagicMock()
+        unauthorized_response.status_code = 401
+        mock_request.return_value = unauthorized_response
+
+        with pytest.raises(PermanentScraperException):
+            await api_service.fetch("https://api.soundcloud.com/users/123")
+
+        assert mock_request.call_count == 2
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    @patch('app.services.soundcloud.soundcloud_auth.get_access_token', new_callable=AsyncMock)
+    async def test_fetch_retries_then_succeeds(self, mock_get_token, mock_request, api_service):
+        mock_get_token.return_value = "test_access_token"
+
+        error_response = MagicMock()
+        error_response.status_code = 503
+        success_response = MagicMock()
+        success_response.status_code = 200
+        success_response.json.return_value = {"test": "data"}
+        mock_request.side_effect = [error_response, success_response]
+
+        response = await api_service.fetch("https://api.soundcloud.com/users/123")
+
+        assert response.status_code == 200
+        assert mock_request.call_count == 2
     
     @pytest.mark.asyncio
     @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
@@ -213,6 +278,16 @@ class TestSoundcloudApiService:
         # Vérifier que le résultat est correct
         assert result["id"] == 123
         assert result["username"] == "test_user"
+
+    @pytest.mark.asyncio
+    @patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.fetch', new_callable=AsyncMock)
+    async def test_get_user_not_found(self, mock_fetch, api_service):
+        mock_fetch.return_value = httpx.Response(404, json={"error": "not found"})
+
+        with pytest.raises(ResourceNotFoundException) as excinfo:
+            await api_service.get_user(123)
+
+        assert "123" in str(excinfo.value)
     
     @pytest.mark.asyncio
     @patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.fetch', new_callable=AsyncMock)
@@ -238,4 +313,93 @@ class TestSoundcloudApiService:
         # Vérifier que le résultat est correct
         assert len(result) == 1
         assert result[0]["service"] == "instagram"
-        assert result[0]["url"] == "https://instagram.com/test_user"
\ No newline at end of file
+        assert result[0]["url"] == "https://instagram.com/test_user"
+
+
+def header_rejected_fetch(user_response):
+    """fetch simulé d'une configuration où seul le paramètre d'URL est accepté"""
+    async def fetch(url, method="GET", params=None, use_auth_header=True):
+        if use_auth_header:
+            raise AuthenticationException(message=f"Accès interdit à {url}", details={"status_code": 403})
+        return user_response
+    return fetch
+
+
+class TestSoundcloudAuthModes:
+
+    @pytest.fixture
+    def user_response(self):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"id": 123, "kind": "user"}
+        return response
+
+    def test_endpoint_family(self):
+        assert endpoint_family("https://api.soundcloud.com/users/123") == "/users/{id}"
+        assert endpoint_family("https://api.soundcloud.com/users/123/web-profiles") == "/users/{id}/web-profiles"
+        assert endpoint_family("https://api.soundcloud.com/users?q=test") == "/users"
+
+    @pytest.mark.asyncio
+    @patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.fetch', new_callable=AsyncMock)
+    async def test_rejected_header_mode_is_skipped_afterwards(self, mock_fetch, user_response):
+        mock_fetch.side_effect = header_rejected_fetch(user_response)
+
+        await SoundcloudApiService.get_user(123)
+        assert mock_fetch.await_count == 2
+
+        # Le mode retenu est utilisé directement: un seul aller-retour par appel
+        for user_id in (124, 125, 126):
+            await SoundcloudApiService.get_user(user_id)
+        assert mock_fetch.await_count == 5
+        assert all(call.kwargs["use_auth_header"] is False for call in mock_fetch.await_args_list[2:])
+
+        family_metrics = soundcloud_auth_modes.get_metrics()["families"]["/users/{id}"]
+        assert family_metrics["mode"] == AUTH_MODE_QUERY
+        assert family_metrics["fallbacks"] == 1
+        assert family_metrics["query_successes"] == 4
+
+    @pytest.mark.asyncio
+    @patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.fetch', new_callable=AsyncMock)
+    async def test_modes_are_learned_per_endpoint_family(self, mock_fetch, user_response):
+        mock_fetch.side_effect = header_rejected_fetch(user_response)
+        await SoundcloudApiService.get_user(123)
+
+        mock_fetch.side_effect = None
+        mock_fetch.return_value = user_response
+        await SoundcloudApiService.get_user_webprofiles(123)
+
+        assert mock_fetch.await_args_list[-1].kwargs["use_auth_header"] is True
+        assert soundcloud_auth_modes.mode("/users/{id}") == AUTH_MODE_QUERY
+        assert soundcloud_auth_modes.mode("/users/{id}/web-profiles") == AUTH_MODE_HEADER
+
+    @pytest.mark.asyncio
+    @patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.fetch', new_callable=AsyncMock)
+    async def test_header_mode_reprobed_after_interval(self, mock_fetch, user_response, monkeypatch):
+        mock_fetch.side_effect = header_rejected_fetch(user_response)
+        await SoundcloudApiService.get_user(123)
+
+        # Intervalle écoulé: un appel retente le header; de nouveau accepté, il redevient le mode retenu
+        monkeypatch.setattr(settings, "SOUNDCLOUD_AUTH_MODE_REPROBE_INTERVAL", 0)
+        soundcloud_auth_modes._state("/users/{id}")["probe_at"] = 0
+        mock_fetch.side_effect = None
+        mock_fetch.return_value = user_response
+        await SoundcloudApiService.get_user(124)
+
+        assert mock_fetch.await_args_list[-1].kwargs["use_auth_header"] is True
+        assert soundcloud_auth_modes.mode("/users/{id}") == AUTH_MODE_HEADER
+        assert soundcloud_auth_modes.stats["probes"] == 1
+
+    @pytest.mark.asyncio
+    @patch('app.services.soundcloud.soundcloud_api_service.SoundcloudApiService.fetch', new_callable=AsyncMock)
+    async def test_reprobe_still_rejected_keeps_query_mode(self, mock_fetch, user_response):
+        mock_fetch.side_effect = header_rejected_fetch(user_response)
+        await SoundcloudApiService.get_user(123)
+
+        soundcloud_auth_modes._state("/users/{id}")["probe_at"] = 0
+        await SoundcloudApiService.get_user(124)
+        await SoundcloudApiService.get_user(125)
+
+        # Essai du header (refusé) puis URL, et l'appel suivant n'essaie plus le header
+        assert [call.kwargs["use_auth_header"] for call in mock_fetch.await_args_list[2:]] == [True, False, False]
+        assert soundcloud_auth_modes.mode("/users/{id}") == AUTH_MODE_QUERY
+        assert soundcloud_auth_modes.stats["fallbacks"] == 2
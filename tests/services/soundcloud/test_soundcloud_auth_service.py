@@ -1,6 +1,8 @@
 """
 Tests pour le service d'authentification SoundCloud.
 """
+import asyncio
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -85,4 +87,86 @@ class TestSoundcloudAuthService:
             headers = await auth_service.get_auth_headers()
             
             # Vérifier que les headers sont corrects
-            assert headers == {"Authorization": "OAuth test_access_token"}
\ No newline at end of file
+            assert headers == {"Authorization": "OAuth test_access_token"}
+
+
+def token_response(access_token: str, expires_in: int = 3600) -> AsyncMock:
+    response = AsyncMock()
+    response.status_code = 200
+    response.json = lambda: {"access_token": access_token, "expires_in": expires_in, "token_type": "bearer"}
+    return response
+
+
+class TestSoundcloudAuthServiceRefresh:
+
+    @pytest.fixture
+    def auth_service(self):
+        return SoundcloudAuthService()
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.post', new_callable=AsyncMock)
+    async def test_concurrent_callers_share_one_token_request(self, mock_post, auth_service,
+                                                              mock_soundcloud_credentials):
+        async def post(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return token_response("shared_token")
+
+        mock_post.side_effect = post
+
+        tokens = await asyncio.gather(*(auth_service.get_access_token() for _ in range(500)))
+
+        assert mock_post.await_count == 1
+        assert set(tokens) == {"shared_token"}
+        assert auth_service.stats["refreshes"] == 1
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.post', new_callable=AsyncMock)
+    async def test_refreshed_in_background_before_expiry(self, mock_post, auth_service,
+                                                         mock_soundcloud_credentials):
+        mock_post.return_value = token_response("first_token")
+        await auth_service.get_access_token()
+
+        # Entrée dans la marge de sécurité: le token courant est servi sans attendre le renouvellement
+        auth_service._refresh_at = time.time() - 1
+        mock_post.return_value = token_response("second_token")
+        tokens = await asyncio.gather(*(auth_service.get_access_token() for _ in range(50)))
+
+        assert set(tokens) == {"first_token"}
+        await auth_service._refresh_task
+        assert mock_post.await_count == 2
+        assert auth_service.stats["background_refreshes"] == 1
+        assert await auth_service.get_access_token() == "second_token"
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.post', new_callable=AsyncMock)
+    async def test_background_refresh_failure_keeps_current_token(self, mock_post, auth_service,
+                                                                  mock_soundcloud_credentials):
+        mock_post.return_value = token_response("first_token")
+        await auth_service.get_access_token()
+
+        auth_service._refresh_at = time.time() - 1
+        mock_post.side_effect = Exception("Token endpoint down")
+        assert await auth_service.get_access_token() == "first_token"
+        await auth_service._refresh_task
+
+        # Pas de nouvelle tentative à chaque appel pendant TOKEN_REFRESH_RETRY
+        assert await auth_service.get_access_token() == "first_token"
+        assert mock_post.await_count == 2
+        assert auth_service.stats["refresh_errors"] == 1
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.post', new_callable=AsyncMock)
+    async def test_invalidated_token_renewed_once(self, mock_post, auth_service, mock_soundcloud_credentials):
+        mock_post.return_value = token_response("first_token")
+        await auth_service.get_access_token()
+
+        mock_post.return_value = token_response("second_token")
+        auth_service.invalidate_token("first_token")
+        tokens = await asyncio.gather(*(auth_service.get_access_token() for _ in range(20)))
+
+        # Un 401 tardif sur l'ancien token ne déclenche pas de nouveau renouvellement
+        auth_service.invalidate_token("first_token")
+        assert await auth_service.get_access_token() == "second_token"
+        assert set(tokens) == {"second_token"}
+        assert mock_post.await_count == 2
+        assert auth_service.stats["invalidations"] == 1
@@ -0,0 +1,156 @@
+"""
+Tests pour les stores du token SoundCloud partagé entre processus.
+"""
+import asyncio
+import os
+import stat
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.services.soundcloud import soundcloud_token_store
+from app.services.soundcloud.soundcloud_auth_service import SoundcloudAuthService
+from app.services.soundcloud.soundcloud_token_store import (FileTokenStore, MemoryTokenStore, SqliteTokenStore,
+                                                            StoredToken, build_token_store)
+from tests.mocks.soundcloud_mocks import mock_soundcloud_credentials
+
+
+def token_response(access_token: str, expires_in: int = 3600) -> AsyncMock:
+    response = AsyncMock()
+    response.status_code = 200
+    response.json = lambda: {"access_token": access_token, "expires_in": expires_in, "token_type": "bearer"}
+    return response
+
+
+class TestTokenStores:
+
+    def test_file_store_round_trip(self, tmp_path):
+        store = FileTokenStore(str(tmp_path / "tokens" / "soundcloud_token.json"))
+        assert store.load() is None
+
+        store.save(StoredToken("shared_token", 1234.5))
+        loaded = FileTokenStore(store.path).load()
+
+        assert (loaded.access_token, loaded.expires_at) == ("shared_token", 1234.5)
+        # Le token est un secret: lisible par le seul propriétaire
+        assert stat.S_IMODE(os.stat(store.path).st_mode) == 0o600
+
+    def test_file_store_ignores_corrupted_file(self, tmp_path):
+        path = tmp_path / "soundcloud_token.json"
+        path.write_text("{not json")
+
+        assert FileTokenStore(str(path)).load() is None
+
+    @pytest.mark.skipif(not soundcloud_token_store.FCNTL_AVAILABLE, reason="flock indisponible")
+    def test_file_store_lock_is_exclusive(self, tmp_path):
+        path = str(tmp_path / "soundcloud_token.json")
+        first, second = FileTokenStore(path), FileTokenStore(path)
+
+        assert first.try_acquire()
+        assert not second.try_acquire()
+        first.release()
+        assert second.try_acquire()
+        second.release()
+
+    def test_sqlite_store_round_trip_and_lease(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "cache.sqlite")
+        first, second = SqliteTokenStore(path), SqliteTokenStore(path)
+
+        first.save(StoredToken("shared_token", 1234.5))
+        assert second.load().access_token == "shared_token"
+
+        assert first.try_acquire()
+        assert not second.try_acquire()
+        first.release()
+        assert second.try_acquire()
+
+        # Bail expiré (processus arrêté en plein renouvellement): le verrou est repris
+        monkeypatch.setattr(soundcloud_token_store, "LOCK_LEASE_SECONDS", -1)
+        assert second.try_acquire()
+        assert first.try_acquire()
+
+        first.close()
+        second.close()
+
+    def test_build_token_store(self, monkeypatch):
+        monkeypatch.setattr(settings, "SOUNDCLOUD_TOKEN_STORE", "file")
+        assert isinstance(build_token_store(), FileTokenStore)
+        monkeypatch.setattr(settings, "SOUNDCLOUD_TOKEN_STORE", "sqlite")
+        assert isinstance(build_token_store(), SqliteTokenStore)
+        monkeypatch.setattr(settings, "SOUNDCLOUD_TOKEN_STORE", "unknown")
+        assert isinstance(build_token_store(), MemoryTokenStore)
+
+
+class TestSharedToken:
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.post', new_callable=AsyncMock)
+    async def test_workers_and_restarts_reuse_stored_token(self, mock_post, tmp_path, mock_soundcloud_credentials):
+        path = str(tmp_path / "soundcloud_token.json")
+        mock_post.return_value = token_response("shared_token")
+
+        worker = SoundcloudAuthService(FileTokenStore(path))
+        other_worker = SoundcloudAuthService(FileTokenStore(path))
+        assert await worker.get_access_token() == "shared_token"
+        assert await other_worker.get_access_token() == "shared_token"
+
+        # Redémarrage: nouvelle instance, même fichier
+        restarted = SoundcloudAuthService(FileTokenStore(path))
+        assert await restarted.get_access_token() == "shared_token"
+
+        assert mock_post.await_count == 1
+        assert restarted.stats["adopted"] == 1
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.post', new_callable=AsyncMock)
+    async def test_racing_workers_request_one_token(self, mock_post, tmp_path, mock_soundcloud_credentials):
+        async def post(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return token_response("shared_token")
+
+        mock_post.side_effect = post
+        path = str(tmp_path / "soundcloud_token.json")
+        workers = [SoundcloudAuthService(FileTokenStore(path)) for _ in range(4)]
+
+        tokens = await asyncio.gather(*(worker.get_access_token() for worker in workers for _ in range(50)))
+
+        assert set(tokens) == {"shared_token"}
+        assert mock_post.await_count == 1
+        assert sum(worker.stats["adopted"] for worker in workers) == 3
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.post', new_callable=AsyncMock)
+    async def test_expired_or_rejected_token_not_adopted(self, mock_post, mock_soundcloud_credentials):
+        store = MemoryTokenStore()
+        store.save(StoredToken("expired_token", time.time() - 1))
+        auth_service = SoundcloudAuthService(store)
+
+        mock_post.return_value = token_response("first_token")
+        assert await auth_service.get_access_token() == "first_token"
+
+        # Refusé par l'API (401): le token du store, identique, n'est pas réadopté
+        auth_service.invalidate_token("first_token")
+        mock_post.return_value = token_response("second_token")
+        assert await auth_service.get_access_token() == "second_token"
+
+        assert mock_post.await_count == 2
+        assert store.load().access_token == "second_token"
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.post', new_callable=AsyncMock)
+    async def test_proactive_refresh_adopts_fresher_stored_token(self, mock_post, mock_soundcloud_credentials):
+        store = MemoryTokenStore()
+        auth_service = SoundcloudAuthService(store)
+        mock_post.return_value = token_response("first_token")
+        await auth_service.get_access_token()
+
+        # Un autre worker a déjà renouvelé le token
+        store.save(StoredToken("renewed_token", time.time() + 3600 + 60))
+        auth_service._refresh_at = time.time() - 1
+        assert await auth_service.get_access_token() == "first_token"
+        await auth_service._refresh_task
+
+        assert await auth_service.get_access_token() == "renewed_token"
+        assert mock_post.await_count == 1
@@ -0,0 +1,210 @@
+"""
+Tests pour la fusion des requêtes identiques en vol (single-flight).
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.coalescing_service import RequestCoalescer, coalescing_key
+from app.services.concurrency_service import ConcurrencyLimiterService
+from app.services.http_client_service import HttpClientService
+from app.services.rate_limit_service import RateLimiterService
+from app.services.soundcloud.soundcloud_api_service import SoundcloudApiService
+
+
+class TestCoalescingKey:
+
+    def test_params_order_is_normalized(self):
+        first = coalescing_key("get", "https://www.beatport.com/fr/label/x/1/releases", {"page": 2, "per_page": 25})
+        second = coalescing_key("GET", "https://www.beatport.com/fr/label/x/1/releases?per_page=25", {"page": 2})
+
+        assert first == second
+
+    def test_distinct_requests_have_distinct_keys(self):
+        base = coalescing_key("GET", "https://api.soundcloud.com/users/1")
+
+        assert base != coalescing_key("GET", "https://api.soundcloud.com/users/2")
+        assert base != coalescing_key("HEAD", "https://api.soundcloud.com/users/1")
+        assert base != coalescing_key("GET", "https://api.soundcloud.com/users/1", {"limit": 5})
+
+    def test_auth_header_is_part_of_key(self):
+        url = "https://api.soundcloud.com/users/1"
+
+        assert coalescing_key("GET", url, headers={"User-Agent": "a"}) == \
+               coalescing_key("GET", url, headers={"User-Agent": "b"})
+        assert coalescing_key("GET", url, headers={"Authorization": "OAuth a"}) != \
+               coalescing_key("GET", url, headers={"Authorization": "OAuth b"})
+
+
+class TestRequestCoalescer:
+
+    @pytest.fixture
+    def coalescer(self):
+        return RequestCoalescer()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_share_execution(self, coalescer):
+        calls = 0
+
+        async def upstream():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        results = await asyncio.gather(*(coalescer.run("key", upstream) for _ in range(10)))
+
+        assert calls == 1
+        assert all(result is results[0] for result in results)
+        metrics = coalescer.get_metrics()
+        assert metrics["requests"] == 10
+        assert metrics["executions"] == 1
+        assert metrics["coalesced"] == 9
+        assert metrics["coalescing_ratio"] == 0.9
+        assert metrics["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self, coalescer):
+        upstream = AsyncMock(return_value="ok")
+
+        await coalescer.run("key", upstream)
+        await coalescer.run("key", upstream)
+
+        assert upstream.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_is_propagated_to_all_waiters(self, coalescer):
+        async def upstream():
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("boom")
+
+        results = await asyncio.gather(
+            *(coalescer.run("key", upstream) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, httpx.ConnectError) for result in results)
+        assert coalescer.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self, coalescer):
+        release = asyncio.Event()
+
+        async def upstream():
+            await release.wait()
+            return "ok"
+
+        first = asyncio.create_task(coalescer.run("key", upstream))
+        second = asyncio.create_task(coalescer.run("key", upstream))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == "ok"
+        assert first.cancelled()
+        assert coalescer.get_metrics()["abandoned"] == 0
+
+    @pytest.mark.asyncio
+    async def test_upstream_cancelled_when_all_callers_leave(self, coalescer):
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def upstream():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(coalescer.run("key", upstream)) for _ in range(2)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert coalescer.in_flight == 0
+        assert coalescer.get_metrics()["abandoned"] == 1
+
+        # Un nouvel appel après abandon relance l'amont
+        assert await coalescer.run("key", AsyncMock(return_value="fresh")) == "fresh"
+
+
+class TestHttpClientCoalescing:
+
+    @pytest.fixture
+    def counting_service(self, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_DEFAULT_RATE", 10000)
+        monkeypatch.setattr(settings, "RATE_LIMIT_DEFAULT_BURST", 10000)
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"path": request.url.path})
+
+        service = HttpClientService(
+            transport=httpx.MockTransport(handler),
+            limiter=RateLimiterService(),
+            concurrency=ConcurrencyLimiterService(),
+            coalescer=RequestCoalescer(),
+        )
+        return service, calls
+
+    @pytest.mark.asyncio
+    async def test_identical_gets_share_one_upstream_call(self, counting_service):
+        service, calls = counting_service
+
+        responses = await asyncio.gather(*(
+            service.request("GET", "http://upstream.local/label/1", params={"page": 1}) for _ in range(5)
+        ))
+        await service.close()
+
+        assert len(calls) == 1
+        assert all(response.json() == {"path": "/label/1"} for response in responses)
+
+    @pytest.mark.asyncio
+    async def test_post_requests_are_never_coalesced(self, counting_service):
+        service, calls = counting_service
+
+        await asyncio.gather(*(
+            service.request("POST", "http://upstream.local/token", data={"a": "b"}) for _ in range(3)
+        ))
+        await service.close()
+
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_settings(self, counting_service, monkeypatch):
+        monkeypatch.setattr(settings, "REQUEST_COALESCING_ENABLED", False)
+        service, calls = counting_service
+
+        await asyncio.gather(*(service.request("GET", "http://upstream.local/label/1") for _ in range(3)))
+        await service.close()
+
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    @patch('httpx.AsyncClient.request', new_callable=AsyncMock)
+    @patch('app.services.soundcloud.soundcloud_auth.get_access_token', new_callable=AsyncMock)
+    async def test_concurrent_get_user_hits_upstream_once(self, mock_get_token, mock_request):
+        mock_get_token.return_value = "test_access_token"
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"id": 123, "username": "artist"}
+
+        async def slow_response(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_response
+
+        mock_request.side_effect = slow_response
+
+        users = await asyncio.gather(*(SoundcloudApiService.get_user(123) for _ in range(4)))
+
+        assert mock_request.await_count == 1
+        assert all(user["username"] == "artist" for user in users)
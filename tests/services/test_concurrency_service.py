@@ -0,0 +1,190 @@
+"""
+Tests pour le limiteur de concurrence adaptatif (AIMD).
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.errors import NetworkException, RateLimitException, ResourceNotFoundException
+from app.services.concurrency_service import (AdaptiveLimiter, ConcurrencyLimiterService,
+                                              RequestOutcome, classify_exception, classify_status)
+from app.services.http_client_service import HttpClientService
+from app.services.rate_limit_service import RateLimiterService
+
+
+class ThrottlingServer:
+    """Serveur simulé: au-delà de `capacity` requêtes simultanées, répond 429"""
+
+    def __init__(self, capacity: int, delay: float = 0.01):
+        self.capacity = capacity
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.statuses = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.in_flight > self.capacity:
+                status = 429
+            else:
+                await asyncio.sleep(self.delay)
+                status = 200
+            self.statuses.append(status)
+            return httpx.Response(status, headers={"Retry-After": "0"} if status == 429 else {})
+        finally:
+            self.in_flight -= 1
+
+
+class TestAdaptiveLimiter:
+
+    @pytest.fixture
+    def limiter(self):
+        return AdaptiveLimiter(initial=4, min_limit=1, max_limit=10, backoff=0.5, latency_threshold=1.0)
+
+    def test_classification(self):
+        assert classify_status(200) == RequestOutcome.SUCCESS
+        assert classify_status(404) == RequestOutcome.SUCCESS
+        assert classify_status(429) == RequestOutcome.OVERLOAD
+        assert classify_status(503) == RequestOutcome.OVERLOAD
+        assert classify_exception(httpx.ReadTimeout("timeout")) == RequestOutcome.OVERLOAD
+        assert classify_exception(RateLimitException()) == RequestOutcome.OVERLOAD
+        assert classify_exception(NetworkException()) == RequestOutcome.OVERLOAD
+        assert classify_exception(ResourceNotFoundException("Label", "x")) == RequestOutcome.NEUTRAL
+        assert classify_exception(asyncio.CancelledError()) == RequestOutcome.NEUTRAL
+
+    @pytest.mark.asyncio
+    async def test_additive_increase_on_fast_success(self, limiter):
+        for _ in range(8):
+            started = await limiter.acquire()
+            limiter.release(started, RequestOutcome.SUCCESS)
+
+        # +1 par fenêtre de `limit` succès: 4 -> 5 -> ~6
+        assert limiter.current_limit == 5
+        assert limiter.limit > 5.5
+
+    @pytest.mark.asyncio
+    async def test_slow_success_does_not_increase(self, limiter):
+        started = await limiter.acquire()
+        limiter.release(started - 5, RequestOutcome.SUCCESS)
+
+        assert limiter.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_multiplicative_decrease_once_per_window(self, limiter):
+        # 4 requêtes lancées sous la même limite échouent: une seule réduction
+        starts = [await limiter.acquire() for _ in range(4)]
+        for started in starts:
+            limiter.release(started, RequestOutcome.OVERLOAD)
+
+        assert limiter.current_limit == 2
+        assert limiter.get_metrics()["decreases"] == 1
+        assert limiter.get_metrics()["overloads"] == 4
+
+        # Une requête lancée après la réduction peut réduire à nouveau, jusqu'au minimum
+        for _ in range(3):
+            started = await limiter.acquire()
+            limiter.release(started, RequestOutcome.OVERLOAD)
+        assert limiter.current_limit == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_and_wakeup(self, limiter):
+        starts = [await limiter.acquire() for _ in range(4)]
+        waiters = [asyncio.create_task(limiter.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        metrics = limiter.get_metrics()
+        assert metrics["in_flight"] == 4
+        assert metrics["queued"] == 2
+
+        limiter.release(starts[0], RequestOutcome.NEUTRAL)
+        await asyncio.sleep(0)
+        assert waiters[0].done()
+        assert not waiters[1].done()
+        waiters[1].cancel()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self, limiter):
+        starts = [await limiter.acquire() for _ in range(4)]
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        for started in starts:
+            limiter.release(started, RequestOutcome.NEUTRAL)
+        assert limiter.in_flight == 0
+        assert limiter.queued == 0
+
+
+class TestAdaptiveConcurrencyAgainstThrottlingServer:
+
+    @pytest.mark.asyncio
+    async def test_limit_converges_below_server_capacity(self, monkeypatch):
+        monkeypatch.setattr(settings, "ADAPTIVE_CONCURRENCY_INITIAL", 12)
+        monkeypatch.setattr(settings, "ADAPTIVE_CONCURRENCY_MAX", 20)
+        monkeypatch.setattr(settings, "RATE_LIMIT_DEFAULT_RATE", 10000)
+        monkeypatch.setattr(settings, "RATE_LIMIT_DEFAULT_BURST", 10000)
+
+        server = ThrottlingServer(capacity=4)
+        concurrency = ConcurrencyLimiterService()
+        service = HttpClientService(
+            transport=httpx.MockTransport(server.handler),
+            limiter=RateLimiterService(),
+            concurrency=concurrency,
+        )
+
+        async def burst(count: int):
+            return await asyncio.gather(*(
+                service.request("GET", f"http://throttled.local/items/{i}") for i in range(count)
+            ))
+
+        first = await burst(40)
+        second = await burst(40)
+        await service.close()
+
+        first_429 = sum(1 for r in first if r.status_code == 429)
+        second_429 = sum(1 for r in second if r.status_code == 429)
+        metrics = concurrency.get_metrics()["throttled.local"]
+
+        # La première rafale dépasse la capacité puis la limite est réduite
+        assert first_429 > 0
+        assert metrics["decreases"] >= 1
+        assert second_429 < first_429
+        assert metrics["limit"] <= server.capacity + 1
+        assert metrics["in_flight"] == 0
+        assert metrics["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_wait_not_counted_as_latency(self, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_DEFAULT_RATE", 20)
+        monkeypatch.setattr(settings, "RATE_LIMIT_DEFAULT_BURST", 1)
+        monkeypatch.setattr(settings, "ADAPTIVE_CONCURRENCY_LATENCY_THRESHOLD", 0.03)
+
+        server = ThrottlingServer(capacity=10, delay=0)
+        concurrency = ConcurrencyLimiterService()
+        service = HttpClientService(
+            transport=httpx.MockTransport(server.handler),
+            limiter=RateLimiterService(),
+            concurrency=concurrency,
+        )
+
+        # Les requêtes attendent jusqu'à ~200 ms leur jeton, mais l'amont répond immédiatement
+        await asyncio.gather(*(
+            service.request("GET", f"http://throttled.local/items/{i}") for i in range(5)
+        ))
+        await service.close()
+
+        metrics = concurrency.get_metrics()["throttled.local"]
+        assert metrics["successes"] == 5
+        assert server.max_in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "ADAPTIVE_CONCURRENCY_ENABLED", False)
+
+        assert ConcurrencyLimiterService().get_limiter("beatport") is None
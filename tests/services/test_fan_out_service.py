@@ -0,0 +1,108 @@
+"""
+Tests de l'exécution en éventail à concurrence bornée (délai par appel, délai global).
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.fan_out_service import FanOutService
+
+
+@pytest.fixture
+def fan_out():
+    return FanOutService()
+
+
+class TestFanOutService:
+
+    @pytest.mark.asyncio
+    async def test_results_in_item_order_with_exceptions(self, fan_out):
+        async def worker(item):
+            await asyncio.sleep(0.01 * (3 - item))
+            if item == 1:
+                raise ValueError("échec")
+            return item * 10
+
+        results = await fan_out.run([0, 1, 2], worker, item_timeout=0, deadline=0)
+
+        assert results[0] == 0 and results[2] == 20
+        assert isinstance(results[1], ValueError)
+        assert fan_out.stats["completed"] == 2 and fan_out.stats["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, fan_out):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def worker(item):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return item
+
+        results = await fan_out.run(list(range(20)), worker, concurrency=3, item_timeout=0, deadline=0)
+
+        assert results == list(range(20))
+        assert max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_item_timeout_counts_from_call_start(self, fan_out):
+        async def worker(item):
+            await asyncio.sleep(0.2 if item == "lent" else 0.05)
+            return item
+
+        # Concurrence 1: les appels rapides attendent leur tour sans consommer leur propre délai
+        results = await fan_out.run(["rapide", "lent", "rapide"], worker, concurrency=1, item_timeout=0.1,
+                                    deadline=0)
+
+        assert results[0] == results[2] == "rapide"
+        assert isinstance(results[1], asyncio.TimeoutError)
+        assert fan_out.stats["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_partial_results_and_cancels_pending(self, fan_out):
+        cancelled = []
+
+        async def worker(item):
+            try:
+                await asyncio.sleep(0.01 if item % 2 == 0 else 10)
+            except asyncio.CancelledError:
+                cancelled.append(item)
+                raise
+            return item
+
+        start = time.perf_counter()
+        results = await fan_out.run(list(range(6)), worker, item_timeout=0, deadline=0.2)
+
+        assert time.perf_counter() - start < 1
+        assert [results[i] for i in (0, 2, 4)] == [0, 2, 4]
+        assert all(isinstance(results[i], asyncio.TimeoutError) for i in (1, 3, 5))
+        assert sorted(cancelled) == [1, 3, 5]
+        assert fan_out.stats["deadline_exceeded"] == 3
+
+    @pytest.mark.asyncio
+    async def test_caller_cancellation_cancels_calls(self, fan_out):
+        cancelled = []
+
+        async def worker(item):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(item)
+                raise
+
+        task = asyncio.create_task(fan_out.run([1, 2], worker, item_timeout=0, deadline=0))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+        assert sorted(cancelled) == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_empty_items(self, fan_out):
+        assert await fan_out.run([], lambda item: item) == []
@@ -0,0 +1,304 @@
+"""
+Tests pour le cache HTTP du transport (RFC 9111).
+"""
+import gzip
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.coalescing_service import RequestCoalescer
+from app.services.concurrency_service import ConcurrencyLimiterService
+from app.services.http_cache_service import (CacheEntry, HttpCacheService, MemoryCacheStore,
+                                             SqliteCacheStore, bypass_http_cache, parse_cache_control)
+from app.services.http_client_service import HttpClientService
+from app.services.rate_limit_service import RateLimiterService
+from app.services.result_cache_service import result_cache
+
+
+def make_entry(headers, content=b"body", stored_at=None, status_code=200, ttl_override=None):
+    return CacheEntry("https://upstream.local/page", status_code, list(headers.items()), content,
+                      stored_at if stored_at is not None else time.time(), ttl_override=ttl_override)
+
+
+class Upstream:
+    """Serveur simulé: enregistre les requêtes et répond avec la réponse configurée"""
+
+    def __init__(self):
+        self.requests = []
+        self.status_code = 200
+        self.headers = {}
+        self.content = b"<html>page</html>"
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        etag = self.headers.get("ETag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag, "Cache-Control": self.headers.get("Cache-Control", "")})
+        last_modified = self.headers.get("Last-Modified")
+        if last_modified and request.headers.get("If-Modified-Since") == last_modified:
+            return httpx.Response(304)
+        return httpx.Response(self.status_code, headers=self.headers, content=self.content)
+
+
+class TestCacheEntry:
+
+    def test_parse_cache_control(self):
+        directives = parse_cache_control('private, Max-Age=60, no-cache="Set-Cookie"')
+
+        assert directives == {"private": None, "max-age": "60", "no-cache": "Set-Cookie"}
+
+    def test_max_age_freshness(self):
+        entry = make_entry({"Cache-Control": "max-age=60", "Age": "10"})
+
+        assert entry.freshness_lifetime() == 60
+        assert entry.is_fresh(time.time())
+        assert not entry.is_fresh(time.time() + 55)
+
+    def test_no_cache_is_never_fresh(self):
+        entry = make_entry({"Cache-Control": "no-cache, max-age=60", "ETag": '"v1"'})
+
+        assert not entry.is_fresh(time.time())
+        assert entry.conditional_headers() == {"If-None-Match": '"v1"'}
+
+    def test_expires_relative_to_date(self):
+        entry = make_entry({
+            "Date": "Mon, 01 Jan 2024 00:00:00 GMT",
+            "Expires": "Mon, 01 Jan 2024 00:05:00 GMT",
+        })
+
+        assert entry.freshness_lifetime() == 300
+
+    def test_invalid_expires_means_expired(self):
+        assert make_entry({"Expires": "0"}).freshness_lifetime() == 0
+
+    def test_heuristic_freshness_from_last_modified(self):
+        entry = make_entry({
+            "Date": "Thu, 11 Jan 2024 00:00:00 GMT",
+            "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+        })
+
+        # 10% de 10 jours, plafonné à un jour
+        assert entry.freshness_lifetime() == 86400
+
+    def test_override_ttl_wins_over_directives(self):
+        entry = make_entry({"Cache-Control": "no-cache, no-store, max-age=0"}, ttl_override=120)
+
+        assert entry.is_fresh(time.time())
+
+
+class TestStores:
+
+    def test_memory_store_evicts_lru_within_byte_budget(self):
+        store = MemoryCacheStore(max_bytes=250)
+        for key in ("a", "b", "c"):
+            store.set(key, make_entry({}, content=b"x" * 100))
+
+        assert len(store) == 2
+        assert store.get("a") is None
+        assert store.size_bytes <= 250
+        assert store.evictions == 1
+
+        # Une lecture rend l'entrée récente: c'est "c" qui est évincée ensuite
+        store.get("b")
+        store.set("d", make_entry({}, content=b"x" * 100))
+        assert store.get("b") is not None
+        assert store.get("c") is None
+
+    def test_memory_store_rejects_entry_larger_than_budget(self):
+        store = MemoryCacheStore(max_bytes=10)
+        store.set("big", make_entry({}, content=b"x" * 100))
+
+        assert len(store) == 0
+
+    def test_sqlite_store_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache" / "http.sqlite")
+        store = SqliteCacheStore(path, max_bytes=10_000)
+        store.set("key", make_entry({"ETag": '"v1"'}, content=b"\x00binary"))
+        store.close()
+
+        entry = SqliteCacheStore(path, max_bytes=10_000).get("key")
+
+        assert entry.content == b"\x00binary"
+        assert entry.header("etag") == '"v1"'
+
+    def test_sqlite_store_byte_budget(self, tmp_path):
+        store = SqliteCacheStore(str(tmp_path / "http.sqlite"), max_bytes=250)
+        for key in ("a", "b", "c"):
+            store.set(key, make_entry({}, content=b"x" * 100))
+
+        assert store.get("a") is None
+        assert store.get("c") is not None
+        assert store.stats()["bytes"] <= 250
+        store.close()
+
+
+class TestHttpCacheInTransport:
+
+    @pytest.fixture
+    def upstream(self):
+        return Upstream()
+
+    @pytest.fixture
+    def cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "HTTP_CACHE_ENABLED", True)
+        monkeypatch.setattr(settings, "HTTP_CACHE_TTL_BEATPORT", -1)
+        cache = HttpCacheService(MemoryCacheStore(1_000_000), SqliteCacheStore(str(tmp_path / "http.sqlite"), 1_000_000))
+        yield cache
+        cache.close()
+
+    @pytest.fixture
+    def service(self, upstream, cache, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_DEFAULT_RATE", 10000)
+        monkeypatch.setattr(settings, "RATE_LIMIT_DEFAULT_BURST", 10000)
+        return HttpClientService(
+            transport=httpx.MockTransport(upstream.handler),
+            limiter=RateLimiterService(),
+            concurrency=ConcurrencyLimiterService(),
+            coalescer=RequestCoalescer(),
+            cache=cache,
+        )
+
+    @pytest.mark.asyncio
+    async def test_fresh_response_served_from_cache(self, service, upstream, cache):
+        upstream.headers = {"Cache-Control": "max-age=60"}
+
+        first = await service.request("GET", "https://upstream.local/search", params={"q": "techno"})
+        second = await service.request("GET", "https://upstream.local/search?q=techno")
+
+        assert len(upstream.requests) == 1
+        assert second.status_code == 200
+        assert second.text == first.text
+        assert second.extensions["from_cache"] is True
+        assert cache.get_metrics()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_response_revalidated_with_etag(self, service, upstream, cache):
+        upstream.headers = {"Cache-Control": "no-cache", "ETag": '"v1"'}
+
+        await service.request("GET", "https://upstream.local/label")
+        response = await service.request("GET", "https://upstream.local/label")
+
+        assert len(upstream.requests) == 2
+        assert upstream.requests[1].headers["If-None-Match"] == '"v1"'
+        assert response.status_code == 200
+        assert response.content == upstream.content
+        assert cache.get_metrics()["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_response_revalidated_with_last_modified(self, service, upstream):
+        upstream.headers = {"Cache-Control": "max-age=0", "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+        await service.request("GET", "https://upstream.local/label")
+        response = await service.request("GET", "https://upstream.local/label")
+
+        assert upstream.requests[1].headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert response.status_code == 200
+        assert response.content == upstream.content
+
+    @pytest.mark.asyncio
+    async def test_no_store_is_not_cached(self, service, upstream, cache):
+        upstream.headers = {"Cache-Control": "no-store", "ETag": '"v1"'}
+
+        await service.request("GET", "https://upstream.local/page")
+        await service.request("GET", "https://upstream.local/page")
+
+        assert len(upstream.requests) == 2
+        assert "If-None-Match" not in upstream.requests[1].headers
+        assert cache.get_metrics()["stored"] == 0
+
+    @pytest.mark.asyncio
+    async def test_platform_override_ttl(self, service, upstream, monkeypatch):
+        monkeypatch.setattr(settings, "HTTP_CACHE_TTL_BEATPORT", 300)
+        upstream.headers = {"Cache-Control": "private, no-cache, no-store, max-age=0, must-revalidate"}
+
+        await service.request("GET", "https://www.beatport.com/fr/search/tracks", params={"q": "x"})
+        await service.request("GET", "https://www.beatport.com/fr/search/tracks", params={"q": "x"})
+
+        assert len(upstream.requests) == 1
+
+    @pytest.mark.asyncio
+    async def test_compressed_body_is_replayed_decoded(self, service, upstream):
+        upstream.headers = {"Cache-Control": "max-age=60", "Content-Encoding": "gzip"}
+        upstream.content = gzip.compress(b'{"ok": true}')
+
+        await service.request("GET", "https://upstream.local/api")
+        cached = await service.request("GET", "https://upstream.local/api")
+
+        assert cached.json() == {"ok": True}
+        assert "content-encoding" not in cached.headers
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_memory_loss(self, service, upstream, cache):
+        upstream.headers = {"Cache-Control": "max-age=60"}
+
+        await service.request("GET", "https://upstream.local/page")
+        cache.memory.clear()
+        response = await service.request("GET", "https://upstream.local/page")
+
+        assert len(upstream.requests) == 1
+        assert response.content == upstream.content
+
+    @pytest.mark.asyncio
+    async def test_vary_mismatch_is_a_miss(self, service, upstream):
+        upstream.headers = {"Cache-Control": "max-age=60", "Vary": "Accept-Language"}
+
+        await service.request("GET", "https://upstream.local/page", headers={"Accept-Language": "fr"})
+        await service.request("GET", "https://upstream.local/page", headers={"Accept-Language": "fr"})
+        await service.request("GET", "https://upstream.local/page", headers={"Accept-Language": "en"})
+
+        assert len(upstream.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_unsafe_method_invalidates(self, service, upstream):
+        upstream.headers = {"Cache-Control": "max-age=60"}
+
+        await service.request("GET", "https://upstream.local/resource")
+        await service.request("POST", "https://upstream.local/resource", data={"a": "b"})
+        await service.request("GET", "https://upstream.local/resource")
+
+        assert [request.method for request in upstream.requests] == ["GET", "POST", "GET"]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, service, upstream):
+        upstream.status_code = 503
+        upstream.headers = {"Cache-Control": "max-age=60"}
+
+        await service.request("GET", "https://upstream.local/page")
+        await service.request("GET", "https://upstream.local/page")
+
+        assert len(upstream.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_access_token_not_in_key_nor_stored_url(self, service, upstream, cache):
+        upstream.headers = {"Cache-Control": "max-age=60"}
+
+        await service.request("GET", "https://api.soundcloud.com/users/1?access_token=token-a")
+        cached = await service.request("GET", "https://api.soundcloud.com/users/1?access_token=token-b")
+
+        assert len(upstream.requests) == 1
+        assert cached.extensions["from_cache"] is True
+        stored = cache.disk.get("https://api.soundcloud.com/users/1")
+        assert stored is not None
+        assert "token" not in stored.url
+
+    @pytest.mark.asyncio
+    async def test_bypass_skips_fresh_entry_and_replaces_it(self, service, upstream, monkeypatch):
+        monkeypatch.setattr(settings, "HTTP_CACHE_TTL_BEATPORT", 300)
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", True)
+        url = "https://www.beatport.com/fr/search/tracks"
+
+        async def scrape():
+            response = await service.request("GET", url, params={"q": "x"})
+            return response.content
+
+        await result_cache.get_or_compute("beatport_search", {"query": "x"}, scrape)
+        upstream.content = b"<html>updated</html>"
+        fresh = await result_cache.get_or_compute("beatport_search", {"query": "x"}, scrape, bypass=True)
+        cached = await service.request("GET", url, params={"q": "x"})
+
+        assert len(upstream.requests) == 2
+        assert fresh == b"<html>updated</html>"
+        assert cached.content == b"<html>updated</html>"
+        assert not bypass_http_cache.get()
@@ -0,0 +1,167 @@
+"""
+Tests pour le service de transport HTTP partagé.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.http_client_service import HttpClientService, get_platform
+
+
+class TestHttpClientService:
+
+    @pytest.fixture
+    def requests_seen(self):
+        return []
+
+    @pytest.fixture
+    def service(self, requests_seen):
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests_seen.append(request)
+            return httpx.Response(200, json={"url": str(request.url)})
+
+        return HttpClientService(transport=httpx.MockTransport(handler))
+
+    def test_get_platform(self):
+        assert get_platform("https://api.soundcloud.com/users/123") == "soundcloud"
+        assert get_platform("https://www.beatport.com/search?q=test") == "beatport"
+        assert get_platform("https://bandcamp.com/search?q=test") == "bandcamp"
+        assert get_platform("https://mutual-rytm.bandcamp.com") == "bandcamp"
+        assert get_platform("http://127.0.0.1:8000/test") == "127.0.0.1"
+
+    @pytest.mark.asyncio
+    async def test_same_client_reused_per_host(self, service):
+        client1 = service.get_client("https://www.beatport.com/search?q=a")
+        client2 = service.get_client("https://www.beatport.com/label/test/1/releases")
+        client3 = service.get_client("https://bandcamp.com/search?q=a")
+
+        assert client1 is client2
+        assert client1 is not client3
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_client_recreated_after_close(self, service):
+        client1 = service.get_client("https://www.beatport.com")
+        await service.close()
+
+        assert client1.is_closed
+        client2 = service.get_client("https://www.beatport.com")
+        assert client2 is not client1
+        assert not client2.is_closed
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_client_of_closed_loop_is_closed_when_replaced(self, service):
+        async def create():
+            return service.get_client("https://www.beatport.com")
+
+        # Client créé sur une boucle terminée depuis (asyncio.run dans un autre thread)
+        client1 = await asyncio.to_thread(asyncio.run, create())
+        client2 = service.get_client("https://www.beatport.com")
+        await asyncio.sleep(0)
+
+        assert client2 is not client1
+        assert client1.is_closed
+        assert service.get_metrics()["retired_clients"] == 1
+        await service.close()
+
+    def test_client_of_idle_loop_is_closed_on_that_loop(self, service):
+        async def create():
+            return service.get_client("https://www.beatport.com")
+
+        loop = asyncio.new_event_loop()
+        try:
+            client1 = loop.run_until_complete(create())
+            client2 = service.get_client("https://www.beatport.com")
+
+            assert client2 is not client1
+            assert client1.is_closed
+        finally:
+            loop.close()
+
+    @pytest.mark.asyncio
+    async def test_request_uses_shared_client(self, service, requests_seen):
+        response1 = await service.request("GET", "https://www.beatport.com/search", params={"q": "a"})
+        response2 = await service.request("GET", "https://www.beatport.com/search", params={"q": "b"})
+
+        assert response1.status_code == 200
+        assert response2.json()["url"] == "https://www.beatport.com/search?q=b"
+        assert len(requests_seen) == 2
+        assert service.get_metrics()["clients"] == ["https://www.beatport.com"]
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_limits_from_settings(self, service, monkeypatch):
+        from app.core.config import settings
+        monkeypatch.setattr(settings, "HTTP_POOL_TIMEOUT", 2.5)
+
+        client = service.get_client("https://api.soundcloud.com")
+
+        assert client.timeout.pool == 2.5
+        await service.close()
+
+
+class TestRequestUntil:
+
+    MARKERS = (b'<script id="__NEXT_DATA__">', b"</script>")
+
+    @pytest.fixture
+    def consumed(self):
+        return []
+
+    def make_service(self, chunks, consumed):
+        async def body():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers={"Content-Length": "999"}, content=body())
+
+        return HttpClientService(transport=httpx.MockTransport(handler))
+
+    @pytest.mark.asyncio
+    async def test_stops_after_markers_across_chunks(self, consumed):
+        chunks = [b"<html><body>", b'<script id="__NEXT', b'_DATA__">{"a": 1}</scr', b"ipt><script>", b"tail", b"tail"]
+        service = self.make_service(chunks, consumed)
+
+        response = await service.request_until("GET", "https://www.beatport.com/search", self.MARKERS, 1000)
+
+        assert response.content == b'<html><body><script id="__NEXT_DATA__">{"a": 1}</script>'
+        assert response.extensions["truncated"] is True
+        assert response.headers["content-length"] == str(len(response.content))
+        assert len(consumed) == 4
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_closing_tag_before_start_marker_is_ignored(self, consumed):
+        chunks = [b"<script>x</script>", b'<script id="__NEXT_DATA__">{}', b"</script>", b"tail"]
+        service = self.make_service(chunks, consumed)
+
+        response = await service.request_until("GET", "https://www.beatport.com/search", self.MARKERS, 1000)
+
+        assert response.content.endswith(b'{}</script>')
+        assert len(consumed) == 3
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_buffer_is_bounded(self, consumed):
+        service = self.make_service([b"x" * 100] * 10, consumed)
+
+        response = await service.request_until("GET", "https://www.beatport.com/search", self.MARKERS, 250)
+
+        assert len(response.content) == 250
+        assert response.extensions["truncated"] is True
+        assert len(consumed) == 3
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_body_without_markers_is_read_entirely(self, consumed):
+        service = self.make_service([b"Not ", b"Found"], consumed)
+
+        response = await service.request_until("GET", "https://www.beatport.com/search", self.MARKERS, 1000)
+
+        assert response.content == b"Not Found"
+        assert response.extensions["truncated"] is False
+        await service.close()
@@ -53,4 +53,21 @@ class TestPaginationService:
         # Test avec une limite de 50
         paginated = PaginationService.paginate_results(results, page=1, limit=LimitEnum.FIFTY)
         assert paginated == list(range(50))
-        assert len(paginated) == 50 
\ No newline at end of file
+        assert len(paginated) == 50
+
+    def test_paginate_iter_consumes_only_page_window(self):
+        """Teste que la pagination par itérateur s'arrête à la fin de la page"""
+        consumed = []
+
+        def items():
+            for index in range(100):
+                consumed.append(index)
+                yield index
+
+        paginated = list(PaginationService.paginate_iter(items(), page=2, limit=LimitEnum.TEN))
+        assert paginated == list(range(10, 20))
+        assert consumed == list(range(20))
+
+    def test_paginate_iter_page_out_of_range(self):
+        """Teste la pagination par itérateur au-delà des résultats disponibles"""
+        assert list(PaginationService.paginate_iter(range(25), page=4, limit=LimitEnum.TEN)) == []
@@ -0,0 +1,110 @@
+"""
+Tests pour l'exécution du parsing des grosses pages dans un pool de processus.
+"""
+import asyncio
+import json
+import os
+import time
+
+import pytest
+import pytest_asyncio
+
+from app.scrapers.beatport.beatport_base_scraper import decode_html_page, extract_next_data
+from app.scrapers.beatport.beatport_releases_scraper import BeatportReleasesScraper
+from app.services.parse_executor_service import ParseExecutor
+from tests.mocks.beatport_mocks import BEATPORT_LABEL_RELEASES_RESPONSE
+
+# Retard maximal toléré d'un battement de la boucle d'événements pendant les parsings
+LAG_BOUND = 0.1
+
+
+def _pid(content: bytes) -> int:
+    return os.getpid()
+
+
+def _crash_in_worker(content: bytes, parent_pid: int) -> str:
+    # Simule un processus de parsing tué (OOM killer, signal)
+    if os.getpid() != parent_pid:
+        os._exit(1)
+    return "inline"
+
+
+def large_releases_page(extra_queries: int = 6, items: int = 4000) -> bytes:
+    """Page de releases de plusieurs Mo: queries volumineuses sans rapport avant la query utile"""
+    next_data = extract_next_data(BEATPORT_LABEL_RELEASES_RESPONSE)
+    queries = next_data["props"]["pageProps"]["dehydratedState"]["queries"]
+    for index in range(extra_queries):
+        entries = [{"id": i, "name": f"Entrée {i}", "children": [{"id": i, "tags": ["a", "b"]}] * 3}
+                   for i in range(items)]
+        queries.insert(0, {"queryKey": [f"navigation-{index}"], "state": {"data": {"items": entries}}})
+    return (f'<html><script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>'
+            f'</html>').encode()
+
+
+class TestParseExecutor:
+
+    @pytest_asyncio.fixture
+    async def executor(self):
+        executor = ParseExecutor(max_workers=2, inline_max_bytes=10)
+        yield executor
+        await executor.close()
+
+    @pytest.mark.asyncio
+    async def test_small_content_is_parsed_inline(self, executor):
+        assert await executor.run(_pid, b"small") == os.getpid()
+        assert executor.get_metrics()["inline"] == 1
+        assert executor.get_metrics()["pool_started"] is False
+
+    @pytest.mark.asyncio
+    async def test_disabled_pool_always_parses_inline(self):
+        executor = ParseExecutor(max_workers=0, inline_max_bytes=10)
+
+        assert await executor.run(_pid, b"x" * 1000) == os.getpid()
+        assert executor.get_metrics()["offloaded"] == 0
+
+    @pytest.mark.asyncio
+    async def test_large_content_is_parsed_in_worker_process(self, executor):
+        assert await executor.run(_pid, b"x" * 1000) != os.getpid()
+        assert executor.get_metrics()["offloaded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_falls_back_inline_and_is_recreated(self, executor):
+        assert await executor.run(_crash_in_worker, b"x" * 1000, os.getpid()) == "inline"
+        assert executor.get_metrics()["pool_failures"] == 1
+        assert executor.get_metrics()["pool_started"] is False
+
+        assert await executor.run(_pid, b"x" * 1000) != os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_close_shuts_down_pool(self, executor):
+        await executor.run(_pid, b"x" * 1000)
+
+        await executor.close()
+
+        assert executor.get_metrics()["pool_started"] is False
+
+    @pytest.mark.asyncio
+    async def test_event_loop_lag_stays_bounded_while_parsing_large_pages(self, executor):
+        page = large_releases_page()
+        matcher = BeatportReleasesScraper._is_releases_query
+        # Démarrage des processus (import de l'application) hors de la mesure
+        await asyncio.gather(*(executor.run(_pid, b"x" * 1000) for _ in range(2)))
+
+        lags = []
+        parsing = True
+
+        async def heartbeat():
+            while parsing:
+                start = time.perf_counter()
+                await asyncio.sleep(0.005)
+                lags.append(time.perf_counter() - start - 0.005)
+
+        ticker = asyncio.create_task(heartbeat())
+        results = await asyncio.gather(*(executor.run(decode_html_page, page, matcher) for _ in range(2)))
+        parsing = False
+        await ticker
+
+        assert all(lazy is True and len(next_data["props"]["pageProps"]["dehydratedState"]["queries"]) == 1
+                   for next_data, lazy in results)
+        assert len(page) > 3 * 1024 * 1024
+        assert max(lags) < LAG_BOUND
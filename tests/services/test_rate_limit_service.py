@@ -0,0 +1,103 @@
+"""
+Tests pour le limiteur de débit par plateforme.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.http_client_service import HttpClientService
+from app.services.rate_limit_service import RateLimiterService, TokenBucket, parse_retry_after
+
+
+class TestRateLimiterService:
+
+    @pytest.fixture
+    def limiter(self):
+        return RateLimiterService()
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("120") == 120.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("not a date") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_bucket_allows_burst_then_spaces_requests(self):
+        bucket = TokenBucket(rate=10, burst=3)
+
+        waits = [bucket.reserve() for _ in range(5)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(0.1, abs=0.01)
+        assert waits[4] == pytest.approx(0.2, abs=0.01)
+
+    def test_limits_from_settings(self, limiter, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_BEATPORT_RATE", 2.0)
+        monkeypatch.setattr(settings, "RATE_LIMIT_BEATPORT_BURST", 4)
+
+        bucket = limiter.get_bucket("beatport")
+
+        assert bucket.rate == 2.0
+        assert bucket.burst == 4
+        # Plateforme inconnue: valeurs par défaut
+        assert limiter.get_bucket("example.com").rate == settings.RATE_LIMIT_DEFAULT_RATE
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_tokens(self, limiter, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_BANDCAMP_RATE", 50.0)
+        monkeypatch.setattr(settings, "RATE_LIMIT_BANDCAMP_BURST", 2)
+
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire("bandcamp") for _ in range(6)))
+        elapsed = time.monotonic() - start
+
+        # 2 jetons immédiats puis 4 jetons à 50/s
+        assert elapsed >= 0.07
+        metrics = limiter.get_metrics()["bandcamp"]
+        assert metrics["requests"] == 6
+        assert metrics["delayed"] == 4
+        assert metrics["max_wait"] > 0
+
+    @pytest.mark.asyncio
+    async def test_pause_blocks_whole_platform(self, limiter):
+        limiter.on_rate_limited("soundcloud", retry_after=0.1)
+
+        metrics = limiter.get_metrics()["soundcloud"]
+        assert metrics["paused_for"] > 0
+        assert metrics["pauses"] == 1
+
+        start = time.monotonic()
+        await limiter.acquire("soundcloud")
+        assert time.monotonic() - start >= 0.09
+
+    @pytest.mark.asyncio
+    async def test_pause_during_wait_delays_queued_requests(self, limiter, monkeypatch):
+        monkeypatch.setattr(settings, "RATE_LIMIT_BEATPORT_RATE", 20.0)
+        monkeypatch.setattr(settings, "RATE_LIMIT_BEATPORT_BURST", 1)
+        await limiter.acquire("beatport")
+
+        # Requête en file d'attente (prévue dans ~50 ms), puis 429 reçu entre-temps
+        queued = asyncio.create_task(limiter.acquire("beatport"))
+        await asyncio.sleep(0)
+        start = time.monotonic()
+        limiter.on_rate_limited("beatport", retry_after=0.2)
+        await queued
+
+        assert time.monotonic() - start >= 0.19
+
+    @pytest.mark.asyncio
+    async def test_transport_pauses_platform_on_429(self, limiter):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(429, headers={"Retry-After": "30"})
+
+        service = HttpClientService(transport=httpx.MockTransport(handler), limiter=limiter)
+
+        response = await service.request("GET", "https://api.soundcloud.com/users/1")
+
+        assert response.status_code == 429
+        metrics = limiter.get_metrics()["soundcloud"]
+        assert metrics["pauses"] == 1
+        assert 29 < metrics["paused_for"] <= 30
+        await service.close()
@@ -0,0 +1,340 @@
+"""
+Tests pour le cache des résultats des outils MCP et des routes REST.
+"""
+import asyncio
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+from app.core.config import settings
+from app.core.errors import MissingPageDataException, ParsingException, ResourceNotFoundException
+from app.models import BandcampSearchResult, LimitEnum, SoundcloudProfile
+from app.models.beatport_models import BeatportEntityType
+from app.services.result_cache_service import ResultCacheService, result_cache_key
+
+
+class TestResultCacheKey:
+
+    def test_arguments_are_normalized(self):
+        first = result_cache_key("beatport_search", {
+            "query": " Amelie Lens ", "page": 1, "limit": LimitEnum.TEN, "entity_type": None,
+        })
+        second = result_cache_key("beatport_search", {
+            "limit": 10, "page": 1, "query": "Amelie Lens",
+        })
+
+        assert first == second
+
+    def test_dates_and_enums(self):
+        key = result_cache_key("beatport_get_label_releases", {
+            "entity_type": BeatportEntityType.LABEL, "start_date": date(2024, 1, 15),
+        })
+
+        assert key == 'beatport_get_label_releases:{"entity_type": "label", "start_date": "2024-01-15"}'
+
+    def test_tool_name_is_part_of_key(self):
+        assert result_cache_key("a", {"query": "x"}) != result_cache_key("b", {"query": "x"})
+
+
+class TestResultCacheService:
+
+    @pytest.fixture
+    def cache(self):
+        return ResultCacheService(max_entries=3)
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_compute(self, cache):
+        compute = AsyncMock(return_value={"profiles": []})
+
+        first = await cache.get_or_compute("bandcamp_search", {"query": "x"}, compute)
+        second = await cache.get_or_compute("bandcamp_search", {"query": "x"}, compute)
+
+        assert first is second
+        assert compute.await_count == 1
+        stats = cache.get_metrics()["tools"]["bandcamp_search"]
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_bypass_recomputes_and_refreshes(self, cache):
+        compute = AsyncMock(side_effect=["old", "new"])
+
+        await cache.get_or_compute("bandcamp_search", {"query": "x"}, compute)
+        bypassed = await cache.get_or_compute("bandcamp_search", {"query": "x"}, compute, bypass=True)
+        cached = await cache.get_or_compute("bandcamp_search", {"query": "x"}, compute)
+
+        assert bypassed == "new"
+        assert cached == "new"
+        assert cache.get_metrics()["tools"]["bandcamp_search"]["bypassed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_per_tool(self, monkeypatch):
+        monkeypatch.setattr(settings, "RESULT_CACHE_TTL_BANDCAMP_SEARCH", 60)
+        monkeypatch.setattr(settings, "RESULT_CACHE_MAX_STALE_BANDCAMP_SEARCH", 0)
+        compute = AsyncMock(side_effect=["first", "second"])
+        clock = MagicMock(return_value=1000.0)
+        cache = ResultCacheService(max_entries=3, clock=clock)
+
+        await cache.get_or_compute("bandcamp_search", {"query": "x"}, compute)
+        clock.return_value = 1059.0
+        assert await cache.get_or_compute("bandcamp_search", {"query": "x"}, compute) == "first"
+        clock.return_value = 1061.0
+        assert await cache.get_or_compute("bandcamp_search", {"query": "x"}, compute) == "second"
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, cache):
+        for query in ("a", "b", "c"):
+            await cache.get_or_compute("bandcamp_search", {"query": query}, AsyncMock(return_value=query))
+
+        # "a" devient la plus récente: "b" est évincée à l'insertion de "d"
+        await cache.get_or_compute("bandcamp_search", {"query": "a"}, AsyncMock())
+        await cache.get_or_compute("bandcamp_search", {"query": "d"}, AsyncMock(return_value="d"))
+
+        assert cache.get(result_cache_key("bandcamp_search", {"query": "a"})) == "a"
+        assert cache.get(result_cache_key("bandcamp_search", {"query": "b"})) is None
+        assert cache.get_metrics()["entries"] == 3
+        assert cache.get_metrics()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self, cache):
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(
+            cache.get_or_compute("beatport_search", {"query": "x"}, compute) for _ in range(5)
+        ))
+
+        assert calls == 1
+        assert results == ["result"] * 5
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, cache):
+        compute = AsyncMock(side_effect=[ValueError("boom"), "ok"])
+
+        with pytest.raises(ValueError):
+            await cache.get_or_compute("beatport_search", {"query": "x"}, compute)
+
+        assert await cache.get_or_compute("beatport_search", {"query": "x"}, compute) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_settings(self, cache, monkeypatch):
+        monkeypatch.setattr(settings, "RESULT_CACHE_ENABLED", False)
+        compute = AsyncMock(return_value="ok")
+
+        await cache.get_or_compute("beatport_search", {"query": "x"}, compute)
+        await cache.get_or_compute("beatport_search", {"query": "x"}, compute)
+
+        assert compute.await_count == 2
+
+
+class TestStaleWhileRevalidate:
+
+    @pytest.fixture
+    def clock(self):
+        return MagicMock(return_value=1000.0)
+
+    @pytest_asyncio.fixture
+    async def cache(self, clock, monkeypatch):
+        monkeypatch.setattr(settings, "RESULT_CACHE_TTL_BEATPORT_SEARCH", 60)
+        monkeypatch.setattr(settings, "RESULT_CACHE_MAX_STALE_BEATPORT_SEARCH", 600)
+        monkeypatch.setattr(settings, "RESULT_CACHE_REFRESH_BACKOFF", 30)
+        cache = ResultCacheService(max_entries=10, clock=clock)
+        yield cache
+        # Aucun rafraîchissement ne doit survivre au test, même en cas d'échec
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_then_refreshed_in_background(self, cache, clock):
+        refreshed = asyncio.Event()
+
+        async def fresh_compute():
+            await asyncio.sleep(0.01)
+            refreshed.set()
+            return "fresh"
+
+        await cache.get_or_compute("beatport_search", {"query": "x"}, AsyncMock(return_value="old"))
+
+        clock.return_value = 1100.0
+        result = await cache.get_or_compute("beatport_search", {"query": "x"}, fresh_compute)
+        assert result == "old"
+        assert cache.get_metrics()["refreshing"] == 1
+
+        await asyncio.wait_for(refreshed.wait(), 1)
+        await asyncio.sleep(0)
+        assert await cache.get_or_compute("beatport_search", {"query": "x"}, AsyncMock()) == "fresh"
+        stats = cache.get_metrics()["tools"]["beatport_search"]
+        assert stats["stale_hits"] == 1
+        assert stats["refreshes"] == 1
+        assert stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_single_refresh_per_key(self, cache, clock):
+        started = asyncio.Event()
+        release = asyncio.Event()
+        calls = 0
+
+        async def slow_compute():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await release.wait()
+            return "fresh"
+
+        await cache.get_or_compute("beatport_search", {"query": "x"}, AsyncMock(return_value="old"))
+        clock.return_value = 1100.0
+
+        results = [await cache.get_or_compute("beatport_search", {"query": "x"}, slow_compute) for _ in range(5)]
+        await asyncio.wait_for(started.wait(), 1)
+        # Les hits stale suivants ne lancent pas de second rafraîchissement
+        results.append(await cache.get_or_compute("beatport_search", {"query": "x"}, slow_compute))
+
+        assert results == ["old"] * 6
+        assert calls == 1
+        assert cache.get_metrics()["tools"]["beatport_search"]["refreshes"] == 1
+        release.set()
+
+    @pytest.mark.asyncio
+    async def test_beyond_max_stale_caller_waits(self, cache, clock):
+        await cache.get_or_compute("beatport_search", {"query": "x"}, AsyncMock(return_value="old"))
+
+        clock.return_value = 1000.0 + 60 + 600 + 1
+        result = await cache.get_or_compute("beatport_search", {"query": "x"}, AsyncMock(return_value="fresh"))
+
+        assert result == "fresh"
+        assert cache.get_metrics()["tools"]["beatport_search"]["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_entry_and_backs_off(self, cache, clock):
+        await cache.get_or_compute("beatport_search", {"query": "x"}, AsyncMock(return_value="old"))
+        clock.return_value = 1100.0
+
+        failing = AsyncMock(side_effect=ValueError("boom"))
+        await cache.get_or_compute("beatport_search", {"query": "x"}, failing)
+        for _ in range(100):
+            if cache.get_metrics()["refreshing"] == 0:
+                break
+            await asyncio.sleep(0.001)
+        assert cache.get_metrics()["tools"]["beatport_search"]["refresh_errors"] == 1
+
+        # Pendant le backoff, les hits stale ne resollicitent pas l'amont
+        retry = AsyncMock(return_value="new")
+        assert await cache.get_or_compute("beatport_search", {"query": "x"}, retry) == "old"
+        assert cache.get_metrics()["refreshing"] == 0
+        retry.assert_not_awaited()
+
+        # Après le backoff, un nouveau rafraîchissement est tenté
+        clock.return_value = 1131.0
+        assert await cache.get_or_compute("beatport_search", {"query": "x"}, retry) == "old"
+        await asyncio.gather(*cache._refreshes.values())
+        retry.assert_awaited_once()
+        assert await cache.get_or_compute("beatport_search", {"query": "x"}, AsyncMock()) == "new"
+
+    @pytest.mark.asyncio
+    async def test_max_stale_zero_disables_swr(self, cache, clock, monkeypatch):
+        monkeypatch.setattr(settings, "RESULT_CACHE_MAX_STALE_BEATPORT_SEARCH", 0)
+        await cache.get_or_compute("beatport_search", {"query": "x"}, AsyncMock(return_value="old"))
+
+        clock.return_value = 1061.0
+        result = await cache.get_or_compute("beatport_search", {"query": "x"}, AsyncMock(return_value="fresh"))
+
+        assert result == "fresh"
+        assert cache.get_metrics()["refreshing"] == 0
+
+
+class TestNegativeCache:
+
+    @pytest.fixture
+    def clock(self):
+        return MagicMock(return_value=1000.0)
+
+    @pytest.fixture
+    def cache(self, clock, monkeypatch):
+        monkeypatch.setattr(settings, "RESULT_CACHE_NEGATIVE_TTL", 60)
+        monkeypatch.setattr(settings, "RESULT_CACHE_NEGATIVE_MAX_ENTRIES", 2)
+        return ResultCacheService(max_entries=10, clock=clock)
+
+    @pytest.mark.asyncio
+    async def test_not_found_is_cached_with_short_ttl(self, cache, clock):
+        compute = AsyncMock(side_effect=[
+            ResourceNotFoundException(resource_type="Label Beatport", resource_id="bad-slug"),
+            "found",
+        ])
+
+        for _ in range(3):
+            with pytest.raises(ResourceNotFoundException):
+                await cache.get_or_compute("beatport_get_label_releases", {"entity_slug": "bad-slug"}, compute)
+
+        assert compute.await_count == 1
+        assert cache.get_metrics()["tools"]["beatport_get_label_releases"]["negative_hits"] == 2
+
+        clock.return_value = 1061.0
+        assert await cache.get_or_compute("beatport_get_label_releases", {"entity_slug": "bad-slug"}, compute) == "found"
+
+    @pytest.mark.asyncio
+    async def test_missing_page_data_is_cached(self, cache):
+        compute = AsyncMock(side_effect=MissingPageDataException("Pas de NEXT_DATA"))
+
+        for _ in range(2):
+            with pytest.raises(MissingPageDataException):
+                await cache.get_or_compute("beatport_search", {"query": "x"}, compute)
+
+        assert compute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_other_parsing_errors_are_not_cached(self, cache):
+        compute = AsyncMock(side_effect=ParsingException("JSON invalide"))
+
+        for _ in range(2):
+            with pytest.raises(ParsingException):
+                await cache.get_or_compute("beatport_search", {"query": "x"}, compute)
+
+        assert compute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_search_uses_negative_ttl(self, cache, clock):
+        empty = BandcampSearchResult()
+        compute = AsyncMock(side_effect=[empty, BandcampSearchResult()])
+
+        assert await cache.get_or_compute("bandcamp_search", {"query": "nobody"}, compute) is empty
+        assert await cache.get_or_compute("bandcamp_search", {"query": "nobody"}, compute) is empty
+        assert cache.get_metrics()["entries"] == 0
+        assert cache.get_metrics()["negative_entries"] == 1
+
+        clock.return_value = 1061.0
+        await cache.get_or_compute("bandcamp_search", {"query": "nobody"}, compute)
+        assert compute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_profile_without_lists_is_not_empty(self, cache):
+        profile = SoundcloudProfile(id=1, name="Artist", url="https://soundcloud.com/artist", social_links=[])
+
+        await cache.get_or_compute("soundcloud_get_profile", {"user_id": 1}, AsyncMock(return_value=profile))
+
+        assert cache.get_metrics()["entries"] == 1
+        assert cache.get_metrics()["negative_entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_bypass_skips_negative_entry(self, cache):
+        compute = AsyncMock(side_effect=[ResourceNotFoundException("Profil Soundcloud", "1"), "found"])
+
+        with pytest.raises(ResourceNotFoundException):
+            await cache.get_or_compute("soundcloud_get_profile", {"user_id": 1}, compute)
+
+        assert await cache.get_or_compute("soundcloud_get_profile", {"user_id": 1}, compute, bypass=True) == "found"
+        assert await cache.get_or_compute("soundcloud_get_profile", {"user_id": 1}, AsyncMock()) == "found"
+
+    @pytest.mark.asyncio
+    async def test_negative_cache_has_its_own_size_limit(self, cache):
+        for query in ("a", "b", "c"):
+            await cache.get_or_compute("bandcamp_search", {"query": query}, AsyncMock(return_value=BandcampSearchResult()))
+
+        assert cache.get_metrics()["negative_entries"] == 2
+        assert cache.lookup_negative(result_cache_key("bandcamp_search", {"query": "a"})) is None
@@ -1,9 +1,12 @@
-from unittest.mock import AsyncMock, Mock
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from app.core.errors import TemporaryScraperException, PermanentScraperException, ScraperException
-from app.services.retry_service import with_retry, async_with_retry
+from app.core.errors import (NetworkException, PermanentScraperException, RateLimitException,
+                             ScraperException, TemporaryScraperException)
+from app.services.retry_service import AsyncRetrying, with_retry, async_with_retry
 
 
 class TestRetryService:
@@ -177,4 +180,150 @@ class TestRetryService:
             )
         
         assert "Erreur inattendue" in str(excinfo.value)
-        assert mock_function.call_count == 1  # Pas de retry pour une erreur non gérée 
\ No newline at end of file
+        assert mock_function.call_count == 1  # Pas de retry pour une erreur non gérée 
+
+class TestAsyncRetrying:
+
+    @pytest.fixture
+    def recorded_sleeps(self):
+        return []
+
+    @pytest.fixture
+    def fake_sleep(self, recorded_sleeps):
+        async def _sleep(delay):
+            recorded_sleeps.append(delay)
+        return _sleep
+
+    @pytest.mark.asyncio
+    async def test_with_retry_retries_awaited_failures(self):
+        calls = []
+
+        @with_retry(max_attempts=3, min_wait=0.001, max_wait=0.001)
+        async def flaky():
+            calls.append(1)
+            # L'exception est levée au moment de l'await, pas à la création de la coroutine
+            await asyncio.sleep(0)
+            if len(calls) < 3:
+                raise TemporaryScraperException("Erreur temporaire")
+            return "success"
+
+        result = await flaky()
+
+        assert result == "success"
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_with_retry_reraises_last_exception_when_exhausted(self):
+        mock_function = AsyncMock(side_effect=NetworkException("Timeout"))
+
+        @with_retry(max_attempts=2, min_wait=0.001, max_wait=0.001)
+        async def always_failing():
+            return await mock_function()
+
+        with pytest.raises(NetworkException):
+            await always_failing()
+        assert mock_function.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_with_retry_async_permanent_exception_not_retried(self):
+        mock_function = AsyncMock(side_effect=PermanentScraperException("Erreur permanente"))
+
+        @with_retry(max_attempts=3, min_wait=0.001, max_wait=0.001)
+        async def failing():
+            return await mock_function()
+
+        with pytest.raises(PermanentScraperException):
+            await failing()
+        assert mock_function.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_full_jitter_backoff_is_bounded(self, fake_sleep, recorded_sleeps):
+        mock_function = AsyncMock(side_effect=TemporaryScraperException("Erreur temporaire"))
+        retrying = AsyncRetrying(max_attempts=4, min_wait=1.0, max_wait=3.0, deadline=0, sleep=fake_sleep)
+
+        with pytest.raises(TemporaryScraperException):
+            await retrying.call(mock_function)
+
+        assert mock_function.await_count == 4
+        assert len(recorded_sleeps) == 3
+        for delay, ceiling in zip(recorded_sleeps, [1.0, 2.0, 3.0]):
+            assert 0 <= delay <= ceiling
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honoured(self, fake_sleep, recorded_sleeps):
+        mock_function = AsyncMock(side_effect=[RateLimitException(retry_after=7), "success"])
+        retrying = AsyncRetrying(max_attempts=3, min_wait=0.001, max_wait=0.001, deadline=0, sleep=fake_sleep)
+
+        result = await retrying.call(mock_function)
+
+        assert result == "success"
+        assert recorded_sleeps == [7.0]
+
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_deadline_gives_up(self, fake_sleep, recorded_sleeps):
+        mock_function = AsyncMock(side_effect=RateLimitException(retry_after=60))
+        retrying = AsyncRetrying(max_attempts=3, deadline=5, sleep=fake_sleep)
+
+        with pytest.raises(RateLimitException):
+            await retrying.call(mock_function)
+
+        assert mock_function.await_count == 1
+        assert recorded_sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_total_deadline_interrupts_slow_attempt(self):
+        async def slow():
+            await asyncio.sleep(1)
+
+        retrying = AsyncRetrying(max_attempts=3, min_wait=0.001, max_wait=0.001, deadline=0.05)
+
+        start = time.monotonic()
+        with pytest.raises(NetworkException) as excinfo:
+            await retrying.call(slow)
+
+        assert time.monotonic() - start < 0.5
+        assert excinfo.value.details["error_type"] == "deadline"
+
+    @pytest.mark.asyncio
+    async def test_context_api(self):
+        attempts_seen = []
+
+        async for attempt in AsyncRetrying(max_attempts=3, min_wait=0.001, max_wait=0.001):
+            with attempt:
+                attempts_seen.append(attempt.number)
+                if attempt.number < 2:
+                    raise TemporaryScraperException("Erreur temporaire")
+
+        assert attempts_seen == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_retry_waits_do_not_block_event_loop(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.005)
+
+        mock_function = AsyncMock(side_effect=[
+            TemporaryScraperException("Erreur 1"),
+            TemporaryScraperException("Erreur 2"),
+            "success"
+        ])
+        retrying = AsyncRetrying(max_attempts=3, min_wait=0.1, max_wait=0.1)
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            with patch("app.services.retry_service.random.uniform", return_value=0.1):
+                start = time.monotonic()
+                result = await retrying.call(mock_function)
+                elapsed = time.monotonic() - start
+        finally:
+            ticker_task.cancel()
+
+        assert result == "success"
+        assert elapsed >= 0.2
+        # La boucle a continué à tourner pendant les attentes (~40 ticks attendus)
+        assert len(ticks) >= 20
+        max_gap = max(b - a for a, b in zip(ticks, ticks[1:]))
+        assert max_gap < 0.05